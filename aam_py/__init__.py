@@ -1,15 +1,21 @@
-from aam_py.aaml import AAML
-from aam_py.builder import AAMBuilder, SchemaField
-from aam_py.error import (
-    AamlError,
-    ParseError,
-    IoError,
-    NotFoundError,
-    InvalidValueError,
-    InvalidTypeError,
-    DirectiveError,
-    SchemaValidationError
-)
+# Names below are imported from their modules on first access (PEP 562), so that
+# `import aam_py` stays cheap for short-lived processes.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+    from aam_py.builder import AAMBuilder, SchemaField
+    from aam_py.error import (
+        AamlError,
+        ParseError,
+        IoError,
+        NotFoundError,
+        InvalidValueError,
+        InvalidTypeError,
+        DirectiveError,
+        SchemaValidationError,
+        ValidationErrorGroup,
+        ErrorInfo
+    )
 
 __all__ = [
     'AAML',
@@ -22,5 +28,38 @@ __all__ = [
     'InvalidValueError',
     'InvalidTypeError',
     'DirectiveError',
-    'SchemaValidationError'
+    'SchemaValidationError',
+    'ValidationErrorGroup',
+    'ErrorInfo'
 ]
+
+# public name -> module defining it
+_EXPORTS = {
+    'AAML': 'aam_py.aaml',
+    'AAMBuilder': 'aam_py.builder',
+    'SchemaField': 'aam_py.builder',
+    'AamlError': 'aam_py.error',
+    'ParseError': 'aam_py.error',
+    'IoError': 'aam_py.error',
+    'NotFoundError': 'aam_py.error',
+    'InvalidValueError': 'aam_py.error',
+    'InvalidTypeError': 'aam_py.error',
+    'DirectiveError': 'aam_py.error',
+    'SchemaValidationError': 'aam_py.error',
+    'ValidationErrorGroup': 'aam_py.error',
+    'ErrorInfo': 'aam_py.error',
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
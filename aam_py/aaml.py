@@ -1,19 +1,41 @@
 import os
-from typing import Dict, Optional, List, Tuple
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional, List, Mapping, Tuple, Iterable, Iterator, Union, TYPE_CHECKING
 from abc import ABC, abstractmethod
 
-from aam_py.error import AamlError, NotFoundError, InvalidTypeError, ParseError
+from aam_py.error import AamlError, ErrorInfo, NotFoundError, InvalidTypeError, ParseError
 from aam_py.types import Type, resolve_builtin
 from aam_py.found_value import FoundValue
 from aam_py.parsing import (
-    strip_comment,
-    parse_assignment,
-    needs_accumulation,
-    block_is_complete,
+    Token,
+    TokenKind,
+    tokenize,
     unwrap_quotes,
     is_inline_object,
     parse_inline_object
 )
+from aam_py.profiling import active_stats
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from aam_py.arrays import MathArray
+    from aam_py.frozen import FrozenAAML
+    from aam_py.incremental import Document
+    from aam_py.layered import LayeredAAML
+    from aam_py.profiling import ParseStats
+    from aam_py.validation import PendingValidation, ValidationCache
+
+def _prefetching(lines: Iterable[str]) -> Iterator[str]:
+    # Yields `lines`, prefetching remote `@import`/`@derive` sources in batches (see
+    # `aam_py.sources.prefetch_lines`); the module is only loaded once a line has a URI.
+    lines = iter(lines)
+    for raw in lines:
+        if '://' in raw:
+            from aam_py.sources import prefetch_lines
+            yield from prefetch_lines(raw, lines)
+            return
+        yield raw
 
 class SchemaDef:
     """Represents a schema definition structure."""
@@ -40,18 +62,74 @@ class Command(ABC):
         pass
 
 
+_default_commands: Optional[Mapping[str, Command]] = None
+
+
+def default_commands() -> Mapping[str, Command]:
+    """
+    Returns the read-only table of built-in directives, built on first use.
+    Instances share it until they register a command of their own.
+    """
+    global _default_commands
+    if _default_commands is None:
+        from aam_py.commands.import_cmd import ImportCommand
+        from aam_py.commands.type_cmd import TypeCommand
+        from aam_py.commands.schema_cmd import SchemaCommand
+        from aam_py.commands.derive import DeriveCommand
+
+        commands = (ImportCommand(), TypeCommand(), SchemaCommand(), DeriveCommand())
+        _default_commands = MappingProxyType({command.name: command for command in commands})
+    return _default_commands
+
+
 class AAML:
     """
     The main AAML parser and configuration store.
     """
-    __slots__ = ('_map', '_commands', '_types', '_schemas')
+    __slots__ = (
+        '_map', '_commands', '_types', '_schemas', '_sources',
+        '_reverse', '_resolved', '_field_index', '_checkers', '_decoders', '_typed', '_arrays', '_documents', '_frozen', '_dirty',
+        '_stats', '_validated', '_pending', '_directives', '_registered'
+    )
 
     def __init__(self):
         self._map: Dict[str, str] = {}
-        self._commands: Dict[str, Command] = {}
+        # copied on the first `register_command`
+        self._commands: Mapping[str, Command] = _default_commands or default_commands()
         self._types: Dict[str, Type] = {}
         self._schemas: Dict[str, SchemaDef] = {}
-        self._register_default_commands()
+        # field -> [(schema, type_name), ...] in schema definition order
+        self._field_index: Dict[str, List[Tuple[str, str]]] = {}
+        # type name -> compiled checker; see `get_checker`
+        self._checkers: Dict[str, Callable[[str], Optional[ErrorInfo]]] = {}
+        # type name -> compiled decoder; see `get_decoder`
+        self._decoders: Dict[str, Callable[[str], Any]] = {}
+        # key -> decoded value; filled by `get_typed`
+        self._typed: Dict[str, Any] = {}
+        # key -> MathArray; filled by `get_array`
+        self._arrays: Dict[str, 'MathArray'] = {}
+        # resolved path -> the file as `refresh` last read it; None -> last `update_content`
+        self._documents: Dict[Optional[str], 'Document'] = {}
+        # last snapshot returned by `freeze`, and the keys written since in write
+        # order (a dict used as an ordered set); None while untracked
+        self._frozen: Optional['FrozenAAML'] = None
+        self._dirty: Optional[Dict[str, None]] = None
+        # resolved path -> (mtime_ns, size) of every file read into this instance
+        self._sources: Dict[str, Tuple[int, int]] = {}
+        # value -> first key holding it; built lazily by `find_key`
+        self._reverse: Optional[Dict[str, str]] = None
+        # key -> terminal of its alias chain; filled by `find_deep`/`resolve_all`
+        self._resolved: Dict[str, str] = {}
+        # see `enable_stats`
+        self._stats: Optional['ParseStats'] = None
+        # created on first validation; see `get_validation_cache`
+        self._validated: Optional['ValidationCache'] = None
+        # the checks put off by the `validate="deferred"` merge in progress, if any
+        self._pending: Optional['PendingValidation'] = None
+        # number of directives executing; registrations made outside them are the caller's
+        self._directives = 0
+        # ('type' | 'schema', name) -> definition registered by the caller, kept by `_reset`
+        self._registered: Dict[Tuple[str, str], Union[Type, SchemaDef]] = {}
 
     # Accessors used by commands
     def get_schemas(self) -> Dict[str, SchemaDef]:
@@ -60,21 +138,110 @@ class AAML:
     def get_schema(self, name: str) -> Optional[SchemaDef]:
         return self._schemas.get(name)
 
+    def get_sources(self) -> Dict[str, Tuple[int, int]]:
+        """Returns the resolved path -> (mtime_ns, size) of every file merged into this instance."""
+        return self._sources
+
+    def get_field_schemas(self, field: str) -> List[Tuple[str, str]]:
+        """Returns the (schema name, type name) pairs of every schema declaring `field`."""
+        return self._field_index.get(field, [])
+
+    def register_schema(self, name: str, schema_def: SchemaDef) -> None:
+        """Registers (or replaces) a schema and updates the field -> schema index."""
+        replaced = name in self._schemas
+        self._schemas[name] = schema_def
+        if not self._directives:
+            self._registered[('schema', name)] = schema_def
+        self._registry_changed()
+        if replaced:
+            # A redefined schema keeps its original position, so rebuild the
+            # index to preserve schema order within each field's entry list.
+            self._rebuild_field_index()
+            return
+        for field, type_name in schema_def.fields.items():
+            self._field_index.setdefault(field, []).append((name, type_name))
+
+    def _rebuild_field_index(self) -> None:
+        index: Dict[str, List[Tuple[str, str]]] = {}
+        for name, schema_def in self._schemas.items():
+            for field, type_name in schema_def.fields.items():
+                index.setdefault(field, []).append((name, type_name))
+        self._field_index = index
+
     def get_map(self) -> Dict[str, str]:
+        """Returns the underlying key/value map. Treat it as read-only: direct writes bypass the lookup indexes."""
         return self._map
 
     # Type registry
     def register_command(self, command: Command) -> None:
+        if isinstance(self._commands, MappingProxyType):
+            self._commands = dict(self._commands)
         self._commands[command.name] = command
 
     def register_type(self, name: str, type_def: Type) -> None:
         self._types[name] = type_def
+        if not self._directives:
+            self._registered[('type', name)] = type_def
+        self._registry_changed()
 
     def get_type(self, name: str) -> Optional[Type]:
         return self._types.get(name)
 
     def unregister_type(self, name: str) -> None:
         self._types.pop(name, None)
+        self._registered.pop(('type', name), None)
+        self._registry_changed()
+
+    def get_checker(self, type_name: str) -> Callable[[str], Optional[ErrorInfo]]:
+        """
+        Returns the compiled checker for `type_name`, compiling it on first use.
+        A checker returns None for valid values and an ErrorInfo otherwise.
+        The cache is dropped whenever the type or schema registry changes.
+        """
+        checker = self._checkers.get(type_name)
+        if checker is None:
+            from aam_py.validation import compile_type
+            checker = self._checkers[type_name] = compile_type(self, type_name)
+        return checker
+
+    def get_decoder(self, type_name: str) -> Callable[[str], Any]:
+        """Returns the compiled decoder for `type_name`; cached like `get_checker`."""
+        decoder = self._decoders.get(type_name)
+        if decoder is None:
+            from aam_py.decoding import compile_decoder
+            decoder = self._decoders[type_name] = compile_decoder(self, type_name)
+        return decoder
+
+    def get_validation_cache(self) -> 'ValidationCache':
+        """
+        Returns the memo of (type, value) pairs that passed validation in this instance.
+        Like the compiled checkers, it is dropped whenever the type or schema registry changes.
+        """
+        cache = self._validated
+        if cache is None:
+            from aam_py.validation import ValidationCache
+            cache = self._validated = ValidationCache()
+        return cache
+
+    def _registry_changed(self) -> None:
+        # Compiled checkers and decoders, validation results and decoded values
+        # depend on the registries.
+        self._checkers.clear()
+        self._decoders.clear()
+        self._typed.clear()
+        self._arrays.clear()
+        if self._validated is not None:
+            self._validated.clear()
+
+    def get_validator(self, type_name: str) -> Callable[[str], None]:
+        """Returns a callable raising the failure of `get_checker(type_name)` as an AamlError."""
+        checker = self.get_checker(type_name)
+
+        def validator(value: str) -> None:
+            info = checker(value)
+            if info is not None:
+                raise info.error()
+        return validator
 
     def check_type(self, type_name: str, value: str) -> None:
         type_def = self._types.get(type_name)
@@ -94,160 +261,535 @@ class AAML:
         except AamlError as e:
             raise InvalidTypeError(type_name, str(e))
 
-    # Parsing
-    def merge_content(self, content: str) -> None:
-        pending: Optional[Tuple[List[str], int]] = None
-
-        for i, line in enumerate(content.splitlines()):
-            line_num = i + 1
-            result = self._accumulate_or_process(line, line_num, pending)
-            if isinstance(result, tuple) and isinstance(result[0], str):
-                complete, start_line = result
-                self._process_line(complete, start_line)
-                pending = None
-            elif result is not None:
-                # result is a list tuple or None
-                pending = result
-
-        if pending is not None:
-            buf, start = pending
-            self._process_line(' '.join(buf), start)
+    # Profiling
+    def enable_stats(self, stats: Optional['ParseStats'] = None) -> 'ParseStats':
+        """
+        Starts recording per-phase timings and counters of every merge into this instance,
+        including the files its directives read. See `aam_py.profiling`.
+        """
+        if stats is None:
+            from aam_py.profiling import ParseStats
+            stats = ParseStats()
+        self._stats = stats
+        return stats
+
+    def disable_stats(self) -> Optional['ParseStats']:
+        """Stops recording and returns the stats recorded so far."""
+        stats, self._stats = self._stats, None
+        return stats
+
+    def get_stats(self) -> Optional['ParseStats']:
+        return self._stats
 
-    def _accumulate_or_process(self, line: str, line_num: int, pending: Optional[Tuple[List[str], int]]) -> Optional[Tuple]:
-        if pending is not None:
-            buf, start = pending
-            buf.append(strip_comment(line).strip())
-            joined = ' '.join(buf)
-            if block_is_complete(joined):
-                return (joined, start)
-            return pending
-
-        stripped = strip_comment(line).strip()
-        if needs_accumulation(stripped):
-            return ([stripped], line_num)
+    # Parsing
+    def merge_content(self, content: str, validate: str = "immediate") -> None:
+        """
+        Merges AAML content into this instance. By default every assignment is validated
+        as it is read. With `validate="deferred"` assignments are only recorded; when the
+        merge ends, each assigned key's final value is checked once, against the schemas
+        registered by then, and every failure is raised in one `ValidationErrorGroup`.
+        """
+        if validate != "immediate":
+            self._merge_deferred(validate, self.merge_content, content)
+            return
+        stats = self._stats or active_stats()
+        if stats is not None:
+            stats.profile("content", stats.merge, self, content)
+            return
+        self._merge_tokens(tokenize(content))
+
+    def _merge_tokens(self, tokens: Iterator[Token]) -> None:
+        for token in tokens:
+            if token.kind is TokenKind.KEY:
+                next(tokens)  # EQUALS
+                value = next(tokens)
+                self._process_assignment(token.text, value.text, token.line)
+            elif token.kind is TokenKind.DIRECTIVE:
+                args = next(tokens)
+                self._process_directive(token.text, args.text, token.line)
+
+    def merge_stream(self, stream: Iterable[str], validate: str = "immediate") -> None:
+        """
+        Merges AAML content read line by line from a text stream (an open file,
+        `sys.stdin`, a pipe, or any iterable of lines). Only the lines of a
+        pending multi-line directive block are held in memory at once.
+        See `merge_content` for `validate`.
+        """
+        if validate != "immediate":
+            self._merge_deferred(validate, self.merge_stream, stream)
+            return
+        try:
+            stats = self._stats or active_stats()
+            if stats is not None:
+                stats.profile("stream", stats.merge, self, stream)
+            else:
+                self._merge_tokens(tokenize(stream))
+        except IOError as e:
+            from aam_py.error import IoError as AamlIoError
+            raise AamlIoError(str(e))
 
-        self._process_line(line, line_num)
-        return pending
+    def merge_file(self, file_path: str, validate: str = "immediate") -> None:
+        """
+        Merges a file, or a URI handled by a registered source loader (see `aam_py.sources`).
+        See `merge_content` for `validate`.
+        """
+        if validate != "immediate":
+            self._merge_deferred(validate, self.merge_file, file_path)
+            return
+        stats = self._stats or active_stats()
+        if stats is not None:
+            stats.profile(f"file:{file_path}", self._merge_file, file_path, stats)
+        else:
+            self._merge_file(file_path, None)
+
+    def _merge_file(self, file_path: str, stats: Optional['ParseStats']) -> None:
+        if '://' in file_path:
+            from aam_py.sources import merge_uri, resolve_source
+            loader, file_path = resolve_source(file_path)
+            if loader is not None:
+                merge_uri(self, file_path, loader)
+                return
+        start = perf_counter()
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                st = os.fstat(f.fileno())
+                self._sources[os.path.realpath(file_path)] = (st.st_mtime_ns, st.st_size)
+                lines = _prefetching(f)
+                if stats is not None:
+                    stats.add(("io",), perf_counter() - start)
+                    stats.merge(self, lines)
+                else:
+                    self._merge_tokens(tokenize(lines))
+        except IOError as e:
+            from aam_py.error import IoError as AamlIoError
+            raise AamlIoError(str(e))
 
-    def merge_file(self, file_path: str) -> None:
+    def _merge_deferred(self, validate: str, merge: Callable[..., None], *args: Any) -> None:
+        if validate != "deferred":
+            raise ValueError(f"validate must be 'immediate' or 'deferred', got {validate!r}")
+        if self._pending is not None:
+            # Nested in a deferred merge, which runs the checks when it ends.
+            merge(*args)
+            return
+        from aam_py.validation import PendingValidation
+        pending = self._pending = PendingValidation()
+        try:
+            merge(*args)
+        finally:
+            self._pending = None
+        pending.run(self)
+
+    def update_content(self, old: str, new: str) -> None:
+        """
+        Turns this instance, the result of parsing `old`, into the result of parsing `new`.
+        Only the changed lines are re-tokenized and only the assignments that changed are
+        re-processed and re-validated; changes the incremental path cannot reproduce exactly
+        (see `aam_py.incremental`) re-parse `new` from scratch, keeping the commands, types and
+        schemas registered by the caller. Chained calls reuse the statements of the previous `new`.
+        """
+        from aam_py.incremental import Document
+        previous = self._documents.get(None)
+        old_lines = old.splitlines()
+        if previous is None or previous.lines != old_lines:
+            previous = Document.parse(old_lines)
+        self._apply_document(None, previous, new.splitlines())
+
+    def refresh(self, file_path: str) -> None:
+        """
+        Re-reads `file_path` into this instance, which must have been loaded from it alone.
+        The first refresh of a file re-parses it unless it is unchanged since loading;
+        later ones apply only the changes, like `update_content`.
+        Files it imports or derives from are not re-read.
+        """
+        from aam_py.incremental import Document
+        real = os.path.realpath(file_path)
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.merge_content(content)
+                st = os.fstat(f.fileno())
+                lines = f.read().splitlines()
         except IOError as e:
             from aam_py.error import IoError as AamlIoError
             raise AamlIoError(str(e))
 
+        signature = (st.st_mtime_ns, st.st_size)
+        previous = self._documents.get(real)
+        if previous is not None:
+            self._apply_document(real, previous, lines)
+        elif self._sources.get(real) == signature:
+            self._documents[real] = Document.parse(lines)
+        else:
+            document = Document.parse(lines)
+            self._reset()
+            self._merge_document(document)
+            self._documents[real] = document
+        self._sources[real] = signature
+
+    def _apply_document(self, name: Optional[str], previous: 'Document', lines: List[str]) -> None:
+        from aam_py.incremental import apply_update
+        document, window = previous.update(lines)
+        if not apply_update(self, previous, document, window):
+            self._reset()
+            self._merge_document(document)
+        self._documents[name] = document
+
+    def _merge_document(self, document: 'Document') -> None:
+        for (is_directive, name, text), line in zip(document.statements, document.starts):
+            if is_directive:
+                self._process_directive(name, text, line + 1)
+            else:
+                self._process_assignment(name, text, line + 1)
+
+    def _reset(self) -> None:
+        """Drops all parsed state, keeping the commands, types and schemas registered by the caller."""
+        commands, stats, registered = self._commands, self._stats, self._registered
+        AAML.__init__(self)
+        self._commands = commands
+        self._stats = stats
+        self._restore(registered)
+
+    def _restore(self, registered: Dict[Tuple[str, str], Union[Type, SchemaDef]]) -> None:
+        for (kind, name), definition in registered.items():
+            if kind == 'type':
+                self.register_type(name, definition)
+            else:
+                self.register_schema(name, definition)
+
     @classmethod
-    def parse(cls, content: str) -> 'AAML':
+    def parse(cls, content: str, validate: str = "immediate") -> 'AAML':
         instance = cls()
-        instance.merge_content(content)
+        instance.merge_content(content, validate)
         return instance
 
     @classmethod
-    def load(cls, file_path: str) -> 'AAML':
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return cls.parse(content)
-        except IOError as e:
-            from aam_py.error import IoError as AamlIoError
-            raise AamlIoError(str(e))
+    def load(cls, file_path: str, validate: str = "immediate") -> 'AAML':
+        instance = cls()
+        instance.merge_file(file_path, validate)
+        return instance
+
+    @classmethod
+    def load_graph(cls, file_path: str, max_workers: Optional[int] = None) -> 'AAML':
+        """Loads `file_path`, parsing the files it imports or derives in parallel. See `aam_py.graph.load_graph`."""
+        from aam_py.graph import load_graph
+        return load_graph(file_path, max_workers)
+
+    @classmethod
+    async def aload(
+        cls, file_path: str, executor: Optional['Executor'] = None, timeout: Optional[float] = None
+    ) -> 'AAML':
+        """Loads `file_path` without blocking the event loop on disk reads. See `aam_py.aio.aload`."""
+        from aam_py.aio import aload
+        return await aload(file_path, executor, timeout)
+
+    async def amerge_file(
+        self, file_path: str, executor: Optional['Executor'] = None, timeout: Optional[float] = None
+    ) -> None:
+        """Awaitable `merge_file` that reads files in `executor`. See `aam_py.aio.amerge_file`."""
+        from aam_py.aio import amerge_file
+        await amerge_file(self, file_path, executor, timeout)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> 'AAML':
+        """Loads an instance written by `dump_snapshot`. See `aam_py.snapshot`."""
+        from aam_py.snapshot import load_snapshot
+        return load_snapshot(path)
+
+    def dump_snapshot(self, path: str) -> None:
+        """Writes a binary snapshot of this instance. See `aam_py.snapshot`."""
+        from aam_py.snapshot import dump_snapshot
+        dump_snapshot(self, path)
+
+    def dump_view(self, path: str) -> None:
+        """Writes the key/value map to a file that `aam_py.view.AAMLView` can memory-map."""
+        from aam_py.view import write_view
+        write_view(self, path)
+
+    @classmethod
+    def load_stream(cls, stream: Iterable[str], validate: str = "immediate") -> 'AAML':
+        instance = cls()
+        instance.merge_stream(stream, validate)
+        return instance
 
     @staticmethod
     def unwrap_quotes(s: str) -> str:
         return unwrap_quotes(s)
 
-    def _register_default_commands(self) -> None:
-        from aam_py.commands.import_cmd import ImportCommand
-        from aam_py.commands.type_cmd import TypeCommand
-        from aam_py.commands.schema_cmd import SchemaCommand
-        from aam_py.commands.derive import DeriveCommand
+    def _process_line(self, raw_line: str, line_num: int) -> None:
+        self._merge_tokens(tokenize((raw_line,), line_num))
 
-        self.register_command(ImportCommand())
-        self.register_command(TypeCommand())
-        self.register_command(SchemaCommand())
-        self.register_command(DeriveCommand())
+    def _process_assignment(self, key: str, value: str, line_num: int) -> None:
+        self._validate_assignment(key, value, line_num)
+        self._assign(key, value)
 
-    def _process_line(self, raw_line: str, line_num: int) -> None:
-        line = strip_comment(raw_line).strip()
-        if not line:
-            return
-        if line.startswith('@'):
-            self._process_directive(line[1:], line_num)
+    def _validate_assignment(self, key: str, value: str, line_num: int) -> None:
+        pending = self._pending
+        if pending is not None:
+            pending.assignments[key] = pending.line or line_num
             return
-        self._process_assignment(line, line_num)
-
-    def _process_assignment(self, line: str, line_num: int) -> None:
         try:
-            key, value = parse_assignment(line)
             from aam_py.validation import validate_against_schemas
             validate_against_schemas(self, key, value)
-            self._map[key] = value
         except Exception as e:
             if isinstance(e, AamlError):
                 raise
-            raise ParseError(line_num, line, str(e))
-
-    def _process_directive(self, content: str, line_num: int) -> None:
-        parts = content.split(None, 1)
-        command_name = parts[0].strip() if parts else ""
-        args = parts[1] if len(parts) > 1 else ""
-
-        if not command_name:
-            raise ParseError(line_num, content, "Empty directive")
+            raise ParseError(line_num, f"{key} = {value}", str(e))
 
+    def _process_directive(self, command_name: str, args: str, line_num: int) -> None:
         cmd = self._commands.get(command_name)
         if cmd is not None:
-            cmd.execute(self, args)
+            pending = self._pending
+            # Keys written by a directive of the merged source, including those of the
+            # files it imports, are reported at the directive's line.
+            outermost = pending is not None and not pending.line
+            if outermost:
+                pending.line = line_num
+            self._directives += 1
+            try:
+                cmd.execute(self, args)
+            finally:
+                self._directives -= 1
+                if outermost:
+                    pending.line = 0
         else:
-            raise ParseError(line_num, content, f"Unknown directive: @{command_name}")
+            raise ParseError(line_num, f"{command_name} {args}".rstrip(), f"Unknown directive: @{command_name}")
+
+    # Map mutation. Every write to `_map` goes through these so that the
+    # derived lookup indexes stay consistent with it.
+    def _assign(self, key: str, value: str) -> None:
+        old = self._map.get(key)
+        self._map[key] = value
+        if old == value:
+            return
+        if self._dirty is not None:
+            self._dirty[key] = None
+        if self._typed:
+            self._typed.pop(key, None)
+        if self._arrays:
+            self._arrays.pop(key, None)
+        if self._resolved:
+            self._resolved = {}
+        if self._reverse is not None:
+            self._reindex_reverse(key, old, value)
+
+    def _delete(self, key: str) -> None:
+        old = self._map.pop(key, None)
+        if old is None:
+            return
+        if self._dirty is not None:
+            self._dirty[key] = None
+        self._typed.pop(key, None)
+        self._arrays.pop(key, None)
+        if self._resolved:
+            self._resolved = {}
+        if self._reverse is not None and self._reverse.get(old) == key:
+            self._reverse = None
+
+    def _reorder(self, keys: Iterable[str]) -> None:
+        """Rebuilds the map in the order of `keys`, which must list every key exactly once."""
+        self._map = {key: self._map[key] for key in keys}
+        self._dirty = None
+        self._reverse = None
+        self._resolved = {}
+
+    def _inherit(self, key: str, value: str) -> None:
+        """
+        Assigns `key` only if it is not already set (used by `@derive`). Inherited values
+        are not validated, so a deferred merge does not record them either.
+        """
+        if key not in self._map:
+            self._assign(key, value)
+
+    def _merge_map(self, other: Dict[str, str]) -> None:
+        if self._pending is not None:
+            self._pending.record(other)
+        if self._reverse is None:
+            self._map.update(other)
+            if self._dirty is not None:
+                self._dirty.update(dict.fromkeys(other))
+            if other:
+                self._resolved = {}
+                self._typed.clear()
+                self._arrays.clear()
+            return
+        for k, v in other.items():
+            self._assign(k, v)
+
+    def _reindex_reverse(self, key: str, old: Optional[str], value: str) -> None:
+        reverse = self._reverse
+        if old is None:
+            # New keys are appended last, so an existing holder always wins.
+            reverse.setdefault(value, key)
+        elif old != value:
+            # An existing key changed value in place. If it was the first holder
+            # of its old value, or the new value already has a holder, the winner
+            # depends on insertion order: drop the index and rebuild on demand.
+            if reverse.get(old) == key or value in reverse:
+                self._reverse = None
+            else:
+                reverse[value] = key
+
+    def _build_reverse(self) -> Dict[str, str]:
+        # Walking backwards lets the earliest key overwrite later ones.
+        return {v: k for k, v in reversed(self._map.items())}
 
     def __add__(self, other: 'AAML') -> 'AAML':
         res = AAML()
         res._map.update(self._map)
-        res._commands.update(self._commands)
+        if not isinstance(self._commands, MappingProxyType):
+            res._commands = dict(self._commands)
         res._types.update(self._types)
         res._schemas.update(self._schemas)
+        res._rebuild_field_index()
 
         res._map.update(other._map)
         res._types.update(other._types)
+        res._sources.update(self._sources)
+        res._sources.update(other._sources)
         return res
 
     def __iadd__(self, other: 'AAML') -> 'AAML':
-        self._map.update(other._map)
+        self._merge_map(other._map)
         self._types.update(other._types)
+        self._registry_changed()
+        self._sources.update(other._sources)
         return self
 
+    def overlay(self) -> 'LayeredAAML':
+        """
+        Returns a new instance layered on this one: it sees this instance's keys, types and
+        schemas without copying them and keeps its own writes apart. See `aam_py.layered`.
+        """
+        from aam_py.layered import LayeredAAML
+        return LayeredAAML(self)
+
     # Lookup Methods
+    def freeze(self) -> 'FrozenAAML':
+        """
+        Returns an immutable snapshot of the map, types and schemas that readers in other
+        threads can use without locking while this instance keeps changing.
+        A snapshot shares structure with the previous one, so publishing a new one after
+        a merge costs time proportional to the keys changed since (see `aam_py.frozen`).
+        """
+        from aam_py.frozen import FrozenAAML
+        frozen = self._frozen
+        if frozen is None or self._dirty is None:
+            frozen = FrozenAAML.of(self)
+        else:
+            frozen = frozen.evolve(self, self._dirty)
+        self._frozen = frozen
+        self._dirty = {}
+        return frozen
+
+    def get_typed(self, key: str) -> Any:
+        """
+        Returns the value of `key` decoded according to the type the first schema declaring it gives it:
+        ints, floats and bools for primitives, float tuples for math types, `datetime` for
+        `time::datetime`, numbers for physics units, lists for `list<T>` and dicts for inline objects.
+        Fields no schema declares are returned as raw strings, missing keys as None.
+        The value is validated and decoded once, then memoized until `key` is reassigned;
+        the returned object is shared and must not be mutated.
+        """
+        typed = self._typed
+        if key in typed:
+            return typed[key]
+        value = self._map.get(key)
+        if value is None:
+            return None
+        schemas = self._field_index.get(key)
+        if schemas:
+            type_name = schemas[0][1]
+            info = self.get_checker(type_name)(value)
+            if info is not None:
+                raise InvalidTypeError(type_name, str(info))
+            decoded = typed[key] = self.get_decoder(type_name)(value)
+        else:
+            decoded = typed[key] = value
+        return decoded
+
+    def get_array(self, key: str) -> Optional['MathArray']:
+        """
+        Returns a `math::...` or `list<math::...>` field decoded into one contiguous float64
+        buffer (see `aam_py.arrays.MathArray`), or None if `key` is missing.
+        Memoized until `key` is reassigned, like `get_typed`.
+        """
+        arrays = self._arrays
+        if key in arrays:
+            return arrays[key]
+        if key not in self._map:
+            return None
+        from aam_py.arrays import decode_field
+        decoded = arrays[key] = decode_field(self, key)
+        return decoded
+
     def find_obj(self, key: str) -> Optional[FoundValue]:
         if key in self._map:
             return FoundValue(self._map[key])
         return self.find_key(key)
 
     def find_key(self, value: str) -> Optional[FoundValue]:
-        for k, v in self._map.items():
-            if v == value:
-                return FoundValue(k)
-        return None
+        """
+        Returns the first key (in insertion order) whose value is `value`.
+        The value -> key index is built on the first call and kept up to date afterwards.
+        """
+        if self._reverse is None:
+            self._reverse = self._build_reverse()
+        key = self._reverse.get(value)
+        return FoundValue(key) if key is not None else None
 
     def find_deep(self, key: str) -> Optional[FoundValue]:
-        current_key = key
-        last_found = None
-        visited = set()
-
-        while current_key in self._map:
-            if current_key in visited:
-                break
-            visited.add(current_key)
-            next_val = self._map[current_key]
-            
-            if next_val in visited:
-                if last_found is None:
-                    last_found = next_val
-                break
-                
-            last_found = next_val
-            current_key = next_val
-
-        return FoundValue(last_found) if last_found is not None else None
+        """
+        Follows the alias chain starting at `key` and returns its last value.
+        For a chain that loops, returns the last key reached before the loop closes.
+        Results are memoized until the map changes.
+        """
+        terminal = self._resolve(key)
+        return FoundValue(terminal) if terminal is not None else None
+
+    def resolve_all(self) -> Dict[str, str]:
+        """Returns the `find_deep` result for every key in the map."""
+        for key in self._map:
+            if key not in self._resolved:
+                self._resolve(key)
+        return dict(self._resolved)
+
+    def _resolve(self, key: str) -> Optional[str]:
+        return resolve_alias(self._map, self._resolved, key)
+
+
+def resolve_alias(mapping: Mapping[str, str], resolved: Dict[str, str], key: str) -> Optional[str]:
+    """
+    Returns the terminal of the alias chain starting at `key` in `mapping`, memoizing
+    in `resolved` the result for every key walked (see `AAML.find_deep`).
+    """
+    if key in resolved:
+        return resolved[key]
+    if key not in mapping:
+        return None
+
+    # Walk until we leave the map, reach an already resolved key, or revisit
+    # a key on the current path. Every key on the path is then compressed to
+    # point straight at the shared result, so each key is walked only once.
+    path: List[str] = []
+    position: Dict[str, int] = {}
+    current = key
+    while current in mapping and current not in resolved and current not in position:
+        position[current] = len(path)
+        path.append(current)
+        current = mapping[current]
+
+    if current in position:
+        # A loop: each key in it resolves to its predecessor in the loop, and
+        # the keys leading into it share the result of the entry key.
+        cycle_start = position[current]
+        cycle = path[cycle_start:]
+        for i, k in enumerate(cycle):
+            resolved[k] = cycle[i - 1]
+        terminal = cycle[-1]
+        path = path[:cycle_start]
+    elif current in resolved:
+        terminal = resolved[current]
+    else:
+        terminal = current
+
+    for k in path:
+        resolved[k] = terminal
+    return resolved[key]
@@ -0,0 +1,115 @@
+"""
+asyncio counterparts of `AAML.load` and `AAML.merge_file`.
+
+Blocking work runs in an executor (the loop's default one unless given): the import/derive
+graph is discovered with `graph.scan_directives`, sibling files concurrently, and every
+file the root imports or derives is parsed into the shared `file_cache`, dependencies
+first and independent files concurrently. The root is then parsed in the executor too, so
+that imports which cannot reuse a cached parse do not read files on the event loop.
+`amerge_file` merges it into an overlay of the target (see `AAML.overlay`); only committing
+the overlay's new keys to the target runs on the loop. Cancelling the awaiting task, or exceeding `timeout`,
+stops scheduling further work and leaves the target instance unchanged. The target must
+not be modified while the merge is pending.
+"""
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Set
+
+from aam_py.aaml import AAML
+from aam_py.file_cache import file_cache
+from aam_py.graph import scan_directives
+from aam_py.layered import LayeredAAML
+
+
+async def aload(file_path: str, executor: Optional[Executor] = None, timeout: Optional[float] = None) -> AAML:
+    """
+    Loads `file_path` without blocking the event loop on disk reads. A new instance has no
+    state to protect, so the root is loaded in the executor directly, without an overlay.
+    """
+    async def load() -> AAML:
+        await _prefetch(file_path, executor)
+        return await asyncio.get_running_loop().run_in_executor(executor, AAML.load, file_path)
+
+    return await asyncio.wait_for(load(), timeout)
+
+
+async def amerge_file(
+    aaml: AAML, file_path: str, executor: Optional[Executor] = None, timeout: Optional[float] = None
+) -> None:
+    """Merges `file_path` into `aaml` with the same result as `aaml.merge_file(file_path)`."""
+    async def merge() -> LayeredAAML:
+        await _prefetch(file_path, executor)
+        overlay = aaml.overlay()
+        overlay._stats = aaml._stats
+        await asyncio.get_running_loop().run_in_executor(executor, overlay.merge_file, file_path)
+        return overlay
+
+    overlay = await asyncio.wait_for(merge(), timeout)
+    overlay.commit()
+
+
+def _scan(file_path: str) -> List[str]:
+    return scan_directives(file_path) if os.path.exists(file_path) else []
+
+
+async def _discover(root: str, executor: Optional[Executor]) -> Dict[str, List[str]]:
+    """Like `graph.discover`, scanning each level of the graph concurrently."""
+    loop = asyncio.get_running_loop()
+    graph: Dict[str, List[str]] = {}
+    level = [root]
+    while level:
+        results = await asyncio.gather(*(loop.run_in_executor(executor, _scan, path) for path in level))
+        for path, refs in zip(level, results):
+            graph[path] = refs
+        level = list(dict.fromkeys(ref for refs in results for ref in refs if ref not in graph))
+    return graph
+
+
+def _heights(graph: Dict[str, List[str]]) -> Dict[str, int]:
+    """Returns each file's distance from its furthest dependency-free descendant, skipping cycles."""
+    heights: Dict[str, int] = {}
+    # files whose height is undefined: on or above a cycle
+    cyclic: Set[str] = set()
+    for root in graph:
+        if root in heights or root in cyclic:
+            continue
+        # Depth-first with an explicit stack of (path, iterator over its refs), so that
+        # deep import chains do not hit the recursion limit.
+        visiting = {root}
+        stack = [(root, iter(graph.get(root, ())))]
+        while stack:
+            path, refs = stack[-1]
+            ref = next(refs, None)
+            if ref is not None and path not in cyclic:
+                if ref in cyclic or ref in visiting:
+                    cyclic.add(path)
+                elif ref not in heights:
+                    visiting.add(ref)
+                    stack.append((ref, iter(graph.get(ref, ()))))
+                continue
+            stack.pop()
+            visiting.discard(path)
+            if path in cyclic:
+                if stack:
+                    cyclic.add(stack[-1][0])
+            else:
+                heights[path] = max((heights[ref] + 1 for ref in graph.get(path, ())), default=0)
+    return heights
+
+
+def _preparse(path: str) -> None:
+    if not file_cache.is_cached(path):
+        file_cache.store(file_cache.parse(path))
+
+
+async def _prefetch(root: str, executor: Optional[Executor]) -> None:
+    """Parses every file `root` imports or derives into `file_cache`, dependencies first."""
+    loop = asyncio.get_running_loop()
+    graph = await _discover(root, executor)
+    levels: Dict[int, List[str]] = {}
+    for path, height in _heights(graph).items():
+        if path != root and os.path.exists(path):
+            levels.setdefault(height, []).append(path)
+    for height in sorted(levels):
+        await asyncio.gather(*(loop.run_in_executor(executor, _preparse, path) for path in levels[height]))
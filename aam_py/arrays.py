@@ -0,0 +1,117 @@
+"""
+Contiguous float64 storage for math values.
+
+A `MathArray` keeps one or more values of a single `MathTypes` kind in one `array('d')`
+and hands out memoryviews into it rather than copies. `AAML.get_array` decodes
+`math::...` and `list<math::...>` fields into this form. The buffer supports the buffer
+protocol, so `numpy.frombuffer(arr.data).reshape(arr.shape)` shares it without copying.
+"""
+from array import array
+from typing import Iterator, List, Sequence, Tuple, TYPE_CHECKING
+
+from aam_py.error import InvalidTypeError, InvalidValueError, NotFoundError
+from aam_py.types import find_builtin
+from aam_py.types.list import ListType
+from aam_py.types.math import MathTypes, unwrap_components
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+_MATRIX_SIZES = {MathTypes.MATRIX3X3: 3, MathTypes.MATRIX4X4: 4}
+
+
+class MathArray:
+    """N values of one math type stored row by row in a single float64 buffer."""
+    __slots__ = ('kind', 'data')
+
+    def __init__(self, kind: MathTypes, data: array):
+        if len(data) % kind.component_count():
+            raise InvalidValueError(
+                f"Buffer of {len(data)} floats does not hold whole {kind.value} values"
+            )
+        self.kind = kind
+        self.data = data
+
+    @classmethod
+    def decode(cls, kind: MathTypes, values: Sequence[str]) -> 'MathArray':
+        """Decodes valid `values` of type `kind` into one contiguous buffer."""
+        if not values:
+            return cls(kind, array('d'))
+        joined = ",".join(map(unwrap_components, values))
+        return cls(kind, array('d', map(float, joined.split(','))))
+
+    @property
+    def width(self) -> int:
+        """Number of components per value."""
+        return self.kind.component_count()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self), self.width
+
+    def __len__(self) -> int:
+        return len(self.data) // self.width
+
+    def __getitem__(self, index: int) -> memoryview:
+        """Returns a 1-D view of the components of value `index`."""
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("MathArray index out of range")
+        width = self.width
+        return memoryview(self.data)[index * width:(index + 1) * width]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def view(self) -> memoryview:
+        """Returns a 2-D (N, width) view of the whole buffer; an empty array gives an empty 1-D view."""
+        if not self.data:
+            return memoryview(self.data)
+        return memoryview(self.data).cast('B').cast('d', self.shape)
+
+    def matrix(self, index: int = 0) -> memoryview:
+        """Returns a square 2-D view of matrix `index`, indexable as `m[row, col]`."""
+        size = _MATRIX_SIZES.get(self.kind)
+        if size is None:
+            raise InvalidTypeError(f"math::{self.kind.value}", "Not a matrix type")
+        return self[index].cast('B').cast('d', (size, size))
+
+    def tolist(self) -> List[List[float]]:
+        return [row.tolist() for row in self]
+
+    def __repr__(self) -> str:
+        return f"MathArray(math::{self.kind.value}, {len(self)})"
+
+
+def decode_array(aaml: 'AAML', type_name: str, value: str) -> MathArray:
+    """
+    Validates `value` against `type_name` and decodes it into a MathArray.
+    `type_name` must be a built-in math type, a type registered as one (such as a
+    `@type` alias), or a list of either.
+    """
+    inner_type = ListType.parse_inner(type_name)
+    name = inner_type if inner_type is not None else type_name
+    kind = None
+    if aaml.get_schema(name) is None:
+        kind = aaml.get_type(name)
+        if kind is None:
+            kind = find_builtin(name)
+    if not isinstance(kind, MathTypes):
+        raise InvalidTypeError(type_name, "Not a math type or a list of math types")
+
+    info = aaml.get_checker(type_name)(value)
+    if info is not None:
+        raise InvalidTypeError(type_name, str(info))
+    values = ListType.parse_items(value) if inner_type is not None else [value]
+    return MathArray.decode(kind, values)
+
+
+def decode_field(aaml: 'AAML', key: str) -> MathArray:
+    """Decodes `key` using the type the first schema declaring it gives it."""
+    schemas = aaml.get_field_schemas(key)
+    if not schemas:
+        raise NotFoundError(f"No schema declares a type for '{key}'")
+    return decode_array(aaml, schemas[0][1], aaml.get_map()[key])
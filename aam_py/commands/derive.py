@@ -16,10 +16,17 @@ class DeriveCommand:
         file_path = aaml.unwrap_quotes(parts[0])
         schema_names = parts[1:]
         
-        # We need a new AAML instance to parse the base file
-        from aam_py.aaml import AAML
+        # The base file is parsed on its own; the shared cache avoids re-parsing
+        # it for every file deriving from it. base_config must not be modified.
+        # Remote bases are cached by the source loader's revalidation instead.
+        from aam_py.file_cache import file_cache
+        from aam_py.sources import load_uri, resolve_source
         try:
-            base_config = AAML.load(file_path)
+            loader, target = resolve_source(file_path)
+            if loader is not None:
+                base_config = load_uri(target, loader)
+            else:
+                base_config = file_cache.load(target, into=aaml)
         except Exception as e:
             raise ParseError(0, f"@derive {args}", f"Failed to load derived file: {e}")
             
@@ -30,29 +37,37 @@ class DeriveCommand:
                 if not schema_def:
                     raise ParseError(0, f"@derive {args}", f"Schema '{name}' not found in '{file_path}'")
                     
-                aaml._schemas[name] = schema_def
+                aaml.register_schema(name, schema_def)
                 
                 for field in schema_def.fields:
                     val = base_config.get_map().get(field)
                     if val is not None:
-                        aaml.get_map().setdefault(field, val)
+                        aaml._inherit(field, val)
         else:
             # Inherit everything but do not overwrite existing keys
             for k, v in base_config.get_map().items():
-                aaml.get_map().setdefault(k, v)
+                aaml._inherit(k, v)
                 
             # Copy schemas and types as well
-            for k, v in base_config._schemas.items():
-                if k not in aaml._schemas:
-                    aaml._schemas[k] = v
+            for k, v in base_config.get_schemas().items():
+                if aaml.get_schema(k) is None:
+                    aaml.register_schema(k, v)
             for k, v in base_config._types.items():
-                if k not in aaml._types:
-                    aaml._types[k] = v
+                if aaml.get_type(k) is None:
+                    aaml.register_type(k, v)
                     
-        # Validate completeness
+        # Validate completeness; a deferred merge checks the importer once, at its end.
+        pending = aaml._pending
         if schema_names:
-            from aam_py.validation import validate_schemas_completeness_for
-            validate_schemas_completeness_for(base_config, schema_names)
-                
+            from aam_py.validation import check_schemas_completeness_for
+            missing = check_schemas_completeness_for(base_config, schema_names)
+            if missing:
+                if pending is None:
+                    raise missing[0]
+                pending.errors.extend(missing)
+
+        if pending is not None:
+            pending.complete = True
+            return
         from aam_py.validation import validate_schemas_completeness
         validate_schemas_completeness(aaml)
@@ -12,4 +12,10 @@ class ImportCommand:
         path = aaml.unwrap_quotes(args.strip())
         if not path:
             raise ParseError(0, f"@import {args}", "Missing file path")
-        aaml.merge_file(path)
+        from aam_py.sources import merge_uri, resolve_source
+        loader, path = resolve_source(path)
+        if loader is not None:
+            merge_uri(aaml, path, loader)
+            return
+        from aam_py.file_cache import file_cache
+        file_cache.merge_into(aaml, path)
@@ -49,4 +49,4 @@ class SchemaCommand:
                     
                 fields[field_name] = type_name
                 
-        aaml._schemas[name] = SchemaDef(fields, optional_fields)
+        aaml.register_schema(name, SchemaDef(fields, optional_fields))
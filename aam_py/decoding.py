@@ -0,0 +1,62 @@
+from typing import Any, Callable, Dict, List, TYPE_CHECKING
+
+from aam_py.types import find_builtin
+from aam_py.types.list import ListType
+from aam_py.parsing import parse_inline_object
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+Decoder = Callable[[str], Any]
+
+def _identity(value: str) -> str:
+    return value
+
+
+def compile_decoder(aaml: 'AAML', type_name: str) -> Decoder:
+    """
+    Compiles `type_name` into a callable converting valid values into native Python objects.
+    Resolution follows `validation.compile_type`: registered type, schema, `list<...>`, built-in type.
+    Schemas decode to dicts of their present fields; unknown types keep the raw string.
+    Decoders do not validate; use `AAML.get_typed` to validate and decode in one step.
+    """
+    type_def = aaml.get_type(type_name)
+    if type_def is not None:
+        return type_def.decode
+
+    nested_schema = aaml.get_schema(type_name)
+    if nested_schema is not None:
+        return _compile_object(aaml, nested_schema.fields)
+
+    inner_type = ListType.parse_inner(type_name)
+    if inner_type is not None:
+        return _compile_list(aaml, inner_type)
+
+    type_def = find_builtin(type_name)
+    if type_def is not None:
+        return type_def.decode
+    return _identity
+
+
+def _compile_object(aaml: 'AAML', fields: Dict[str, str]) -> Decoder:
+    def decode_object(value: str) -> Dict[str, Any]:
+        pairs = dict(parse_inline_object(value))
+        return {
+            field: aaml.get_decoder(type_name)(pairs[field])
+            for field, type_name in fields.items() if field in pairs
+        }
+    return decode_object
+
+
+def _compile_list(aaml: 'AAML', inner_type: str) -> Decoder:
+    # List items prefer schemas, then built-ins, then registered types.
+    nested_schema = aaml.get_schema(inner_type)
+    if nested_schema is not None:
+        decode_item = _compile_object(aaml, nested_schema.fields)
+    else:
+        type_def = find_builtin(inner_type) or aaml.get_type(inner_type)
+        decode_item = type_def.decode if type_def is not None else _identity
+
+    def decode_list(value: str) -> List[Any]:
+        return list(map(decode_item, ListType.parse_items(value)))
+    return decode_list
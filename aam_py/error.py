@@ -58,3 +58,69 @@ class SchemaValidationError(AamlError):
         self.type_name = type_name
         self.details = details
         super().__init__(f"Schema '{schema}' validation error: field '{field}' (type '{type_name}') — {details}")
+
+class ValidationErrorGroup(AamlError, ExceptionGroup):
+    """
+    Every validation failure of a merge run with `validate="deferred"`, raised together.
+    The failures are in `exceptions`; those of assignments carry a note with their line.
+    """
+    def __new__(cls, errors: list):
+        return super().__new__(cls, "Deferred validation failed", errors)
+
+    def __init__(self, errors: list):
+        super().__init__("Deferred validation failed", errors)
+
+    def derive(self, excs):
+        return ValidationErrorGroup(list(excs))
+
+class ErrorInfo:
+    """
+    A validation failure returned by the `check` APIs instead of a raised exception.
+    The message is only formatted when `details`, `error()` or `str()` is called;
+    `args` may themselves be ErrorInfo objects, which are formatted the same way.
+    """
+    __slots__ = ('error_type', 'template', 'args', '_error')
+
+    def __init__(self, error_type: type, template: str, *args: object):
+        self.error_type = error_type
+        self.template = template
+        self.args = args
+        self._error = None
+
+    @classmethod
+    def of(cls, error: AamlError) -> 'ErrorInfo':
+        """Wraps an already raised error."""
+        info = cls(type(error), "{}", error)
+        info._error = error
+        return info
+
+    @property
+    def details(self) -> str:
+        return self.template.format(*self.args)
+
+    def error(self) -> AamlError:
+        """Returns the exception this failure stands for."""
+        if self._error is None:
+            self._error = self.error_type(self.details)
+        return self._error
+
+    def __str__(self) -> str:
+        return str(self.error())
+
+    def __repr__(self) -> str:
+        return f"ErrorInfo({self.error_type.__name__}, {self.details!r})"
+
+class SchemaErrorInfo(ErrorInfo):
+    """An ErrorInfo standing for a SchemaValidationError."""
+    __slots__ = ('schema', 'field', 'type_name')
+
+    def __init__(self, schema: str, field: str, type_name: str, template: str, *args: object):
+        super().__init__(SchemaValidationError, template, *args)
+        self.schema = schema
+        self.field = field
+        self.type_name = type_name
+
+    def error(self) -> AamlError:
+        if self._error is None:
+            self._error = SchemaValidationError(self.schema, self.field, self.type_name, self.details)
+        return self._error
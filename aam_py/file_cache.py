@@ -0,0 +1,259 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from aam_py.aaml import AAML
+from aam_py.error import IoError
+from aam_py.types.list import ListType
+
+# (mtime_ns, size, sha256 hex digest or None)
+Signature = Tuple[int, int, Optional[str]]
+
+
+class _RecordingAAML(AAML):
+    """
+    An AAML instance that records what its parse depended on, so that the result
+    can be reused for later `@import`s and `@derive`s of the same file.
+    """
+    __slots__ = ('_deps', '_context_free', '_type_refs', '_remote')
+
+    def __init__(self):
+        super().__init__()
+        # path -> signature of every file read while parsing
+        self._deps: Dict[str, Signature] = {}
+        # False once a directive ran whose effect depends on the importer's state
+        self._context_free = True
+        # type names resolved by `@type` aliases
+        self._type_refs: Set[str] = set()
+        # True once a source loader URI was imported or derived, which stat() cannot revalidate
+        self._remote = False
+
+    def _process_directive(self, command_name: str, args: str, line_num: int) -> None:
+        if command_name in ("import", "derive") and '://' in args:
+            from aam_py.sources import is_remote
+            if is_remote(self.unwrap_quotes(args.split('::')[0].strip())):
+                self._remote = True
+        if command_name == "derive":
+            # `@derive` only fills keys missing from the importer's map.
+            self._context_free = False
+        elif command_name == "type":
+            parts = args.split('=', 1)
+            if len(parts) == 2:
+                self._type_refs.add(parts[1].strip())
+        super()._process_directive(command_name, args, line_num)
+
+
+class CachedFile:
+    """A parsed file together with the signatures of every file it was built from."""
+    __slots__ = ('path', 'instance', 'deps', 'context_free', 'type_refs')
+
+    def __init__(self, path: str, instance: Optional[_RecordingAAML], deps: Dict[str, Signature]):
+        self.path = path
+        # None when the file cannot be parsed on its own (it needs the importer's
+        # types, for example); such files are always merged serially.
+        self.instance = instance
+        self.deps = deps
+        self.context_free = instance is not None and instance._context_free
+        self.type_refs = _collect_type_refs(instance) if instance is not None else frozenset()
+
+    def to_payload(self) -> tuple:
+        """Returns a picklable form of this entry, for handing it across processes."""
+        if self.instance is None:
+            return self.path, None, self.deps
+        inst = self.instance
+        state = (inst.get_map(), inst._types, inst.get_schemas(), inst._context_free, inst._type_refs)
+        return self.path, state, self.deps
+
+    @classmethod
+    def from_payload(cls, payload: tuple) -> 'CachedFile':
+        path, state, deps = payload
+        if state is None:
+            return cls(path, None, deps)
+        map_, types, schemas, context_free, type_refs = state
+        instance = _RecordingAAML()
+        instance._map = map_
+        instance._types = types
+        for name, schema_def in schemas.items():
+            instance.register_schema(name, schema_def)
+        instance._deps = deps
+        instance._context_free = context_free
+        instance._type_refs = type_refs
+        return cls(path, instance, deps)
+
+
+def _collect_type_refs(instance: _RecordingAAML) -> frozenset:
+    refs = set(instance._type_refs)
+    for schema_def in instance.get_schemas().values():
+        for type_name in schema_def.fields.values():
+            while type_name is not None:
+                refs.add(type_name)
+                type_name = ListType.parse_inner(type_name)
+    return frozenset(refs)
+
+
+class FileCache:
+    """
+    Process-wide, LRU-bounded cache of parsed AAML files used by `@import` and `@derive`.
+
+    Entries are keyed by resolved path and revalidated on every use by comparing the
+    `stat()` mtime and size of the file and of everything it imported or derived. With
+    `verify_hash`, a changed stat falls back to comparing a SHA-256 of the content.
+    """
+
+    def __init__(self, max_entries: int = 256, verify_hash: bool = False):
+        self.max_entries = max_entries
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, CachedFile]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(os.path.realpath(path), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cached(self, path: str) -> bool:
+        """Returns True if `path` has an entry that is still up to date."""
+        with self._lock:
+            entry = self._entries.get(os.path.realpath(path))
+            return entry is not None and self._is_fresh(entry)
+
+    def store(self, entry: CachedFile) -> None:
+        """Inserts an entry parsed elsewhere, such as in a worker process."""
+        with self._lock:
+            self._entries[entry.path] = entry
+            self._entries.move_to_end(entry.path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def parse(self, path: str) -> CachedFile:
+        """Parses `path` into a new entry without consulting or updating the cache."""
+        return self._parse(path, os.path.realpath(path))
+
+    def load(self, path: str, into: Optional[AAML] = None) -> AAML:
+        """
+        Returns the parsed contents of `path`, equivalent to `AAML.load(path)`.
+        The returned instance is shared and must not be modified.
+        `into` is the instance whose directive triggered the load, if any.
+        """
+        entry = self._get(path)
+        _record(into, entry)
+        if entry.instance is None:
+            return AAML.load(path)
+        return entry.instance
+
+    def merge_into(self, aaml: AAML, path: str) -> None:
+        """
+        Merges `path` into `aaml` with the same result as `aaml.merge_file(path)`.
+
+        A cached file is merged by dict update when its result cannot depend on
+        `aaml`: it ran no `@derive`, none of its keys are declared by schemas in
+        `aaml`, and none of the type names it resolved are registered in `aaml`.
+        Otherwise the file is merged line by line.
+        """
+        entry = self._get(path)
+        _record(aaml, entry)
+        if not _can_merge(aaml, entry):
+            aaml.merge_file(path)
+            return
+
+        base = entry.instance
+        aaml._merge_map(base.get_map())
+        for name, type_def in base._types.items():
+            aaml.register_type(name, type_def)
+        for name, schema_def in base.get_schemas().items():
+            aaml.register_schema(name, schema_def)
+
+    def _get(self, path: str) -> CachedFile:
+        real = os.path.realpath(path)
+        with self._lock:
+            entry = self._entries.get(real)
+            if entry is not None and self._is_fresh(entry):
+                self._entries.move_to_end(real)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._parse(path, real)
+        self.store(entry)
+        return entry
+
+    def _parse(self, path: str, real: str) -> CachedFile:
+        signature = self._signature(path)
+        instance = _RecordingAAML()
+        instance._deps[real] = signature
+        try:
+            instance.merge_file(path)
+        except Exception:
+            return CachedFile(real, None, {real: signature})
+        if instance._remote:
+            # Merged again on every use, so that the loaders revalidate the remote sources.
+            return CachedFile(real, None, instance._deps)
+        return CachedFile(real, instance, instance._deps)
+
+    def _signature(self, path: str) -> Signature:
+        try:
+            st = os.stat(path)
+            digest = None
+            if self.verify_hash:
+                with open(path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError as e:
+            raise IoError(str(e))
+        return st.st_mtime_ns, st.st_size, digest
+
+    def _is_fresh(self, entry: CachedFile) -> bool:
+        for dep, (mtime_ns, size, digest) in entry.deps.items():
+            try:
+                st = os.stat(dep)
+            except OSError:
+                return False
+            if st.st_mtime_ns == mtime_ns and st.st_size == size:
+                continue
+            if digest is None or st.st_size != size:
+                return False
+            if self._signature(dep)[2] != digest:
+                return False
+            entry.deps[dep] = (st.st_mtime_ns, size, digest)
+        return True
+
+
+def _record(aaml: Optional[AAML], entry: CachedFile) -> None:
+    """Propagates a cached file's dependencies to the instance that read it."""
+    if aaml is None:
+        return
+    sources = aaml.get_sources()
+    for dep, (mtime_ns, size, _) in entry.deps.items():
+        sources[dep] = (mtime_ns, size)
+    if isinstance(aaml, _RecordingAAML):
+        aaml._deps.update(entry.deps)
+        if entry.instance is not None:
+            aaml._type_refs.update(entry.type_refs)
+            if not entry.context_free:
+                aaml._context_free = False
+
+
+def _can_merge(aaml: AAML, entry: CachedFile) -> bool:
+    if not entry.context_free:
+        return False
+    for name in entry.type_refs:
+        if aaml.get_type(name) is not None or aaml.get_schema(name) is not None:
+            return False
+    for key in entry.instance.get_map():
+        if aaml.get_field_schemas(key):
+            return False
+    return True
+
+
+file_cache = FileCache()
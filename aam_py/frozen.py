@@ -0,0 +1,193 @@
+"""
+Immutable snapshots of AAML instances for lock-free concurrent readers.
+
+`AAML.freeze` returns a `FrozenAAML`. Consecutive snapshots of one instance share
+structure: the key/value map is stored as a stack of layers, newest first, and a new
+snapshot only adds a layer holding the keys written since the previous one. Adjacent
+layers are merged into a new layer (never in place) once the newer one reaches half the
+size of the older, so a snapshot holds O(log n) layers and publishing one costs amortized
+O(changes * log n). Readers never lock: nothing reachable from a snapshot is mutated,
+apart from lookup memos that are safe to fill concurrently.
+"""
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from aam_py.found_value import FoundValue
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML, SchemaDef
+    from aam_py.types import Type
+
+# Layer value of a key deleted since the older layers were written.
+_DELETED = object()
+_MISSING = object()
+
+
+class FrozenAAML(Mapping):
+    """A read-only snapshot of an AAML instance's map, types and schemas."""
+    __slots__ = ('_layers', '_size', '_types', '_schemas', '_field_index', '_reverse', '_resolved')
+
+    def __init__(
+        self,
+        layers: Tuple[Dict[str, object], ...],
+        size: int,
+        types: Dict[str, 'Type'],
+        schemas: Dict[str, 'SchemaDef'],
+        field_index: Dict[str, List[Tuple[str, str]]],
+    ):
+        self._layers = layers
+        self._size = size
+        self._types = types
+        self._schemas = schemas
+        self._field_index = field_index
+        # Built lazily by `find_key` and `find_deep`
+        self._reverse: Optional[Dict[str, str]] = None
+        self._resolved: Dict[str, str] = {}
+
+    @classmethod
+    def of(cls, aaml: 'AAML') -> 'FrozenAAML':
+        """Copies `aaml` into a snapshot sharing nothing with earlier ones."""
+        return cls(
+            (dict(aaml._map),), len(aaml._map),
+            dict(aaml._types), dict(aaml._schemas), _copy_index(aaml._field_index),
+        )
+
+    def evolve(self, aaml: 'AAML', changed: Iterable[str]) -> 'FrozenAAML':
+        """
+        Returns a snapshot of `aaml`, which this snapshot was taken from and which
+        has since written only the keys in `changed`, listed in the order first written.
+        """
+        current = aaml._map
+        delta: Dict[str, object] = {}
+        size = self._size
+        for key in changed:
+            value = current.get(key, _DELETED)
+            old = self._lookup(key)
+            if value is _DELETED:
+                if old is _MISSING:
+                    continue
+                size -= 1
+            elif old is _MISSING:
+                size += 1
+            elif old == value:
+                continue
+            delta[key] = value
+
+        types, schemas, field_index = self._types, self._schemas, self._field_index
+        if aaml._types != types:
+            types = dict(aaml._types)
+        if aaml._schemas != schemas:
+            schemas = dict(aaml._schemas)
+            field_index = _copy_index(aaml._field_index)
+        if not delta:
+            if types is self._types and schemas is self._schemas:
+                return self
+            return FrozenAAML(self._layers, size, types, schemas, field_index)
+        return FrozenAAML(_push(self._layers, delta), size, types, schemas, field_index)
+
+    def _lookup(self, key: str) -> object:
+        for layer in self._layers:
+            value = layer.get(key, _MISSING)
+            if value is not _MISSING:
+                return _MISSING if value is _DELETED else value
+        return _MISSING
+
+    # Mapping interface
+    def __getitem__(self, key: str) -> str:
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def to_dict(self) -> Dict[str, str]:
+        """Returns the map as a new dict, in insertion order."""
+        layers = self._layers
+        if len(layers) == 1:
+            return dict(layers[0])
+        return _merge(reversed(layers), final=True)
+
+    def __repr__(self) -> str:
+        return f"FrozenAAML({len(self)} keys, {len(self._layers)} layers)"
+
+    # Registries
+    def get_schemas(self) -> Dict[str, 'SchemaDef']:
+        return self._schemas
+
+    def get_schema(self, name: str) -> Optional['SchemaDef']:
+        return self._schemas.get(name)
+
+    def get_type(self, name: str) -> Optional['Type']:
+        return self._types.get(name)
+
+    def get_field_schemas(self, field: str) -> List[Tuple[str, str]]:
+        return self._field_index.get(field, [])
+
+    # Lookup methods, with the semantics of the AAML ones
+    def find_obj(self, key: str) -> Optional[FoundValue]:
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return FoundValue(value)
+        return self.find_key(key)
+
+    def find_key(self, value: str) -> Optional[FoundValue]:
+        """Returns the first key (in insertion order) whose value is `value`. Indexes the snapshot on first use."""
+        reverse = self._reverse
+        if reverse is None:
+            reverse = self._reverse = {v: k for k, v in reversed(self.to_dict().items())}
+        key = reverse.get(value)
+        return FoundValue(key) if key is not None else None
+
+    def find_deep(self, key: str) -> Optional[FoundValue]:
+        from aam_py.aaml import resolve_alias
+        terminal = resolve_alias(self, self._resolved, key)
+        return FoundValue(terminal) if terminal is not None else None
+
+
+def _copy_index(index: Dict[str, List[Tuple[str, str]]]) -> Dict[str, List[Tuple[str, str]]]:
+    # The instance appends to these lists in place.
+    return {field: list(entries) for field, entries in index.items()}
+
+
+def _push(layers: Tuple[Dict[str, object], ...], delta: Dict[str, object]) -> Tuple[Dict[str, object], ...]:
+    stack = [delta, *layers]
+    while len(stack) > 1 and 2 * len(stack[0]) >= len(stack[1]):
+        merged = _merge((stack[1], stack[0]), final=len(stack) == 2)
+        stack[0:2] = [merged]
+    return tuple(stack)
+
+
+def _merge(layers: Iterable[Dict[str, object]], final: bool) -> Dict[str, object]:
+    """Merges `layers`, oldest first, into a new dict. Deletions are dropped if `final`."""
+    merged: Dict[str, object] = {}
+    deleted = False
+    for i, layer in enumerate(layers):
+        merged.update(layer)
+        # The oldest layer never holds deletions that matter here.
+        if i and not deleted:
+            deleted = _DELETED in layer.values()
+    if final and deleted:
+        for key in [k for k, v in merged.items() if v is _DELETED]:
+            del merged[key]
+    return merged
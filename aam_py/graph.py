@@ -0,0 +1,97 @@
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from aam_py.aaml import AAML
+from aam_py.error import IoError
+from aam_py.file_cache import CachedFile, FileCache, file_cache
+from aam_py.parsing import strip_comment, unwrap_quotes
+
+
+def scan_directives(file_path: str) -> List[str]:
+    """
+    Returns the paths referenced by `@import` and `@derive` in `file_path`, in order.
+    Only directive lines are looked at, so the file is not parsed or validated.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return directive_paths(f)
+    except IOError as e:
+        raise IoError(str(e))
+
+
+def directive_paths(lines: Iterable[str]) -> List[str]:
+    """Returns the paths referenced by `@import` and `@derive` in `lines`, in order."""
+    paths = []
+    for raw in lines:
+        if '@' not in raw:
+            continue
+        line = strip_comment(raw).strip()
+        if not line.startswith('@'):
+            continue
+        parts = line[1:].split(None, 1)
+        if len(parts) != 2:
+            continue
+        name, args = parts
+        if name == "import":
+            path = unwrap_quotes(args.strip())
+        elif name == "derive":
+            path = unwrap_quotes(args.split('::')[0].strip())
+        else:
+            continue
+        if path:
+            paths.append(path)
+    return paths
+
+
+def discover(root: str) -> Dict[str, List[str]]:
+    """Returns the import/derive graph reachable from `root`, as path -> referenced paths."""
+    graph: Dict[str, List[str]] = {}
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        if path in graph:
+            continue
+        graph[path] = scan_directives(path) if os.path.exists(path) else []
+        stack.extend(p for p in graph[path] if p not in graph)
+    return graph
+
+
+def _parse_payload(path: str, verify_hash: bool) -> tuple:
+    return FileCache(verify_hash=verify_hash).parse(path).to_payload()
+
+
+def _make_executor(max_workers: Optional[int]) -> Executor:
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    if is_gil_enabled is not None and not is_gil_enabled():
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def load_graph(root: str, max_workers: Optional[int] = None) -> AAML:
+    """
+    Loads `root` like `AAML.load`, parsing the files it imports or derives in parallel.
+
+    The import/derive graph is discovered with `scan_directives` first. Files that
+    reference no other file are parsed concurrently (in worker processes, or threads on
+    free-threaded builds) and stored in the shared `file_cache`. `root` is then loaded
+    serially, so directives run in the usual order and every `@import`/`@derive` of a
+    pre-parsed file is a cache hit. The result is identical to `AAML.load(root)`.
+    """
+    graph = discover(root)
+    leaves = [
+        path for path, refs in graph.items()
+        if not refs and path != root and os.path.exists(path) and not file_cache.is_cached(path)
+    ]
+
+    if len(leaves) > 1 and max_workers != 1:
+        with _make_executor(max_workers) as executor:
+            futures = [executor.submit(_parse_payload, path, file_cache.verify_hash) for path in leaves]
+            for future in futures:
+                file_cache.store(CachedFile.from_payload(future.result()))
+    else:
+        for path in leaves:
+            file_cache.store(file_cache.parse(path))
+
+    return AAML.load(root)
@@ -0,0 +1,200 @@
+"""
+Incremental re-parsing of changed AAML documents.
+
+A `Document` holds the lines of one version of a source and its statements,
+`(is_directive, key or name, value or arguments)` tuples in source order, with the line
+each starts on. `Document.update` re-tokenizes only the lines between the common prefix
+and suffix of two versions. `apply_update` then re-processes only the assignments that
+changed. It declines (returns False) whenever that could differ from parsing the new
+version from scratch, and the caller then re-parses fully:
+
+* a directive was added, removed or changed;
+* a directive follows the first change, since it would observe the changed state;
+* a key's final value or position depends on what an earlier `@import`, `@derive`
+  or custom directive wrote, which the statements alone do not tell.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from aam_py.parsing import Token, TokenKind, tokenize
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+# (is_directive, key or directive name, value or directive arguments)
+Statement = Tuple[bool, str, str]
+# First changed statement, end of the change in the old and in the new statements
+Window = Tuple[int, int, int]
+
+# Directives that never write keys.
+_PURE_DIRECTIVES = frozenset(("schema", "type"))
+
+
+class Document:
+    """The lines of one version of a source together with its statements."""
+    __slots__ = ('lines', 'statements', 'starts')
+
+    def __init__(self, lines: List[str], statements: List[Statement], starts: List[int]):
+        self.lines = lines
+        self.statements = statements
+        # 0-based line each statement starts on
+        self.starts = starts
+
+    @classmethod
+    def parse(cls, lines: List[str]) -> 'Document':
+        statements, starts = [], []
+        _collect(tokenize(lines), statements, starts)
+        return cls(lines, statements, starts)
+
+    def update(self, lines: List[str]) -> Tuple['Document', Window]:
+        """
+        Returns the document for the new version `lines` of this source, and the window
+        of statements that may differ. Only lines from the last statement starting in
+        the common prefix to the first statement starting in the common suffix are
+        re-tokenized, unless the change leaves a directive block open across the suffix.
+        """
+        old_lines, starts = self.lines, self.starts
+        limit = min(len(old_lines), len(lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == lines[-1 - suffix]:
+            suffix += 1
+
+        # Statements that end before the first changed line are kept as they are.
+        head = max(bisect_right(starts, prefix) - 1, 0)
+        head_line = starts[head] if head else 0
+        # So are those starting in the common suffix, provided one starts on the same line.
+        tail = bisect_left(starts, len(old_lines) - suffix)
+        shift = len(lines) - len(old_lines)
+        tail_line = starts[tail] + shift if tail < len(starts) else len(lines)
+
+        statements, new_starts = self.statements[:head], starts[:head]
+        tokens = tokenize(lines[head_line:], head_line + 1)
+        if _collect(tokens, statements, new_starts, tail_line):
+            statements += self.statements[tail:]
+            new_starts += [start + shift for start in starts[tail:]]
+            end_old = tail
+        else:
+            end_old = len(self.statements)
+        end_new = len(statements) - (len(self.statements) - end_old)
+        return Document(lines, statements, new_starts), (head, end_old, end_new)
+
+
+def _collect(
+    tokens: Iterator[Token], statements: List[Statement], starts: List[int], stop_line: Optional[int] = None
+) -> bool:
+    """
+    Appends the statements of `tokens` to `statements` and their start lines to `starts`.
+    Stops before a statement starting on `stop_line` and returns True if it found one.
+    """
+    for token in tokens:
+        line = token.line - 1
+        if stop_line is not None and line >= stop_line:
+            if line == stop_line:
+                return True
+            stop_line = None
+        if token.kind is TokenKind.KEY:
+            next(tokens)  # EQUALS
+            statements.append((False, token.text, next(tokens).text))
+        elif token.kind is TokenKind.DIRECTIVE:
+            statements.append((True, token.text, next(tokens).text))
+        starts.append(line)
+    return False
+
+
+def apply_update(aaml: 'AAML', old: Document, new: Document, window: Optional[Window] = None) -> bool:
+    """
+    Turns `aaml`, the result of parsing `old`, into the result of parsing `new`.
+    `window` limits the comparison to the statements `Document.update` re-tokenized.
+    Returns False, leaving `aaml` untouched, if the change needs a full re-parse.
+    Raises like a full parse would if a changed assignment fails validation.
+    """
+    old_statements, new_statements = old.statements, new.statements
+    if window is None:
+        window = (0, len(old_statements), len(new_statements))
+    start, end_old, end_new = _changed_range(old_statements, new_statements, window)
+    removed = old_statements[start:end_old]
+    added = new_statements[start:end_new]
+    if not removed and not added:
+        return True
+    if any(s[0] for s in removed) or any(s[0] for s in new_statements[start:]):
+        return False
+
+    affected: Set[str] = {s[1] for s in removed}
+    affected.update(s[1] for s in added)
+
+    last_writer = -1
+    for i in range(start):
+        statement = new_statements[i]
+        if statement[0] and statement[1] not in _PURE_DIRECTIVES:
+            last_writer = i
+
+    last_assigned: Dict[str, int] = {}
+    for i in range(start, len(new_statements)):
+        key = new_statements[i][1]
+        if key in affected:
+            last_assigned[key] = i
+
+    final: Dict[str, Optional[str]] = {}
+    for key in affected:
+        index = last_assigned.get(key)
+        if index is None:
+            index = _last_assigned(new_statements, key, start)
+            if last_writer >= 0 and (index is None or index < last_writer):
+                return False
+        final[key] = None if index is None else new_statements[index][2]
+
+    # Keys first written at or after the change may move within the map.
+    reorder = (
+        _first_assigned(old_statements, affected, start) is not None
+        or _first_assigned(new_statements, affected, start) is not None
+    )
+    if reorder and last_writer >= 0:
+        return False
+
+    for i in range(start, end_new):
+        _, key, value = new_statements[i]
+        aaml._validate_assignment(key, value, new.starts[i] + 1)
+
+    for key, value in final.items():
+        if value is None:
+            aaml._delete(key)
+        else:
+            aaml._assign(key, value)
+    if reorder:
+        aaml._reorder(dict.fromkeys(s[1] for s in new_statements if not s[0]))
+    return True
+
+
+def _changed_range(old: List[Statement], new: List[Statement], window: Window) -> Window:
+    start, end_old, end_new = window
+    while start < end_old and start < end_new and old[start] == new[start]:
+        start += 1
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    return start, end_old, end_new
+
+
+def _last_assigned(document: List[Statement], key: str, end: int) -> Optional[int]:
+    for i in range(end - 1, -1, -1):
+        statement = document[i]
+        if statement[1] == key and not statement[0]:
+            return i
+    return None
+
+
+def _first_assigned(document: List[Statement], keys: Set[str], start: int) -> Optional[str]:
+    """Returns a key of `keys` whose first assignment in `document` is at or after `start`."""
+    seen = set()
+    for i in range(start):
+        statement = document[i]
+        key = statement[1]
+        if not statement[0] and key in keys:
+            seen.add(key)
+            if len(seen) == len(keys):
+                return None
+    # The rest are first assigned at or after `start`, or never.
+    return next(iter(keys - seen), None)
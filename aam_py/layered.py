@@ -0,0 +1,171 @@
+"""
+Overlays: AAML instances layered on a parent without copying it.
+
+`AAML.overlay` returns a `LayeredAAML` whose map, types, schemas and sources are
+`ChainMap`s: writes go to the overlay's own layer and lookups fall through to the
+parent's. The result of merging into an overlay is the same as merging into a copy of
+the parent, so `@derive` only fills keys neither layer sets, `+` and `+=` take keys from
+either layer, and deleting an overlay key uncovers the parent's value, while unregistering
+a type hides the parent's one. Only the parent's schema index is shared, until the overlay
+registers a schema of its own.
+
+The parent must not be modified while overlays of it are in use: their lookup caches
+would go stale. `flatten` materializes an overlay into a plain, independent AAML.
+"""
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Dict, Iterable
+
+from aam_py.aaml import AAML, SchemaDef
+
+
+def _chain(own: dict, parent) -> ChainMap:
+    # Overlays of overlays share one flat chain rather than nesting them.
+    if isinstance(parent, ChainMap):
+        return ChainMap(own, *parent.maps)
+    return ChainMap(own, parent)
+
+
+class _TypeLayers(ChainMap):
+    """The layered type registry: names in `hidden` are unregistered from the parent layers."""
+
+    def __init__(self, own: dict, parent):
+        if isinstance(parent, ChainMap):
+            super().__init__(own, *parent.maps)
+            self.hidden = set(getattr(parent, 'hidden', ()))
+        else:
+            super().__init__(own, parent)
+            self.hidden = set()
+
+    def __getitem__(self, key):
+        if key in self.hidden:
+            return self.__missing__(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key) -> bool:
+        return key not in self.hidden and super().__contains__(key)
+
+    def __iter__(self):
+        hidden = self.hidden
+        return (key for key in super().__iter__() if key not in hidden)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return any(True for _ in self)
+
+    def __setitem__(self, key, value) -> None:
+        self.hidden.discard(key)
+        self.maps[0][key] = value
+
+    def hide(self, key) -> None:
+        self.maps[0].pop(key, None)
+        if any(key in mapping for mapping in self.maps[1:]):
+            self.hidden.add(key)
+
+
+class LayeredAAML(AAML):
+    """An AAML instance whose state is layered on top of a parent instance."""
+    __slots__ = ('_parent', '_shared_index')
+
+    def __init__(self, parent: AAML):
+        super().__init__()
+        self._parent = parent
+        commands = parent._commands
+        self._commands = commands if isinstance(commands, MappingProxyType) else MappingProxyType(commands)
+        self._attach()
+
+    def _attach(self) -> None:
+        parent = self._parent
+        self._map = _chain({}, parent._map)
+        self._types = _TypeLayers({}, parent._types)
+        self._schemas = _chain({}, parent._schemas)
+        self._sources = _chain({}, parent._sources)
+        self._field_index = parent._field_index
+        self._shared_index = True
+
+    @property
+    def parent(self) -> AAML:
+        return self._parent
+
+    def get_layer(self) -> Dict[str, str]:
+        """Returns the keys set on this overlay itself. Treat it as read-only."""
+        return self._map.maps[0]
+
+    def get_map(self) -> ChainMap:
+        """Returns the layered key/value map. Treat it as read-only; see `flatten` for a dict."""
+        return self._map
+
+    def flatten(self) -> AAML:
+        """Returns a plain AAML holding the merged layers, independent of the parent."""
+        flat = AAML()
+        flat._map = dict(self._map)
+        flat._types = dict(self._types)
+        for name, schema_def in self._schemas.items():
+            flat.register_schema(name, schema_def)
+        flat._sources = dict(self._sources)
+        if self._commands is not flat._commands:
+            flat._commands = dict(self._commands)
+        return flat
+
+    def commit(self) -> None:
+        """
+        Writes this overlay's own keys, types, schemas and sources into the parent, which
+        then holds what merging into it directly would have produced. The overlay must
+        not be used afterwards.
+        """
+        parent = self._parent
+        for name in self._types.hidden:
+            parent.unregister_type(name)
+        for name, type_def in self._types.maps[0].items():
+            parent.register_type(name, type_def)
+        for name, schema_def in self._schemas.maps[0].items():
+            parent.register_schema(name, schema_def)
+        parent._merge_map(self._map.maps[0])
+        parent._sources.update(self._sources.maps[0])
+
+    def unregister_type(self, name: str) -> None:
+        # ChainMap only deletes from the first layer.
+        self._types.hide(name)
+        self._registered.pop(('type', name), None)
+        self._registry_changed()
+
+    def register_schema(self, name: str, schema_def: SchemaDef) -> None:
+        if self._shared_index:
+            # The parent appends to its index lists in place.
+            self._field_index = {field: list(entries) for field, entries in self._field_index.items()}
+            self._shared_index = False
+        super().register_schema(name, schema_def)
+
+    def _rebuild_field_index(self) -> None:
+        super()._rebuild_field_index()
+        self._shared_index = False
+
+    def _restore(self, registered) -> None:
+        self._attach()
+        super()._restore(registered)
+
+    def _delete(self, key: str) -> None:
+        if key not in self._map.maps[0]:
+            return
+        super()._delete(key)
+        if key in self._map:
+            # The parent's value shows through again, at the parent's position.
+            self._reverse = None
+
+    def _reorder(self, keys: Iterable[str]) -> None:
+        layer = self._map.maps[0]
+        self._map.maps[0] = {key: layer[key] for key in keys if key in layer}
+        self._dirty = None
+        self._reverse = None
+        self._resolved = {}
+
+    def _build_reverse(self) -> Dict[str, str]:
+        reverse: Dict[str, str] = {}
+        for key, value in self._map.items():
+            reverse.setdefault(value, key)
+        return reverse
+
+    def __repr__(self) -> str:
+        return f"LayeredAAML({len(self._map.maps[0])} own keys, {len(self._map.maps)} layers)"
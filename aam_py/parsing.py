@@ -1,21 +1,63 @@
-from typing import Optional, Tuple, List, Dict
+import re
+from enum import Enum
+from typing import Callable, Optional, Tuple, List, Dict, Iterable, Iterator, Union
+
+from aam_py.error import ParseError
+
+# Scanners used by every helper below. Each one only stops on the characters
+# that matter for its job, so the Python-level loops run once per structural
+# character instead of once per character.
+_COMMENT_SCAN = re.compile(r'"[^"]*"?|\'[^\']*\'?|(?<!\S)#(?!\S)')
+_ASSIGN_SCAN = re.compile(r'[=\[\]{}]')
+_FIELD_SCAN = re.compile(r'[,\[\]{}]')
+_PAIR_SCAN = re.compile(r'[=:\[\]{}]')
+
+
+class TokenKind(Enum):
+    """Kinds of tokens produced by `tokenize`."""
+    KEY = "key"
+    EQUALS = "="
+    VALUE = "value"
+    DIRECTIVE = "directive"
+    BLOCK = "block"
+
+
+class Token:
+    """A single comment-stripped lexical token with its 1-based source line."""
+    __slots__ = ('kind', 'text', 'line')
+
+    def __init__(self, kind: TokenKind, text: str, line: int):
+        self.kind = kind
+        self.text = text
+        self.line = line
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind.name}, {self.text!r}, line={self.line})"
+
+
+def _find_top_level(scanner: re.Pattern, s: str) -> int:
+    """Returns the index of the first non-bracket scanner match at depth 0, or -1."""
+    depth = 0
+    for m in scanner.finditer(s):
+        ch = m.group()
+        if ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+        elif depth == 0:
+            return m.start()
+    return -1
+
 
 def strip_comment(line: str) -> str:
     """Strips an inline `#` comment from a raw source line, respecting quoted strings."""
-    quote_state = None
-    
-    for idx, c in enumerate(line):
-        if quote_state is None and c == '#':
-            preceded_by_space = idx == 0 or line[idx - 1].isspace()
-            followed_by_space = idx + 1 == len(line) or line[idx + 1].isspace()
-            if preceded_by_space and followed_by_space:
-                return line[:idx]
-                
-        elif quote_state is None and c in ('"', "'"):
-            quote_state = c
-        elif quote_state == c:
-            quote_state = None
-            
+    if '#' not in line:
+        return line
+
+    for m in _COMMENT_SCAN.finditer(line):
+        if m.group() == '#':
+            return line[:m.start()]
+
     return line
 
 def unwrap_quotes(s: str) -> str:
@@ -33,18 +75,8 @@ def parse_assignment(line: str) -> Tuple[str, str]:
     Parses a `key = value` assignment and returns trimmed (key, value).
     Raises ValueError with error message string on failure.
     """
-    depth = 0
-    eq_pos = -1
-    
-    for i, ch in enumerate(line):
-        if ch in ('{', '['):
-            depth += 1
-        elif ch in ('}', ']'):
-            depth -= 1
-        elif ch == '=' and depth == 0:
-            eq_pos = i
-            break
-            
+    eq_pos = _find_top_level(_ASSIGN_SCAN, line)
+
     if eq_pos == -1:
         raise ValueError("Missing assignment operator '='")
         
@@ -75,6 +107,75 @@ def block_is_complete(buf: str) -> bool:
     closes = buf.count('}')
     return closes >= opens
 
+def _directive_tokens(line: str, line_num: int) -> Tuple[Token, Token]:
+    parts = line[1:].split(None, 1)
+    name = parts[0].strip() if parts else ""
+    args = parts[1] if len(parts) > 1 else ""
+
+    if not name:
+        raise ParseError(line_num, line[1:], "Empty directive")
+
+    kind = TokenKind.BLOCK if '{' in args else TokenKind.VALUE
+    return Token(TokenKind.DIRECTIVE, name, line_num), Token(kind, args, line_num)
+
+def tokenize(
+    source: Union[str, Iterable[str]],
+    first_line: int = 1,
+    *,
+    strip: Callable[[str], str] = strip_comment,
+    assign: Callable[[str], Tuple[str, str]] = parse_assignment,
+) -> Iterator[Token]:
+    """
+    Lexes AAML source in a single pass and yields comment-stripped tokens.
+
+    `source` is either a whole content buffer or any iterable of lines (such as an
+    open text file). Assignments produce `KEY`, `EQUALS` and `VALUE` tokens; directives
+    produce a `DIRECTIVE` token followed by exactly one `VALUE` (plain arguments) or
+    `BLOCK` (arguments containing a `{...}` block, joined across lines) token.
+    Raises ParseError for lines that are neither assignments nor directives.
+    `strip` and `assign` stand in for `strip_comment` and `parse_assignment`,
+    so that `aam_py.profiling` can time them.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+
+    block: Optional[List[str]] = None
+    block_start = 0
+    depth = 0
+
+    for line_num, raw in enumerate(lines, first_line):
+        line = strip(raw).strip()
+
+        if block is not None:
+            block.append(line)
+            depth += line.count('{') - line.count('}')
+            if depth <= 0:
+                yield from _directive_tokens(' '.join(block), block_start)
+                block = None
+            continue
+
+        if not line:
+            continue
+
+        if line[0] == '@':
+            depth = line.count('{') - line.count('}')
+            if depth > 0:
+                block = [line]
+                block_start = line_num
+                continue
+            yield from _directive_tokens(line, line_num)
+            continue
+
+        try:
+            key, value = assign(line)
+        except ValueError as e:
+            raise ParseError(line_num, line, str(e))
+        yield Token(TokenKind.KEY, key, line_num)
+        yield Token(TokenKind.EQUALS, '=', line_num)
+        yield Token(TokenKind.VALUE, value, line_num)
+
+    if block is not None:
+        yield from _directive_tokens(' '.join(block), block_start)
+
 def is_inline_object(value: str) -> bool:
     """Returns True if value is an inline object literal { ... }."""
     v = value.strip()
@@ -84,36 +185,27 @@ def split_top_level_fields(s: str) -> List[str]:
     """Splits `s` on commas that are not inside `{}` or `[]`."""
     items = []
     depth = 0
-    cur = []
-    
-    for ch in s:
-        if ch in ('{', '['):
+    start = 0
+
+    for m in _FIELD_SCAN.finditer(s):
+        ch = m.group()
+        if ch in '{[':
             depth += 1
-            cur.append(ch)
-        elif ch in ('}', ']'):
+        elif ch in '}]':
             depth -= 1
-            cur.append(ch)
-        elif ch == ',' and depth == 0:
-            items.append(''.join(cur))
-            cur.clear()
-        else:
-            cur.append(ch)
-            
-    items.append(''.join(cur))
+        elif depth == 0:
+            items.append(s[start:m.start()])
+            start = m.end()
+
+    items.append(s[start:])
     return items
 
 def split_field_pair(entry: str) -> Tuple[str, str]:
     """Splits 'key = val' or 'key: val' on the first = or : at depth 0."""
-    depth = 0
-    for i, ch in enumerate(entry):
-        if ch in ('{', '['):
-            depth += 1
-        elif ch in ('}', ']'):
-            depth -= 1
-        elif ch in ('=', ':') and depth == 0:
-            return entry[:i], entry[i + 1:]
-            
-    raise ValueError(f"Inline object field '{entry}' has no '=' or ':' separator")
+    pos = _find_top_level(_PAIR_SCAN, entry)
+    if pos == -1:
+        raise ValueError(f"Inline object field '{entry}' has no '=' or ':' separator")
+    return entry[:pos], entry[pos + 1:]
 
 def parse_inline_object(value: str) -> List[Tuple[str, str]]:
     """
@@ -0,0 +1,247 @@
+"""
+Opt-in timing of the parse pipeline.
+
+`AAML.enable_stats` attaches a `ParseStats` to an instance. Every merge into it then
+records where the time goes, as a stack of frames:
+
+* `file:<path>` or `content` for each source merged, with `io` for reading a file;
+* `tokenize` for lexing, with `strip_comment` and `parse_assignment` beneath it;
+* `validate` and `assign` for each assignment;
+* `@<directive>` for each directive (`@import <path>` and `@derive <path>` name the
+  source), with the sources it merges beneath it.
+
+Sources merged while a profiled merge runs are recorded under its current frame even
+when they are parsed into another instance, such as the base of a `@derive` or a
+`file_cache` entry. Instances without stats only pay for one attribute check and one
+ContextVar lookup per merge. A ParseStats must not be shared across threads.
+"""
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from aam_py.parsing import TokenKind, parse_assignment, strip_comment, tokenize, unwrap_quotes
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+# The stats of the profiled merge running in this context, if any
+_active: ContextVar[Optional['ParseStats']] = ContextVar("aaml_parse_stats", default=None)
+
+
+def active_stats() -> Optional['ParseStats']:
+    """Returns the stats of the profiled merge in progress, if any."""
+    return _active.get()
+
+
+class ParseStats:
+    """Cumulative timings and counters of the merges into one AAML instance."""
+    __slots__ = (
+        'stacks', 'files', 'validations', 'lines', 'checker_hits', 'checker_misses',
+        '_frames', '_file_cache_start',
+    )
+
+    def __init__(self):
+        # frame labels, outermost first -> seconds spent in the innermost frame itself
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        # source label -> counters; see `to_dict`
+        self.files: Dict[str, Dict[str, float]] = {}
+        # type name -> values validated against it as a schema field
+        self.validations: Dict[str, int] = {}
+        self.lines = 0
+        self.checker_hits = 0
+        self.checker_misses = 0
+        # [label, start, seconds spent in child frames]
+        self._frames: List[List[Any]] = []
+        from aam_py.file_cache import file_cache
+        self._file_cache_start = (file_cache.hits, file_cache.misses)
+
+    # Recording
+    def profile(self, label: str, merge: Callable[..., None], *args: Any) -> None:
+        """Runs `merge(*args)` in a frame for the source `label`."""
+        record = self.files.get(label)
+        if record is None:
+            record = self.files[label] = {
+                "time": 0.0, "merges": 0, "lines": 0, "assignments": 0, "directives": 0
+            }
+        record["merges"] += 1
+        token = _active.set(self)
+        self._push(label)
+        try:
+            merge(*args)
+        finally:
+            record["time"] += self._pop()
+            _active.reset(token)
+
+    def add(self, labels: Tuple[str, ...], seconds: float) -> None:
+        """Records `seconds` spent in the frames `labels` below the current one."""
+        key = tuple(frame[0] for frame in self._frames) + labels
+        self.stacks[key] = self.stacks.get(key, 0.0) + seconds
+        if self._frames:
+            self._frames[-1][2] += seconds
+
+    def _push(self, label: str) -> None:
+        self._frames.append([label, perf_counter(), 0.0])
+
+    def _pop(self) -> float:
+        label, start, children = self._frames.pop()
+        elapsed = perf_counter() - start
+        key = tuple(frame[0] for frame in self._frames) + (label,)
+        self.stacks[key] = self.stacks.get(key, 0.0) + elapsed - children
+        if self._frames:
+            self._frames[-1][2] += elapsed
+        return elapsed
+
+    def _source(self) -> Dict[str, float]:
+        for label, _, _ in reversed(self._frames):
+            record = self.files.get(label)
+            if record is not None:
+                return record
+        return {}
+
+    def merge(self, aaml: 'AAML', source: Union[str, Iterable[str]]) -> None:
+        """Merges `source` into `aaml` like `AAML._merge_tokens(tokenize(source))`, timing each phase."""
+        strip_time = parse_time = 0.0
+        lines = 0
+
+        def strip(line: str) -> str:
+            nonlocal strip_time, lines
+            start = perf_counter()
+            result = strip_comment(line)
+            strip_time += perf_counter() - start
+            lines += 1
+            return result
+
+        def assign(line: str) -> Tuple[str, str]:
+            nonlocal parse_time
+            start = perf_counter()
+            try:
+                return parse_assignment(line)
+            finally:
+                parse_time += perf_counter() - start
+
+        record = self._source()
+        tokens = tokenize(source, strip=strip, assign=assign)
+        lex_time = validate_time = assign_time = 0.0
+        assignments = directives = 0
+        try:
+            while True:
+                start = perf_counter()
+                token = next(tokens, None)
+                if token is None:
+                    lex_time += perf_counter() - start
+                    break
+                if token.kind is TokenKind.KEY:
+                    next(tokens)  # EQUALS
+                    value = next(tokens).text
+                    lex_time += perf_counter() - start
+                    key = token.text
+                    self._count_validations(aaml, key)
+                    start = perf_counter()
+                    aaml._validate_assignment(key, value, token.line)
+                    checked = perf_counter()
+                    aaml._assign(key, value)
+                    validate_time += checked - start
+                    assign_time += perf_counter() - checked
+                    assignments += 1
+                elif token.kind is TokenKind.DIRECTIVE:
+                    args = next(tokens).text
+                    lex_time += perf_counter() - start
+                    self._push(_directive_label(token.text, args))
+                    try:
+                        aaml._process_directive(token.text, args, token.line)
+                    finally:
+                        self._pop()
+                    directives += 1
+                else:
+                    lex_time += perf_counter() - start
+        finally:
+            self.add(("tokenize",), lex_time - strip_time - parse_time)
+            self.add(("tokenize", "strip_comment"), strip_time)
+            self.add(("tokenize", "parse_assignment"), parse_time)
+            self.add(("validate",), validate_time)
+            self.add(("assign",), assign_time)
+            self.lines += lines
+            if record:
+                record["lines"] += lines
+                record["assignments"] += assignments
+                record["directives"] += directives
+
+    def _count_validations(self, aaml: 'AAML', key: str) -> None:
+        for _, type_name in aaml.get_field_schemas(key):
+            self.validations[type_name] = self.validations.get(type_name, 0) + 1
+            if type_name in aaml._checkers:
+                self.checker_hits += 1
+            else:
+                self.checker_misses += 1
+
+    # Export
+    def phases(self) -> Dict[str, float]:
+        """Returns the seconds spent in each kind of frame, excluding nested frames."""
+        totals: Dict[str, float] = {}
+        for stack, seconds in self.stacks.items():
+            phase = _phase(stack[-1])
+            totals[phase] = totals.get(phase, 0.0) + seconds
+        return totals
+
+    def total(self) -> float:
+        """Returns the seconds spent in profiled merges."""
+        return sum(self.stacks.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        from aam_py.file_cache import file_cache
+        file_hits = file_cache.hits - self._file_cache_start[0]
+        file_misses = file_cache.misses - self._file_cache_start[1]
+        return {
+            "total": self.total(),
+            "lines": self.lines,
+            "phases": self.phases(),
+            "files": {label: dict(record) for label, record in self.files.items()},
+            "validations": dict(self.validations),
+            "cache": {
+                "checkers": _rate(self.checker_hits, self.checker_misses),
+                "file_cache": _rate(file_hits, file_misses),
+            },
+            "stacks": {";".join(stack): seconds for stack, seconds in self.stacks.items()},
+        }
+
+    def to_collapsed(self) -> str:
+        """
+        Returns the stacks in the collapsed format read by flamegraph.pl, speedscope and
+        similar tools: one `frame;frame;frame microseconds` line per stack.
+        """
+        lines = []
+        for stack, seconds in self.stacks.items():
+            micros = round(seconds * 1e6)
+            if micros > 0:
+                lines.append(f"{';'.join(_frame(label) for label in stack)} {micros}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_collapsed())
+
+    def __repr__(self) -> str:
+        return f"ParseStats({self.lines} lines, {self.total() * 1000:.2f} ms)"
+
+
+def _directive_label(name: str, args: str) -> str:
+    if name in ("import", "derive"):
+        path = unwrap_quotes(args.split('::')[0].strip())
+        return f"@{name} {path}"
+    return f"@{name}"
+
+
+def _phase(label: str) -> str:
+    if label.startswith("file:"):
+        return "file"
+    return label.split(' ', 1)[0]
+
+
+def _frame(label: str) -> str:
+    # `;` separates the frames of a collapsed stack.
+    return label.replace(';', ',')
+
+
+def _rate(hits: int, misses: int) -> Dict[str, float]:
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
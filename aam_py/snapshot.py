@@ -0,0 +1,221 @@
+"""
+Binary snapshots of fully parsed AAML instances.
+
+A snapshot stores the key/value map, schemas, type aliases and a manifest of the source
+files (with their mtime and size) the instance was parsed from. Loading one decodes every
+string in bulk and performs no parsing or validation. Use `is_stale` to check the manifest
+and fall back to parsing the text sources when it returns True.
+
+Layout (little-endian)::
+
+    magic b"AAMS", u16 version, u16 reserved
+    u32 counts: sources, map entries, types, schemas, schema fields
+    i64[2 * sources]   mtime_ns, size of each source
+    u32[sources]       byte length of each source path
+    UTF-8 source paths
+    u32[schemas]       field count of each schema
+    u8[fields]         optional flag of each schema field
+    u32[strings]       length (in characters) of each string
+    u32                byte length of the string blob
+    UTF-8 string blob
+
+Strings appear in the blob in this order: map keys and values interleaved, type aliases
+and type paths interleaved, schema names, then field names and field types interleaved.
+"""
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import BinaryIO, Dict, List, Tuple, TYPE_CHECKING
+
+from aam_py.error import AamlError, IoError, NotFoundError
+from aam_py.types import builtin_path, resolve_builtin
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+MAGIC = b"AAMS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHH5I")
+_BLOB_LEN = struct.Struct("<I")
+
+
+def _pack(typecode: str, values: List[int]) -> bytes:
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def dump_snapshot(aaml: 'AAML', path: str) -> None:
+    """
+    Writes a binary snapshot of `aaml` to `path`.
+    Raises AamlError if a registered type is not a built-in type and cannot be stored by name.
+    """
+    sources = aaml.get_sources()
+    data = aaml.get_map()
+    schemas = aaml.get_schemas()
+
+    stats: List[int] = []
+    for mtime_ns, size in sources.values():
+        stats.extend((mtime_ns, size))
+    source_paths = [p.encode("utf-8") for p in sources]
+
+    strings: List[str] = []
+    for k, v in data.items():
+        strings.append(k)
+        strings.append(v)
+
+    type_count = 0
+    for alias, type_def in aaml._types.items():
+        type_path = builtin_path(type_def)
+        if type_path is None:
+            raise AamlError(f"Cannot snapshot type '{alias}': only built-in types can be stored")
+        strings.append(alias)
+        strings.append(type_path)
+        type_count += 1
+
+    strings.extend(schemas)
+    field_counts: List[int] = []
+    optional = bytearray()
+    for schema_def in schemas.values():
+        field_counts.append(len(schema_def.fields))
+        for field, type_name in schema_def.fields.items():
+            strings.append(field)
+            strings.append(type_name)
+            optional.append(schema_def.is_optional(field))
+
+    blob = "".join(strings).encode("utf-8")
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(sources), len(data), type_count, len(schemas), len(optional))
+
+    try:
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(_pack("q", stats))
+            f.write(_pack("I", [len(p) for p in source_paths]))
+            f.write(b"".join(source_paths))
+            f.write(_pack("I", field_counts))
+            f.write(optional)
+            f.write(_pack("I", [len(s) for s in strings]))
+            f.write(_BLOB_LEN.pack(len(blob)))
+            f.write(blob)
+    except OSError as e:
+        raise IoError(str(e))
+
+
+def _read_exact(f: BinaryIO, n: int, path: str) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise IoError(f"Truncated AAML snapshot '{path}'")
+    return data
+
+
+def _read_array(f: BinaryIO, typecode: str, count: int, path: str) -> array:
+    arr = array(typecode)
+    arr.frombytes(_read_exact(f, count * arr.itemsize, path))
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _read_head(f: BinaryIO, path: str) -> Tuple[Tuple[int, ...], Dict[str, Tuple[int, int]]]:
+    """Reads the header and the source manifest, leaving `f` positioned at the body."""
+    head = f.read(_HEADER.size)
+    if len(head) != _HEADER.size or head[:4] != MAGIC:
+        raise IoError(f"'{path}' is not an AAML snapshot")
+    _, version, _, *counts = _HEADER.unpack(head)
+    if version != VERSION:
+        raise IoError(f"Unsupported AAML snapshot version {version} in '{path}'")
+
+    n_sources = counts[0]
+    stats = _read_array(f, "q", 2 * n_sources, path)
+    path_lengths = _read_array(f, "I", n_sources, path)
+    raw = _read_exact(f, sum(path_lengths), path)
+    manifest = {}
+    pos = 0
+    for i, n in enumerate(path_lengths):
+        manifest[raw[pos:pos + n].decode("utf-8")] = (stats[2 * i], stats[2 * i + 1])
+        pos += n
+    return tuple(counts), manifest
+
+
+def read_manifest(path: str) -> Dict[str, Tuple[int, int]]:
+    """Returns the source path -> (mtime_ns, size) manifest stored in a snapshot."""
+    try:
+        with open(path, "rb") as f:
+            return _read_head(f, path)[1]
+    except OSError as e:
+        raise IoError(str(e))
+
+
+def load_snapshot(path: str) -> 'AAML':
+    """Loads an instance written by `dump_snapshot`, without re-parsing or re-validating anything."""
+    from aam_py.aaml import AAML, SchemaDef
+
+    try:
+        with open(path, "rb") as f:
+            counts, manifest = _read_head(f, path)
+            _, n_map, n_types, n_schemas, n_fields = counts
+            field_counts = _read_array(f, "I", n_schemas, path)
+            optional = _read_exact(f, n_fields, path)
+            lengths = _read_array(f, "I", 2 * n_map + 2 * n_types + n_schemas + 2 * n_fields, path)
+            (blob_len,) = _BLOB_LEN.unpack(_read_exact(f, _BLOB_LEN.size, path))
+            text = _read_exact(f, blob_len, path).decode("utf-8")
+    except OSError as e:
+        raise IoError(str(e))
+
+    # One decode for the whole blob; every string is then a slice of it.
+    strings = [text[end - n:end] for n, end in zip(lengths, accumulate(lengths))]
+
+    instance = AAML()
+    instance._sources = manifest
+
+    end = 2 * n_map
+    instance._map = dict(zip(strings[0:end:2], strings[1:end:2]))
+    pos = end
+
+    end = pos + 2 * n_types
+    for alias, type_path in zip(strings[pos:end:2], strings[pos + 1:end:2]):
+        try:
+            instance._types[alias] = resolve_builtin(type_path)
+        except NotFoundError:
+            raise IoError(f"Snapshot '{path}' refers to unknown type '{type_path}'")
+    pos = end
+
+    names = strings[pos:pos + n_schemas]
+    pos += n_schemas
+    field_index = 0
+    for name, count in zip(names, field_counts):
+        fields = {}
+        optional_fields = []
+        for _ in range(count):
+            field = strings[pos]
+            fields[field] = strings[pos + 1]
+            if optional[field_index]:
+                optional_fields.append(field)
+            pos += 2
+            field_index += 1
+        instance.register_schema(name, SchemaDef(fields, optional_fields))
+
+    return instance
+
+
+def is_stale(path: str) -> bool:
+    """
+    Returns True if the snapshot at `path` is missing, unreadable, or any of its
+    source files changed (or disappeared) since it was written.
+    """
+    try:
+        manifest = read_manifest(path)
+    except AamlError:
+        return True
+    for source, (mtime_ns, size) in manifest.items():
+        try:
+            st = os.stat(source)
+        except OSError:
+            return True
+        if st.st_mtime_ns != mtime_ns or st.st_size != size:
+            return True
+    return False
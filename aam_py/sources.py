@@ -0,0 +1,353 @@
+"""
+Pluggable loaders for AAML sources that are not local files.
+
+`@import`, `@derive`, `merge_file` and `load` accept URIs as well as paths. The URI
+scheme selects a `SourceLoader` from the registry (see `register_loader`):
+
+* `file://` maps to a local path, which goes through `file_cache` like any other path
+  (no loader is involved);
+* `http://` and `https://` use `HttpLoader`, which keeps persistent connections per host
+  and revalidates content it fetched before with `If-None-Match`/`If-Modified-Since`;
+* `kv://` uses `KVLoader`, backed by any store with `get` (and optionally `mget`).
+
+When a fetched source is merged, the remote sources it imports or derives from are
+fetched in one batch per loader (`SourceLoader.prefetch`) before its directives run.
+Parsed `@derive` bases are reused as long as their loader returns the same `Source`.
+Remote sources are not recorded in `AAML.get_sources`, so `AAMLWatcher` does not watch them.
+"""
+import http.client
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from aam_py.error import IoError, NotFoundError
+from aam_py.parsing import strip_comment
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+
+class Source:
+    """Content fetched by a SourceLoader, with the validators to revalidate it."""
+    __slots__ = ('uri', 'content', 'etag', 'last_modified')
+
+    def __init__(self, uri: str, content: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.uri = uri
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def __repr__(self) -> str:
+        return f"Source({self.uri!r}, {len(self.content)} chars)"
+
+
+class SourceLoader:
+    """
+    Fetches AAML source text by URI. Subclasses implement `fetch`, and `fetch_many`
+    when the backend can serve several sources in one request.
+    """
+
+    def __init__(self, max_prefetched: int = 64):
+        # Prefetched sources a merge never asks for are evicted oldest first.
+        self.max_prefetched = max_prefetched
+        # uri -> source fetched by `prefetch` and not yet consumed by `get`
+        self._prefetched: 'OrderedDict[str, Source]' = OrderedDict()
+
+    def fetch(self, uri: str) -> Source:
+        raise NotImplementedError
+
+    def fetch_many(self, uris: Sequence[str]) -> List[Source]:
+        return [self.fetch(uri) for uri in uris]
+
+    def prefetch(self, uris: Iterable[str]) -> None:
+        """Fetches `uris` in one batch; the next `get` of each is then served from memory."""
+        missing = [uri for uri in dict.fromkeys(uris) if uri not in self._prefetched]
+        if missing:
+            for source in self.fetch_many(missing):
+                self._prefetched[source.uri] = source
+            _trim(self._prefetched, self.max_prefetched)
+
+    def get(self, uri: str) -> Source:
+        source = self._prefetched.pop(uri, None)
+        return source if source is not None else self.fetch(uri)
+
+    def close(self) -> None:
+        pass
+
+
+class HttpLoader(SourceLoader):
+    """
+    Fetches `http://` and `https://` URIs over persistent connections, keeping up to
+    `max_connections` idle ones per host. Content is revalidated with the ETag and
+    Last-Modified of the previous response; a 304 returns the same `Source` object.
+    Validators are kept for the `max_entries` most recently fetched URIs.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_connections: int = 4, max_entries: int = 256):
+        super().__init__()
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.requests = 0
+        self.not_modified = 0
+        self._idle: Dict[Tuple[str, str, Optional[int]], List[http.client.HTTPConnection]] = {}
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[str, Source]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(self, uri: str) -> Source:
+        parts = urlsplit(uri)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        cached = self._cache.get(uri)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        status, reason, body, response_headers = self._request(key, target, headers)
+        if status == 304 and cached is not None:
+            self.not_modified += 1
+            source = cached
+        elif status != 200:
+            raise IoError(f"GET {uri} failed: {status} {reason}")
+        else:
+            source = Source(
+                uri, body.decode('utf-8'), response_headers.get("ETag"), response_headers.get("Last-Modified")
+            )
+        with self._lock:
+            self._cache[uri] = source
+            self._cache.move_to_end(uri)
+            _trim(self._cache, self.max_entries)
+        return source
+
+    def fetch_many(self, uris: Sequence[str]) -> List[Source]:
+        if len(uris) < 2:
+            return [self.fetch(uri) for uri in uris]
+        with ThreadPoolExecutor(max_workers=min(len(uris), self.max_connections)) as executor:
+            return list(executor.map(self.fetch, uris))
+
+    def _request(self, key, target: str, headers: Dict[str, str]):
+        # A pooled connection may have been closed by the server since its last use:
+        # retry once on a new connection.
+        for attempt in range(2):
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise IoError(f"GET {key[0]}://{key[1]}{target} failed: {e}")
+            with self._lock:
+                self.requests += 1
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, response.reason, body, dict(response.getheaders())
+
+    def _acquire(self, key) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout), False
+
+    def _release(self, key, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_connections:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+class KVLoader(SourceLoader):
+    """
+    Reads `kv://<key>` URIs from a key-value store: any object with `get(key)` returning
+    the content or None, and optionally `mget(keys)` to fetch a batch in one round trip.
+    """
+
+    def __init__(self, store=None):
+        super().__init__()
+        self.store = store if store is not None else {}
+
+    def fetch(self, uri: str) -> Source:
+        return self._source(uri, self.store.get(_kv_key(uri)))
+
+    def fetch_many(self, uris: Sequence[str]) -> List[Source]:
+        mget = getattr(self.store, "mget", None)
+        if mget is None:
+            return super().fetch_many(uris)
+        values = mget([_kv_key(uri) for uri in uris])
+        return [self._source(uri, value) for uri, value in zip(uris, values)]
+
+    @staticmethod
+    def _source(uri: str, value) -> Source:
+        if value is None:
+            raise IoError(f"No such key: {uri}")
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return Source(uri, value)
+
+
+def _kv_key(uri: str) -> str:
+    return uri[len("kv://"):]
+
+
+_loaders: Dict[str, SourceLoader] = {}
+_loaders_lock = threading.Lock()
+# uri -> (source, instance parsed from it) for `@derive` bases, least recently used first
+_parsed: 'OrderedDict[str, Tuple[Source, AAML]]' = OrderedDict()
+_MAX_PARSED = 64
+
+
+def _trim(entries: OrderedDict, limit: int) -> None:
+    while len(entries) > limit:
+        entries.popitem(last=False)
+
+
+def register_loader(scheme: str, loader: SourceLoader) -> None:
+    """Registers (or replaces) the loader for URIs starting with `scheme://`."""
+    with _loaders_lock:
+        previous = _loaders.get(scheme)
+        _loaders[scheme] = loader
+    if previous is not None and previous is not loader and previous not in _loaders.values():
+        previous.close()
+
+
+def get_loader(scheme: str) -> SourceLoader:
+    loader = _loaders.get(scheme)
+    if loader is None:
+        raise NotFoundError(f"No source loader registered for scheme '{scheme}'")
+    return loader
+
+
+def is_uri(path: str) -> bool:
+    return "://" in path
+
+
+def is_remote(path: str) -> bool:
+    """Returns True for URIs served by a source loader rather than the filesystem."""
+    return is_uri(path) and not path.lower().startswith("file://")
+
+
+def local_path(uri: str) -> str:
+    """Returns the local path a `file://` URI refers to."""
+    parts = urlsplit(uri)
+    path = url2pathname(parts.path)
+    if parts.netloc and parts.netloc != "localhost":
+        path = "//" + parts.netloc + path
+    return path
+
+
+def resolve_source(path: str) -> Tuple[Optional[SourceLoader], str]:
+    """
+    Returns (None, local path) for paths and `file://` URIs, and (loader, uri) otherwise.
+    """
+    if not is_uri(path):
+        return None, path
+    scheme = path.split("://", 1)[0].lower()
+    if scheme == "file":
+        return None, local_path(path)
+    return get_loader(scheme), path
+
+
+def merge_uri(aaml: 'AAML', uri: str, loader: SourceLoader) -> None:
+    """Merges the source at `uri` into `aaml`, fetching the sources it references in one batch."""
+    source = loader.get(uri)
+    prefetch_references(source.content)
+    aaml.merge_content(source.content)
+
+
+def load_uri(uri: str, loader: SourceLoader) -> 'AAML':
+    """
+    Returns the parsed source at `uri`, reusing the previous parse while the loader
+    returns the same Source and the source references no other remote one.
+    The returned instance is shared and must not be modified.
+    """
+    source = loader.get(uri)
+    cached = _parsed.get(uri)
+    if cached is not None and cached[0] is source:
+        _parsed.move_to_end(uri)
+        return cached[1]
+    from aam_py.aaml import AAML
+    remote = prefetch_references(source.content)
+    instance = AAML.parse(source.content)
+    if remote:
+        _parsed.pop(uri, None)
+    else:
+        _parsed[uri] = (source, instance)
+        _parsed.move_to_end(uri)
+        _trim(_parsed, _MAX_PARSED)
+    return instance
+
+
+def prefetch_references(content: str) -> bool:
+    """
+    Fetches the remote sources `content` imports or derives from, one batch per loader,
+    so that its directives find them prefetched. Returns True if there are any.
+    """
+    from aam_py.graph import directive_paths
+    return _prefetch(directive_paths(content.splitlines()))
+
+
+def prefetch_lines(first: str, lines: Iterator[str]) -> Iterator[str]:
+    """
+    Yields `first` and then `lines` unchanged. When a line imports or derives remote
+    sources, the run of directive, blank and comment lines starting there is read ahead
+    and its remote sources are prefetched in one batch per loader, so that only that
+    run is held in memory.
+    """
+    from aam_py.graph import directive_paths
+    for raw in itertools.chain((first,), lines):
+        if '://' not in raw or not any(is_remote(path) for path in directive_paths((raw,))):
+            yield raw
+            continue
+        run = [raw]
+        for raw in lines:
+            run.append(raw)
+            line = strip_comment(raw).strip()
+            if line and (line[0] != '@' or '{' in line):
+                break
+        _prefetch(directive_paths(run))
+        yield from run
+
+
+def _prefetch(paths: Iterable[str]) -> bool:
+    batches: Dict[SourceLoader, List[str]] = {}
+    for path in paths:
+        if is_remote(path):
+            loader = _loaders.get(path.split("://", 1)[0].lower())
+            if loader is not None:
+                batches.setdefault(loader, []).append(path)
+    for loader, uris in batches.items():
+        if len(uris) > 1:
+            loader.prefetch(uris)
+    return bool(batches)
+
+
+_http = HttpLoader()
+register_loader("http", _http)
+register_loader("https", _http)
+register_loader("kv", KVLoader())
@@ -1,6 +1,8 @@
-from typing import Optional
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple
 
-from aam_py.error import AamlError, NotFoundError
+from aam_py.error import AamlError, ErrorInfo, NotFoundError
 
 class Type:
     """Core class that every AAML type must implement."""
@@ -18,18 +20,93 @@ class Type:
         """Validates `value` against this type's constraints.
         Raises AamlError on failure.
         """
-        raise NotImplementedError
+        info = self.check(value)
+        if info is not None:
+            raise info.error()
+
+    def check(self, value: str) -> Optional[ErrorInfo]:
+        """Result-returning counterpart of `validate`: returns None if `value` is valid.
+        Types must override at least one of `validate` and `check`; the built-in types
+        implement `check` so that validating never raises on the normal path.
+        """
+        if type(self).validate is Type.validate:
+            raise NotImplementedError(f"{type(self).__name__} must override validate or check")
+        try:
+            self.validate(value)
+        except AamlError as e:
+            return ErrorInfo.of(e)
+        return None
+
+    def decode(self, value: str) -> Any:
+        """Converts a valid `value` into its native Python representation.
+        The default keeps the raw string; `value` is assumed to pass `check`.
+        """
+        return value
+
+    def check_many(self, values: Sequence[str]) -> List[Tuple[int, ErrorInfo]]:
+        """Checks every value and returns (index, failure) for each invalid one, in order.
+        Subclasses override this with batched checks that fall back to `check`
+        only when the batch contains a failure.
+        """
+        failures = []
+        for i, value in enumerate(values):
+            info = self.check(value)
+            if info is not None:
+                failures.append((i, info))
+        return failures
+
+    def validate_many(self, values: Sequence[str]) -> List[Tuple[int, AamlError]]:
+        """Validates every value and returns (index, error) for each failure, in order."""
+        return [(i, info.error()) for i, info in self.check_many(values)]
+
+def converts_all(convert: Callable[[str], object], values: Sequence[str]) -> bool:
+    """Returns True if `convert` accepts every value. The loop runs at C speed."""
+    try:
+        deque(map(convert, values), maxlen=0)
+        return True
+    except ValueError:
+        return False
 
 def resolve_builtin(path: str) -> Type:
     """Resolves a type from a module-qualified path or a plain primitive name."""
-    
-    # Import locally to avoid circular dependencies
+    resolved = find_builtin(path)
+    if resolved is None:
+        raise NotFoundError(path)
+    return resolved
+
+@lru_cache(maxsize=None)
+def _builtin_classes() -> tuple:
+    """Imports the built-in type modules on first use; they import this module themselves."""
     from aam_py.types.list import ListType
     from aam_py.types.math import MathTypes
     from aam_py.types.time import TimeTypes
     from aam_py.types.physics import PhysicsTypes
     from aam_py.types.primitive_type import PrimitiveType
-    
+    return ListType, MathTypes, TimeTypes, PhysicsTypes, PrimitiveType
+
+def builtin_path(type_def: Type) -> Optional[str]:
+    """Returns the path that `resolve_builtin` maps back to `type_def`, or None for custom types."""
+    ListType, MathTypes, TimeTypes, PhysicsTypes, PrimitiveType = _builtin_classes()
+
+    if isinstance(type_def, PrimitiveType):
+        return type_def.value
+    if isinstance(type_def, MathTypes):
+        return f"math::{type_def.value}"
+    if isinstance(type_def, TimeTypes):
+        return f"time::{type_def.value}"
+    if isinstance(type_def, PhysicsTypes):
+        return f"physics::{type_def.name.lower()}"
+    if isinstance(type_def, ListType):
+        return f"list<{type_def.inner_type}>"
+    return None
+
+@lru_cache(maxsize=4096)
+def find_builtin(path: str) -> Optional[Type]:
+    """Like `resolve_builtin`, but returns None for unknown paths instead of raising. Memoized."""
+    # Import locally to avoid circular dependencies, and so that the math, time and
+    # physics modules are only loaded once a type of theirs is looked up.
+    from aam_py.types.list import ListType
+
     inner = ListType.parse_inner(path)
     if inner is not None:
         return ListType(inner)
@@ -40,14 +117,18 @@ def resolve_builtin(path: str) -> Type:
         if len(parts) == 2:
             module, name = parts
             if module == "math":
+                from aam_py.types.math import MathTypes
                 return MathTypes.from_name(name)
             elif module == "time":
+                from aam_py.types.time import TimeTypes
                 return TimeTypes.from_name(name)
             elif module == "physics":
+                from aam_py.types.physics import PhysicsTypes
                 return PhysicsTypes.from_name(name)
             else:
-                raise NotFoundError(path)
+                return None
         else:
+            from aam_py.types.primitive_type import PrimitiveType
             return PrimitiveType.from_name(parts[0])
     except AamlError:
-        raise NotFoundError(path)
+        return None
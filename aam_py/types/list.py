@@ -1,33 +1,13 @@
-from typing import Optional, List
+from typing import Any, Optional, List
 
-from aam_py.error import AamlError, InvalidValueError, NotFoundError
+from aam_py.error import ErrorInfo, InvalidValueError, NotFoundError
 from aam_py.types import Type
 from aam_py.types.primitive_type import PrimitiveType
+from aam_py.parsing import split_top_level_fields
 
 def split_top_level(s: str) -> List[str]:
-    items = []
-    depth = 0
-    cur = []
-    
-    for ch in s:
-        if ch in ('{', '['):
-            depth += 1
-            cur.append(ch)
-        elif ch in ('}', ']'):
-            depth -= 1
-            cur.append(ch)
-        elif ch == ',' and depth == 0:
-            t = ''.join(cur).strip()
-            if t:
-                items.append(t)
-            cur.clear()
-        else:
-            cur.append(ch)
-            
-    t = ''.join(cur).strip()
-    if t:
-        items.append(t)
-    return items
+    """Splits `s` on top-level commas, dropping empty items."""
+    return [t for t in (item.strip() for item in split_top_level_fields(s)) if t]
 
 
 class ListType(Type):
@@ -60,19 +40,26 @@ class ListType(Type):
             return split_top_level(inner)
         return None
 
-    def validate(self, value: str) -> None:
+    def check(self, value: str) -> Optional[ErrorInfo]:
         items = self.parse_items(value)
         if items is None:
-            raise InvalidValueError(f"Expected a list literal in the form [item, item, ...], got '{value}'")
-            
-        from aam_py.types import resolve_builtin
-        try:
-            inner = resolve_builtin(self.inner_type)
-        except AamlError:
-            raise NotFoundError(f"Unknown list element type '{self.inner_type}'")
-            
-        for item in items:
-            try:
-                inner.validate(item)
-            except AamlError as e:
-                raise InvalidValueError(f"List item '{item}' failed validation for type '{self.inner_type}': {e}")
+            return ErrorInfo(InvalidValueError, "Expected a list literal in the form [item, item, ...], got '{}'", value)
+
+        from aam_py.types import find_builtin
+        inner = find_builtin(self.inner_type)
+        if inner is None:
+            return ErrorInfo(NotFoundError, "Unknown list element type '{}'", self.inner_type)
+
+        failures = inner.check_many(items)
+        if failures:
+            index, info = failures[0]
+            return ErrorInfo(
+                InvalidValueError, "List item '{}' failed validation for type '{}': {}",
+                items[index], self.inner_type, info
+            )
+        return None
+
+    def decode(self, value: str) -> List[Any]:
+        from aam_py.types import find_builtin
+        inner = find_builtin(self.inner_type)
+        return [inner.decode(item) for item in self.parse_items(value)]
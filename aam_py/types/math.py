@@ -1,9 +1,20 @@
 from enum import Enum
+from itertools import repeat
+from typing import List, Optional, Sequence, Tuple
 
-from aam_py.error import AamlError, NotFoundError, InvalidValueError
-from aam_py.types import Type
+from aam_py.error import ErrorInfo, NotFoundError, InvalidValueError
+from aam_py.types import Type, converts_all
 from aam_py.types.primitive_type import PrimitiveType
 
+def unwrap_components(value: str) -> str:
+    """Strips the optional brackets around a math value, as in `[1, 2, 3]`.
+    Bracketed values are how math values are written as `list<...>` items.
+    """
+    t = value.strip()
+    if t.startswith('[') and t.endswith(']'):
+        return t[1:-1]
+    return value
+
 class MathTypes(Type, Enum):
     VECTOR2 = "vector2"
     VECTOR3 = "vector3"
@@ -14,34 +25,51 @@ class MathTypes(Type, Enum):
 
     @classmethod
     def from_name(cls, name: str) -> 'Type':
-        for mt in cls:
-            if mt.value == name:
-                return mt
-        raise NotFoundError(name)
+        try:
+            return cls(name)
+        except ValueError:
+            raise NotFoundError(name)
 
     def base_type(self) -> 'PrimitiveType':
         return PrimitiveType.F64
 
-    def validate(self, value: str) -> None:
-        parts = [p.strip() for p in value.split(',')]
-        
-        expected_len = 0
-        if self == MathTypes.VECTOR2:
-            expected_len = 2
-        elif self == MathTypes.VECTOR3:
-            expected_len = 3
-        elif self in (MathTypes.VECTOR4, MathTypes.QUATERNION):
-            expected_len = 4
-        elif self == MathTypes.MATRIX3X3:
-            expected_len = 9
-        elif self == MathTypes.MATRIX4X4:
-            expected_len = 16
+    def component_count(self) -> int:
+        """Returns the number of comma-separated components a value of this type has."""
+        return _COMPONENT_COUNTS[self]
+
+    def check(self, value: str) -> Optional[ErrorInfo]:
+        parts = [p.strip() for p in unwrap_components(value).split(',')]
+        expected_len = self.component_count()
 
         if len(parts) != expected_len:
-            raise InvalidValueError(f"Expected {expected_len} components, got {len(parts)}")
+            return ErrorInfo(InvalidValueError, "Expected {} components, got {}", expected_len, len(parts))
 
         for part in parts:
             try:
                 float(part)
             except ValueError:
-                raise InvalidValueError(f"Invalid number: {part}")
+                return ErrorInfo(InvalidValueError, "Invalid number: {}", part)
+        return None
+
+    def decode(self, value: str) -> Tuple[float, ...]:
+        return tuple(map(float, unwrap_components(value).split(',')))
+
+    def check_many(self, values: Sequence[str]) -> List[Tuple[int, ErrorInfo]]:
+        if not values:
+            return []
+        # Check every component count, then parse all components of the batch in one go.
+        separators = self.component_count() - 1
+        counts = set(map(str.count, values, repeat(',')))
+        if counts == {separators} and converts_all(float, ",".join(map(unwrap_components, values)).split(',')):
+            return []
+        return super().check_many(values)
+
+
+_COMPONENT_COUNTS = {
+    MathTypes.VECTOR2: 2,
+    MathTypes.VECTOR3: 3,
+    MathTypes.VECTOR4: 4,
+    MathTypes.QUATERNION: 4,
+    MathTypes.MATRIX3X3: 9,
+    MathTypes.MATRIX4X4: 16,
+}
@@ -1,7 +1,8 @@
 from enum import Enum
+from typing import List, Optional, Sequence, Tuple, Union
 
-from aam_py.error import AamlError, NotFoundError, InvalidValueError
-from aam_py.types import Type
+from aam_py.error import ErrorInfo, NotFoundError, InvalidValueError
+from aam_py.types import Type, converts_all
 from aam_py.types.primitive_type import PrimitiveType
 
 PHYSICS_TYPES_MAP = {
@@ -175,20 +176,30 @@ class PhysicsTypes(Type):
             return PrimitiveType.I32
         return PrimitiveType.F64
 
-    def validate(self, value: str) -> None:
+    def check(self, value: str) -> Optional[ErrorInfo]:
         base = self.base_type()
         if base == PrimitiveType.I32:
             try:
                 int(value)
             except ValueError:
-                raise InvalidValueError(f"Expected integer for unit {self.name}, got '{value}'")
+                return ErrorInfo(InvalidValueError, "Expected integer for unit {}, got '{}'", self.name, value)
         elif base == PrimitiveType.F64:
             try:
                 float(value)
             except ValueError:
-                raise InvalidValueError(f"Expected number for unit {self.name}, got '{value}'")
+                return ErrorInfo(InvalidValueError, "Expected number for unit {}, got '{}'", self.name, value)
         else:
-            raise InvalidValueError(f"Unsupported base type for unit {self.name}")
+            return ErrorInfo(InvalidValueError, "Unsupported base type for unit {}", self.name)
+        return None
+
+    def decode(self, value: str) -> Union[int, float]:
+        return self.base_type().decode(value)
+
+    def check_many(self, values: Sequence[str]) -> List[Tuple[int, ErrorInfo]]:
+        convert = int if self.base_type() == PrimitiveType.I32 else float
+        if converts_all(convert, values):
+            return []
+        return super().check_many(values)
 
     def __str__(self):
         # Return snake_case version possibly if requested, but for simplicity matching rust output
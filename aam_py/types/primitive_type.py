@@ -1,8 +1,13 @@
+import re
 from enum import Enum
-from typing import ClassVar
+from typing import Any, ClassVar, List, Optional, Sequence, Tuple
 
-from aam_py.error import AamlError, NotFoundError, InvalidValueError
-from aam_py.types import Type
+from aam_py.error import ErrorInfo, NotFoundError, InvalidValueError
+from aam_py.types import Type, converts_all
+
+_BOOL_VALUES = frozenset(("true", "false", "1", "0"))
+# Strictly valid colors; anything else goes through the scalar check.
+_HEX_COLOR = re.compile(r'#[0-9A-Fa-f]{6}(?:[0-9A-Fa-f]{2})?')
 
 class PrimitiveType(Type, Enum):
     I32 = "i32"
@@ -13,35 +18,58 @@ class PrimitiveType(Type, Enum):
 
     @classmethod
     def from_name(cls, name: str) -> 'Type':
-        for pt in cls:
-            if pt.value == name:
-                return pt
-        raise NotFoundError(name)
+        try:
+            return cls(name)
+        except ValueError:
+            raise NotFoundError(name)
 
     def base_type(self) -> 'PrimitiveType':
         return self
 
-    def validate(self, value: str) -> None:
+    def check(self, value: str) -> Optional[ErrorInfo]:
         if self == PrimitiveType.I32:
             try:
                 int(value)
             except ValueError:
-                raise InvalidValueError(f"Expected i32, got '{value}'")
+                return ErrorInfo(InvalidValueError, "Expected i32, got '{}'", value)
         elif self == PrimitiveType.F64:
             try:
                 float(value)
             except ValueError:
-                raise InvalidValueError(f"Expected f64, got '{value}'")
+                return ErrorInfo(InvalidValueError, "Expected f64, got '{}'", value)
         elif self == PrimitiveType.STRING:
             pass  # Any string is valid
         elif self == PrimitiveType.BOOL:
             lowered = value.lower()
-            if lowered not in ("true", "false", "1", "0"):
-                raise InvalidValueError(f"Expected bool (true/false/1/0), got '{value}'")
+            if lowered not in _BOOL_VALUES:
+                return ErrorInfo(InvalidValueError, "Expected bool (true/false/1/0), got '{}'", value)
         elif self == PrimitiveType.COLOR:
             if not value.startswith('#') or len(value) not in (7, 9):
-                raise InvalidValueError(f"Expected color in #RRGGBB or #RRGGBBAA format, got '{value}'")
+                return ErrorInfo(InvalidValueError, "Expected color in #RRGGBB or #RRGGBBAA format, got '{}'", value)
             try:
                 int(value[1:], 16)
             except ValueError:
-                raise InvalidValueError(f"Invalid hex color '{value}'")
+                return ErrorInfo(InvalidValueError, "Invalid hex color '{}'", value)
+        return None
+
+    def decode(self, value: str) -> Any:
+        if self == PrimitiveType.I32:
+            return int(value)
+        if self == PrimitiveType.F64:
+            return float(value)
+        if self == PrimitiveType.BOOL:
+            return value.lower() in ("true", "1")
+        return value
+
+    def check_many(self, values: Sequence[str]) -> List[Tuple[int, ErrorInfo]]:
+        if self == PrimitiveType.STRING:
+            return []
+        if self == PrimitiveType.I32:
+            valid = converts_all(int, values)
+        elif self == PrimitiveType.F64:
+            valid = converts_all(float, values)
+        elif self == PrimitiveType.BOOL:
+            valid = _BOOL_VALUES.issuperset(map(str.lower, values))
+        else:
+            valid = all(map(_HEX_COLOR.fullmatch, values))
+        return [] if valid else super().check_many(values)
@@ -1,9 +1,13 @@
 from enum import Enum
+from typing import List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
-from aam_py.error import AamlError, NotFoundError, InvalidValueError
-from aam_py.types import Type
+from aam_py.error import ErrorInfo, NotFoundError, InvalidValueError
+from aam_py.types import Type, converts_all
 from aam_py.types.primitive_type import PrimitiveType
 
+if TYPE_CHECKING:
+    from datetime import datetime
+
 def validate_date_part(date: str) -> bool:
     parts = date.split('-')
     if len(parts) != 3:
@@ -18,15 +22,36 @@ def validate_date_part(date: str) -> bool:
     except ValueError:
         return False
 
-def validate_datetime(value: str) -> None:
-    if len(value) < 10 or not validate_date_part(value[:10]):
-        raise InvalidValueError(f"Invalid DateTime '{value}': expected ISO 8601 format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)")
+def check_datetime(value: str) -> Optional[ErrorInfo]:
+    # Accepts exactly what `TimeTypes.decode` can convert, so valid values always decode.
+    if len(value) >= 10 and validate_date_part(value[:10]):
+        from datetime import datetime
+        try:
+            datetime.fromisoformat(value)
+            return None
+        except ValueError:
+            pass
+    return ErrorInfo(
+        InvalidValueError,
+        "Invalid DateTime '{}': expected ISO 8601 format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)", value
+    )
 
-def validate_numeric(value: str, label: str) -> None:
+def check_numeric(value: str, label: str) -> Optional[ErrorInfo]:
     try:
         float(value)
     except ValueError:
-        raise InvalidValueError(f"Invalid {label} '{value}': expected a number")
+        return ErrorInfo(InvalidValueError, "Invalid {} '{}': expected a number", label, value)
+    return None
+
+def validate_datetime(value: str) -> None:
+    info = check_datetime(value)
+    if info is not None:
+        raise info.error()
+
+def validate_numeric(value: str, label: str) -> None:
+    info = check_numeric(value, label)
+    if info is not None:
+        raise info.error()
 
 class TimeTypes(Type, Enum):
     DATETIME = "datetime"
@@ -38,27 +63,48 @@ class TimeTypes(Type, Enum):
 
     @classmethod
     def from_name(cls, name: str) -> 'Type':
-        for tt in cls:
-            if tt.value == name:
-                return tt
-        raise NotFoundError(name)
+        try:
+            return cls(name)
+        except ValueError:
+            raise NotFoundError(name)
 
     def base_type(self) -> 'PrimitiveType':
         return PrimitiveType.F64
 
-    def validate(self, value: str) -> None:
+    def check(self, value: str) -> Optional[ErrorInfo]:
         if self == TimeTypes.DATETIME:
-            validate_datetime(value)
-        elif self == TimeTypes.DURATION:
+            return check_datetime(value)
+        if self == TimeTypes.DURATION:
             if value.startswith('P'):
-                pass  # ISO 8601 duration
-            else:
-                validate_numeric(value, "Duration")
-        elif self == TimeTypes.YEAR:
-            validate_numeric(value, "Year")
-        elif self == TimeTypes.DAY:
-            validate_numeric(value, "Day")
-        elif self == TimeTypes.HOUR:
-            validate_numeric(value, "Hour")
-        elif self == TimeTypes.MINUTE:
-            validate_numeric(value, "Minute")
+                return None  # ISO 8601 duration
+            return check_numeric(value, "Duration")
+        return check_numeric(value, _NUMERIC_LABELS[self])
+
+    def decode(self, value: str) -> Union['datetime', float, str]:
+        if self == TimeTypes.DATETIME:
+            from datetime import datetime
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                raise InvalidValueError(f"Cannot decode DateTime '{value}'")
+        if self == TimeTypes.DURATION and value.startswith('P'):
+            return value  # ISO 8601 duration, kept as written
+        return float(value)
+
+    def check_many(self, values: Sequence[str]) -> List[Tuple[int, ErrorInfo]]:
+        if self == TimeTypes.DATETIME:
+            return super().check_many(values)
+        numeric = values
+        if self == TimeTypes.DURATION:
+            numeric = [v for v in values if not v.startswith('P')]
+        if converts_all(float, numeric):
+            return []
+        return super().check_many(values)
+
+
+_NUMERIC_LABELS = {
+    TimeTypes.YEAR: "Year",
+    TimeTypes.DAY: "Day",
+    TimeTypes.HOUR: "Hour",
+    TimeTypes.MINUTE: "Minute",
+}
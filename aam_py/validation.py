@@ -1,113 +1,310 @@
-from typing import Dict, List, TYPE_CHECKING
-from aam_py.error import AamlError, SchemaValidationError, InvalidValueError, NotFoundError
-from aam_py.types import resolve_builtin
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from aam_py.error import (
+    AamlError, ErrorInfo, SchemaErrorInfo, SchemaValidationError, InvalidValueError, NotFoundError, ParseError,
+    ValidationErrorGroup
+)
+from aam_py.types import Type, find_builtin
 from aam_py.types.list import ListType
 from aam_py.parsing import is_inline_object, parse_inline_object
 
 if TYPE_CHECKING:
-    from aam_py.aaml import AAML
+    from aam_py.aaml import AAML, SchemaDef
+
+Validator = Callable[[str], None]
+Checker = Callable[[str], Optional[ErrorInfo]]
+
+# default number of validated (type, value) pairs remembered per AAML instance
+VALIDATION_CACHE_SIZE = 4096
+
+
+class ValidationCache:
+    """
+    A bounded LRU set of the (type, value) pairs an AAML instance has validated
+    successfully, so that repeated literals skip their checker. Failures are not
+    remembered: they raise, and are rare.
+    """
+    __slots__ = ('maxsize', 'hits', 'misses', '_entries')
+
+    def __init__(self, maxsize: int = VALIDATION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, None]' = OrderedDict()
+
+    def seen(self, key: Hashable) -> bool:
+        """Returns whether `key` passed before, counting a hit or a miss."""
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key: Hashable) -> None:
+        entries = self._entries
+        entries[key] = None
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        """Changes the bound, evicting the least recently used entries beyond it."""
+        self.maxsize = maxsize
+        entries = self._entries
+        while entries and len(entries) > maxsize:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops the remembered pairs; the hit and miss counters are kept."""
+        self._entries.clear()
+
+    def info(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ValidationCache({len(self._entries)}/{self.maxsize} entries, {self.hits} hits, {self.misses} misses)"
 
 
 def validate_against_schemas(aaml: 'AAML', field: str, value: str) -> None:
-    for schema_name, schema_def in aaml.get_schemas().items():
-        if field in schema_def.fields:
-            validate_typed_field(aaml, schema_def.fields[field], value, schema_name, field)
+    for schema_name, type_name in aaml.get_field_schemas(field):
+        validate_typed_field(aaml, type_name, value, schema_name, field)
+
+
+def validate_values_against_schemas(
+    aaml: 'AAML', field: str, values: Sequence[str]
+) -> List[Tuple[int, SchemaValidationError]]:
+    """
+    Validates many candidate values of `field` against every schema declaring it.
+    Returns (index, error) for every failure instead of raising on the first one.
+    """
+    failures = []
+    for schema_name, type_name in aaml.get_field_schemas(field):
+        for index, info in check_many(aaml, type_name, values):
+            failures.append((index, SchemaValidationError(schema_name, field, type_name, str(info))))
+    failures.sort(key=lambda failure: failure[0])
+    return failures
+
+
+def check_many(aaml: 'AAML', type_name: str, values: Sequence[str]) -> List[Tuple[int, ErrorInfo]]:
+    """
+    Checks every value against `type_name` and returns (index, failure) for each invalid one.
+    Plain types are checked with their batched `Type.check_many`; schema and list
+    types fall back to the compiled per-value checker.
+    """
+    type_def = _plain_type(aaml, type_name)
+    if type_def is not None:
+        return type_def.check_many(values)
+
+    checker = aaml.get_checker(type_name)
+    failures = []
+    for i, value in enumerate(values):
+        info = checker(value)
+        if info is not None:
+            failures.append((i, info))
+    return failures
+
+
+def validate_many(aaml: 'AAML', type_name: str, values: Sequence[str]) -> List[Tuple[int, AamlError]]:
+    """Like `check_many`, but returns the failures as AamlError instances."""
+    return [(i, info.error()) for i, info in check_many(aaml, type_name, values)]
+
+
+def _plain_type(aaml: 'AAML', type_name: str) -> Optional[Type]:
+    """Returns the Type object `type_name` resolves to, unless it names a schema or a list."""
+    type_def = aaml.get_type(type_name)
+    if type_def is not None:
+        return type_def
+    if aaml.get_schema(type_name) is not None or ListType.parse_inner(type_name) is not None:
+        return None
+    return find_builtin(type_name)
+
+
+def check_typed_field(
+    aaml: 'AAML', type_name: str, value: str, schema_name: str, field: str
+) -> Optional[ErrorInfo]:
+    cache = aaml.get_validation_cache()
+    key = (type_name, value)
+    if cache.seen(key):
+        return None
+    info = aaml.get_checker(type_name)(value)
+    if info is not None:
+        return SchemaErrorInfo(schema_name, field, type_name, "{}", info)
+    cache.add(key)
+    return None
 
 
 def validate_typed_field(aaml: 'AAML', type_name: str, value: str, schema_name: str, field: str) -> None:
-    def make_err(details: str) -> SchemaValidationError:
-        return SchemaValidationError(schema_name, field, type_name, details)
+    info = check_typed_field(aaml, type_name, value, schema_name, field)
+    if info is not None:
+        raise info.error()
+
 
+def compile_type(aaml: 'AAML', type_name: str) -> Checker:
+    """
+    Compiles `type_name` into a checker callable for `aaml`'s current registries.
+    Resolution order: registered type, schema, `list<...>`, built-in type.
+    The checker returns None for valid values and an ErrorInfo otherwise.
+    Use `AAML.get_checker` to get a cached checker instead of calling this directly.
+    """
     type_def = aaml.get_type(type_name)
     if type_def is not None:
-        try:
-            type_def.validate(value)
-            return
-        except AamlError as e:
-            raise make_err(str(e))
+        return type_def.check
 
     nested_schema = aaml.get_schema(type_name)
     if nested_schema is not None:
-        try:
-            validate_inline_object_against_schema(aaml, value, type_name, nested_schema.fields)
-            return
-        except AamlError as e:
-            raise make_err(str(e))
+        fields = nested_schema.fields
+
+        def check_schema(value: str) -> Optional[ErrorInfo]:
+            # Callers remember the result under the type name.
+            return _check_inline_object(aaml, value, type_name, fields, nested_schema)
+        return check_schema
 
     inner_type = ListType.parse_inner(type_name)
     if inner_type is not None:
-        try:
-            validate_list_value(aaml, value, inner_type)
-            return
-        except AamlError as e:
-            raise make_err(str(e))
+        return compile_list(aaml, inner_type)
 
-    try:
-        builtin = resolve_builtin(type_name)
-        builtin.validate(value)
-    except AamlError as e:
-        if isinstance(e, NotFoundError):
-            raise make_err(f"Unknown type '{type_name}'")
-        raise make_err(str(e))
+    type_def = find_builtin(type_name)
+    if type_def is not None:
+        return type_def.check
 
+    def unknown(value: str) -> Optional[ErrorInfo]:
+        return ErrorInfo(AamlError, "Unknown type '{}'", type_name)
+    return unknown
 
-def validate_list_value(aaml: 'AAML', value: str, inner_type: str) -> None:
-    items = ListType.parse_items(value)
-    if items is None:
-        raise InvalidValueError(f"Expected a list literal '[...]', got '{value}'")
-
-    for item in items:
-        nested_schema = aaml.get_schema(inner_type)
-        if nested_schema is not None:
-            validate_inline_object_against_schema(aaml, item, inner_type, nested_schema.fields)
-            continue
-            
-        try:
-            builtin = resolve_builtin(inner_type)
-            builtin.validate(item)
-            continue
-        except AamlError as e:
-            if not isinstance(e, NotFoundError):
-                raise InvalidValueError(f"List item '{item}' failed for type '{inner_type}': {e}")
-                
+
+def compile_list(aaml: 'AAML', inner_type: str) -> Checker:
+    """Compiles a checker for list literals whose items are of type `inner_type`."""
+    check_items = _compile_list_item(aaml, inner_type)
+
+    def check_list(value: str) -> Optional[ErrorInfo]:
+        items = ListType.parse_items(value)
+        if items is None:
+            return ErrorInfo(InvalidValueError, "Expected a list literal '[...]', got '{}'", value)
+        return check_items(items)
+    return check_list
+
+
+def _compile_list_item(aaml: 'AAML', inner_type: str) -> Callable[[List[str]], Optional[ErrorInfo]]:
+    # List items prefer schemas, then built-ins, then registered types.
+    nested_schema = aaml.get_schema(inner_type)
+    if nested_schema is not None:
+        fields = nested_schema.fields
+
+        def check_schema_items(items: List[str]) -> Optional[ErrorInfo]:
+            for item in items:
+                info = check_inline_object_against_schema(aaml, item, inner_type, fields)
+                if info is not None:
+                    return info
+            return None
+        return check_schema_items
+
+    type_def = find_builtin(inner_type)
+    if type_def is None:
         type_def = aaml.get_type(inner_type)
-        if type_def is not None:
-            try:
-                type_def.validate(item)
-                continue
-            except AamlError as e:
-                raise InvalidValueError(f"List item '{item}' failed for type '{inner_type}': {e}")
-                
-        raise NotFoundError(f"Unknown list element type '{inner_type}'")
+        if type_def is None:
+            def unknown(items: List[str]) -> Optional[ErrorInfo]:
+                if items:
+                    return ErrorInfo(NotFoundError, "Unknown list element type '{}'", inner_type)
+                return None
+            return unknown
 
+    def check_items(items: List[str]) -> Optional[ErrorInfo]:
+        failures = type_def.check_many(items)
+        if failures:
+            index, info = failures[0]
+            return ErrorInfo(
+                InvalidValueError, "List item '{}' failed for type '{}': {}", items[index], inner_type, info
+            )
+        return None
+    return check_items
 
-def validate_inline_object_against_schema(
+
+def check_list_value(aaml: 'AAML', value: str, inner_type: str) -> Optional[ErrorInfo]:
+    # Tagged keys: a type registered as "list<...>" would take precedence over the
+    # list rule in `check_typed_field`.
+    cache = aaml.get_validation_cache()
+    key = ("list", inner_type, value)
+    if cache.seen(key):
+        return None
+    info = compile_list(aaml, inner_type)(value)
+    if info is None:
+        cache.add(key)
+    return info
+
+
+def validate_list_value(aaml: 'AAML', value: str, inner_type: str) -> None:
+    info = check_list_value(aaml, value, inner_type)
+    if info is not None:
+        raise info.error()
+
+
+def check_inline_object_against_schema(
     aaml: 'AAML', value: str, schema_name: str, schema_fields: Dict[str, str]
-) -> None:
+) -> Optional[ErrorInfo]:
+    schema_def = aaml.get_schema(schema_name)
+    # Only checks against the registered fields are remembered.
+    if schema_def is None or schema_def.fields is not schema_fields:
+        return _check_inline_object(aaml, value, schema_name, schema_fields, schema_def)
+    cache = aaml.get_validation_cache()
+    key = ("schema", schema_name, value)
+    if cache.seen(key):
+        return None
+    info = _check_inline_object(aaml, value, schema_name, schema_fields, schema_def)
+    if info is None:
+        cache.add(key)
+    return info
+
+
+def _check_inline_object(
+    aaml: 'AAML', value: str, schema_name: str, schema_fields: Dict[str, str], schema_def: Optional['SchemaDef']
+) -> Optional[ErrorInfo]:
     if not is_inline_object(value):
-        raise InvalidValueError(
-            f"Field typed as schema '{schema_name}' must be an inline object '{{ k = v, ... }}', got: '{value}'"
+        return ErrorInfo(
+            InvalidValueError,
+            "Field typed as schema '{}' must be an inline object '{{ k = v, ... }}', got: '{}'",
+            schema_name, value
         )
-        
+
     try:
         pairs = parse_inline_object(value)
     except Exception as e:
-        raise InvalidValueError(f"Failed to parse inline object for schema '{schema_name}': {e}")
-        
+        return ErrorInfo(InvalidValueError, "Failed to parse inline object for schema '{}': {}", schema_name, e)
+
     pair_map = dict(pairs)
-    
-    schema_def = aaml.get_schema(schema_name)
+
     optional_fields = schema_def.optional_fields if schema_def else set()
 
     for field, type_name in schema_fields.items():
         if field not in pair_map:
             if field not in optional_fields:
-                raise SchemaValidationError(
+                return SchemaErrorInfo(
                     schema_name, field, type_name,
-                    f"Missing field '{field}' in inline object for schema '{schema_name}'"
+                    "Missing field '{}' in inline object for schema '{}'", field, schema_name
                 )
         else:
-            validate_typed_field(aaml, type_name, pair_map[field], schema_name, field)
+            info = check_typed_field(aaml, type_name, pair_map[field], schema_name, field)
+            if info is not None:
+                return info
+    return None
+
+
+def validate_inline_object_against_schema(
+    aaml: 'AAML', value: str, schema_name: str, schema_fields: Dict[str, str]
+) -> None:
+    info = check_inline_object_against_schema(aaml, value, schema_name, schema_fields)
+    if info is not None:
+        raise info.error()
 
 
 def validate_schemas_completeness(aaml: 'AAML') -> None:
@@ -116,20 +313,130 @@ def validate_schemas_completeness(aaml: 'AAML') -> None:
 
 
 def validate_schemas_completeness_for(aaml: 'AAML', schema_names: List[str]) -> None:
+    missing = check_schemas_completeness_for(aaml, schema_names)
+    if missing:
+        raise missing[0]
+
+
+def check_schemas_completeness_for(aaml: 'AAML', schema_names: Iterable[str]) -> List[SchemaValidationError]:
+    """Returns an error for every required field of the named schemas missing from the map."""
     aaml_map = aaml.get_map()
+    missing = []
     for name in schema_names:
         schema_def = aaml.get_schema(name)
         if schema_def is None:
             continue
-            
+
         for field, type_name in schema_def.fields.items():
             if schema_def.is_optional(field):
                 continue
             if field not in aaml_map:
-                raise SchemaValidationError(
+                missing.append(SchemaValidationError(
                     name, field, type_name,
                     f"Missing required field '{field}'"
-                )
+                ))
+    return missing
+
+
+class PendingValidation:
+    """
+    The checks a merge run with `validate="deferred"` puts off until it ends; see
+    `AAML.merge_content`. Each assigned key is then checked once, with its final value
+    and against the schemas registered by then, and every failure is raised together.
+    """
+    __slots__ = ('assignments', 'complete', 'errors', 'line')
+
+    def __init__(self):
+        # key -> line of its last assignment, or of the directive that last wrote it
+        self.assignments: Dict[str, int] = {}
+        # set by `@derive`: check the required fields of every schema at the end
+        self.complete = False
+        # failures already found, such as an incomplete `@derive` base
+        self.errors: List[AamlError] = []
+        # line of the top-level directive being executed, 0 outside directives
+        self.line = 0
+
+    def record(self, keys: Iterable[str]) -> None:
+        """Records keys merged by `@import` from a cached parse rather than by an assignment."""
+        line = self.line
+        assignments = self.assignments
+        for key in keys:
+            assignments[key] = line
+
+    def run(self, aaml: 'AAML') -> None:
+        """Runs the deferred checks against `aaml`, raising a ValidationErrorGroup on failure."""
+        errors = self.errors + check_assignments(aaml, self.assignments)
+        if self.complete:
+            errors.extend(check_schemas_completeness_for(aaml, aaml.get_schemas()))
+        if errors:
+            raise ValidationErrorGroup(errors)
+
+
+def check_assignments(aaml: 'AAML', assignments: Dict[str, int]) -> List[AamlError]:
+    """
+    Checks the current value of every key in `assignments` (key -> line) against the
+    schemas declaring it, grouping the values by type so that every distinct value is
+    checked once per type and plain types use their batched `check_many`.
+    Returns the failures in line order, each noted with its line.
+    """
+    aaml_map = aaml.get_map()
+    # type name -> [(key, schema name), ...]
+    groups: Dict[str, List[Tuple[str, str]]] = {}
+    for key in assignments:
+        if key in aaml_map:
+            for schema_name, type_name in aaml.get_field_schemas(key):
+                groups.setdefault(type_name, []).append((key, schema_name))
+
+    failures: List[Tuple[int, AamlError]] = []
+    for type_name, fields in groups.items():
+        values = [aaml_map[key] for key, _ in fields]
+        invalid = _check_distinct(aaml, type_name, values)
+        if not invalid:
+            continue
+        for (key, schema_name), value in zip(fields, values):
+            info = invalid.get(value)
+            if info is None:
+                continue
+            line = assignments[key]
+            if isinstance(info, ErrorInfo):
+                error = SchemaValidationError(schema_name, key, type_name, str(info))
+                error.add_note(f"at line {line}: {key} = {value}")
+            elif isinstance(info, AamlError):
+                error = info
+            else:
+                # As in immediate validation, which wraps unexpected errors the same way.
+                error = ParseError(line, f"{key} = {value}", str(info))
+            failures.append((line, error))
+    failures.sort(key=lambda failure: failure[0])
+    return [error for _, error in failures]
+
+
+def _check_distinct(aaml: 'AAML', type_name: str, values: List[str]) -> Dict[str, object]:
+    # Returns value -> its ErrorInfo, or the exception its checker raised, for invalid values.
+    cache = aaml.get_validation_cache()
+    unchecked = [value for value in dict.fromkeys(values) if not cache.seen((type_name, value))]
+    if not unchecked:
+        return {}
+    invalid: Dict[str, object] = {}
+    try:
+        for index, info in check_many(aaml, type_name, unchecked):
+            invalid[unchecked[index]] = info
+    except Exception:
+        # A checker raised instead of returning a failure: find the value(s) it raised on.
+        invalid.clear()
+        checker = aaml.get_checker(type_name)
+        for value in unchecked:
+            try:
+                info = checker(value)
+            except Exception as e:
+                info = e
+            if info is not None:
+                invalid[value] = info
+    for value in unchecked:
+        if value not in invalid:
+            cache.add((type_name, value))
+    return invalid
+
 
 def apply_schema(aaml: 'AAML', schema_name: str, data: Dict[str, str]) -> None:
     schema_def = aaml.get_schema(schema_name)
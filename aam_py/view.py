@@ -0,0 +1,232 @@
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterator, Optional, Tuple, TYPE_CHECKING
+
+from aam_py.error import IoError
+from aam_py.found_value import FoundValue
+
+if TYPE_CHECKING:
+    from aam_py.aaml import AAML
+
+MAGIC = b"AAMV"
+VERSION = 1
+
+# magic, version, reserved, entry count, bucket count
+_HEADER = struct.Struct("<4sHHII")
+# Each entry is (key offset, key length, value offset, value length) into the blob.
+_ENTRY_FIELDS = 4
+
+
+def _bucket_count(n: int) -> int:
+    count = 8
+    while count < 2 * n:
+        count *= 2
+    return count
+
+
+def _u32(values) -> bytes:
+    arr = array("I", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_view(aaml: 'AAML', path: str) -> None:
+    """
+    Writes the key/value map of `aaml` to `path` in the layout read by `AAMLView`.
+
+    Layout (little-endian)::
+
+        magic b"AAMV", u16 version, u16 reserved, u32 entries, u32 buckets
+        u32[4 * entries]   key offset, key length, value offset, value length
+        u32[buckets]       key hash table (entry index + 1, 0 = empty)
+        u32[buckets]       value hash table (first entry holding the value)
+        UTF-8 blob
+
+    Entries keep insertion order. Both tables use CRC-32 with linear probing.
+    """
+    data = aaml.get_map()
+    n = len(data)
+    buckets = _bucket_count(n)
+    mask = buckets - 1
+
+    entries = []
+    key_table = [0] * buckets
+    value_table = [0] * buckets
+    blob = bytearray()
+
+    for index, (k, v) in enumerate(data.items()):
+        kb = k.encode("utf-8")
+        vb = v.encode("utf-8")
+        entries.extend((len(blob), len(kb), len(blob) + len(kb), len(vb)))
+        blob += kb
+        blob += vb
+
+        slot = zlib.crc32(kb) & mask
+        while key_table[slot]:
+            slot = (slot + 1) & mask
+        key_table[slot] = index + 1
+
+        slot = zlib.crc32(vb) & mask
+        while value_table[slot]:
+            other = value_table[slot] - 1
+            start, length = entries[other * 4 + 2], entries[other * 4 + 3]
+            if blob[start:start + length] == vb:
+                break
+            slot = (slot + 1) & mask
+        else:
+            value_table[slot] = index + 1
+
+    if len(blob) > 0xFFFFFFFF:
+        raise IoError(f"Config too large for a view file: {len(blob)} bytes")
+
+    try:
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, n, buckets))
+            f.write(_u32(entries))
+            f.write(_u32(key_table))
+            f.write(_u32(value_table))
+            f.write(blob)
+    except OSError as e:
+        raise IoError(str(e))
+
+
+class AAMLView:
+    """
+    A read-only, memory-mapped view of an AAML key/value map written by `write_view`.
+
+    The file is mapped rather than read, so processes viewing the same file share a
+    single page-cache copy. Keys and values are decoded only when they are returned.
+    Lookups and iteration follow the same semantics as `AAML`.
+    """
+    __slots__ = ('_file', '_mm', '_buf', '_entries', '_keys', '_values', '_count', '_mask', '_blob')
+
+    def __init__(self, path: str):
+        try:
+            self._file = open(path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise IoError(str(e))
+
+        head = self._mm[:_HEADER.size]
+        if len(head) < _HEADER.size or head[:4] != MAGIC:
+            self.close()
+            raise IoError(f"'{path}' is not an AAML view file")
+        _, version, _, count, buckets = _HEADER.unpack(head)
+        if version != VERSION:
+            self.close()
+            raise IoError(f"Unsupported AAML view version {version} in '{path}'")
+
+        buf = memoryview(self._mm)
+        offset = _HEADER.size
+        self._entries, offset = self._table(buf, offset, count * _ENTRY_FIELDS)
+        self._keys, offset = self._table(buf, offset, buckets)
+        self._values, offset = self._table(buf, offset, buckets)
+        self._buf = buf
+        self._blob = offset
+        self._count = count
+        self._mask = buckets - 1
+
+    @staticmethod
+    def _table(buf: memoryview, offset: int, count: int):
+        end = offset + 4 * count
+        if sys.byteorder == "little":
+            return buf[offset:end].cast("I"), end
+        arr = array("I", buf[offset:end])
+        arr.byteswap()
+        return arr, end
+
+    def close(self) -> None:
+        for name in ('_buf', '_entries', '_keys', '_values'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        mm = getattr(self, '_mm', None)
+        if mm is not None:
+            mm.close()
+        f = getattr(self, '_file', None)
+        if f is not None:
+            f.close()
+
+    def __enter__(self) -> 'AAMLView':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Raw access
+    def _span(self, index: int, field: int) -> Tuple[int, int]:
+        base = index * _ENTRY_FIELDS + field
+        start = self._blob + self._entries[base]
+        return start, start + self._entries[base + 1]
+
+    def _decode(self, index: int, field: int) -> str:
+        start, end = self._span(index, field)
+        return str(self._buf[start:end], "utf-8")
+
+    def _probe(self, table, raw: bytes, field: int) -> int:
+        mask = self._mask
+        slot = zlib.crc32(raw) & mask
+        while True:
+            entry = table[slot]
+            if not entry:
+                return -1
+            start, end = self._span(entry - 1, field)
+            if self._buf[start:end] == raw:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def get(self, key: str) -> Optional[str]:
+        index = self._probe(self._keys, key.encode("utf-8"), 0)
+        return self._decode(index, 2) if index >= 0 else None
+
+    # Mapping protocol
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return self._probe(self._keys, key.encode("utf-8"), 0) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._decode(index, 0)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        for index in range(self._count):
+            yield self._decode(index, 0), self._decode(index, 2)
+
+    # Lookup Methods
+    def find_obj(self, key: str) -> Optional[FoundValue]:
+        value = self.get(key)
+        if value is not None:
+            return FoundValue(value)
+        return self.find_key(key)
+
+    def find_key(self, value: str) -> Optional[FoundValue]:
+        index = self._probe(self._values, value.encode("utf-8"), 2)
+        return FoundValue(self._decode(index, 0)) if index >= 0 else None
+
+    def find_deep(self, key: str) -> Optional[FoundValue]:
+        current_key = key
+        last_found = None
+        visited = set()
+
+        while True:
+            next_val = self.get(current_key)
+            if next_val is None:
+                break
+            visited.add(current_key)
+            if next_val in visited:
+                if last_found is None:
+                    last_found = next_val
+                break
+            last_found = next_val
+            current_key = next_val
+
+        return FoundValue(last_found) if last_found is not None else None
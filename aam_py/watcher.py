@@ -0,0 +1,287 @@
+"""
+Hot reloading of an AAML file and every file it imports or derives from.
+
+`AAMLWatcher` loads a root file and watches all of its sources (see `AAML.get_sources`):
+with inotify on Linux, or by polling their mtime and size elsewhere. Bursts of writes
+are coalesced: a reload starts once no further change was seen for `debounce` seconds,
+or `max_delay` seconds after the first one at the latest, and only the files reported
+changed are looked at.
+
+The watcher keeps a private working instance and publishes `freeze` snapshots of it
+(see `aam_py.frozen`) as `current`, in a single assignment; readers holding the previous
+snapshot are unaffected. An edit of the root is applied to the working instance with
+`AAML.refresh`, so its cost follows the size of the edit rather than of the tree. An edit
+of an imported file re-parses that file and the files importing it (unchanged ones are
+reused from `file_cache`), then replays the root's statements from its stored document
+without reading the root again.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from aam_py.aaml import AAML
+from aam_py.error import AamlError
+from aam_py.frozen import FrozenAAML
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Watches the directories of a set of files through the Linux inotify API."""
+    __slots__ = ('_libc', '_fd', '_dirs')
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc = libc
+        self._fd = fd
+        # watch descriptor -> directory
+        self._dirs: Dict[int, str] = {}
+
+    def watch(self, paths: Set[str]) -> None:
+        # Directories are watched rather than files, so that editors replacing
+        # a file through a rename are noticed too.
+        watched = set(self._dirs.values())
+        for directory in {os.path.dirname(p) for p in paths} - watched:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+            if wd >= 0:
+                self._dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Returns the paths of the entries that changed, waiting up to `timeout` seconds."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                changed.add(os.path.join(directory, os.fsdecode(name)))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class AAMLWatcher:
+    """
+    Keeps `current` up to date with a root file and the files it imports or derives from.
+    Call `start` to reload in a background thread, or `check` to poll synchronously.
+    `on_reload` receives each new snapshot.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        debounce: float = 0.05,
+        max_delay: float = 0.5,
+        poll_interval: float = 0.25,
+        use_inotify: Optional[bool] = None,
+        on_reload: Optional[Callable[[FrozenAAML], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.path = path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.reloads = 0
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self._use_inotify = use_inotify
+        self._inotify: Optional[_Inotify] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._root = os.path.realpath(path)
+        # the instance reloads are applied to; None after a failed reload left it inconsistent
+        self._working: Optional[AAML] = self._load()
+        self._current = self._working.freeze()
+        # signatures of the sources as last loaded, or as last seen failing to load
+        self._seen: Dict[str, Optional[Tuple[int, int]]] = dict(self._working.get_sources())
+        # signatures at the previous poll, when polling
+        self._polled = dict(self._seen)
+        # watched files reported changed since the last reload
+        self._changes: Set[str] = set()
+
+    @property
+    def current(self) -> FrozenAAML:
+        """The most recently loaded snapshot."""
+        return self._current
+
+    def watched_files(self) -> Set[str]:
+        return set(self._seen)
+
+    def changed_files(self) -> Set[str]:
+        """Returns the watched files whose mtime or size differs from when they were last seen."""
+        return {path for path, signature in list(self._seen.items()) if _stat(path) != signature}
+
+    def check(self) -> bool:
+        """
+        Reloads now if any watched file changed. Returns True if `current` was replaced.
+        This stats every watched file; the background thread only looks at reported changes.
+        """
+        changed = self.changed_files()
+        return bool(changed) and self._reload(changed)
+
+    def reload(self) -> bool:
+        """Reloads unconditionally. Returns True if `current` was replaced."""
+        return self._reload(self.watched_files())
+
+    def _load(self) -> AAML:
+        # `refresh` on a new instance loads the root and keeps its document for later refreshes.
+        instance = AAML()
+        instance.refresh(self.path)
+        return instance
+
+    def _rebuild(self, changed: Set[str]) -> AAML:
+        """Returns the working instance updated for the changes to `changed`."""
+        working = self._working
+        if working is None or self._root not in working._documents:
+            return self._load()
+        if changed <= {self._root}:
+            working.refresh(self.path)
+            return working
+        from aam_py.file_cache import file_cache
+        for path in changed:
+            # Files rewritten within the mtime granularity would look fresh.
+            file_cache.invalidate(path)
+        if self._root in changed:
+            return self._load()
+        # Only imports changed: replay the root's statements into a new instance.
+        document = working._documents[self._root]
+        instance = AAML()
+        instance._merge_document(document)
+        instance._documents[self._root] = document
+        instance._sources[self._root] = working._sources[self._root]
+        return instance
+
+    def _reload(self, changed: Set[str]) -> bool:
+        with self._lock:
+            signatures = {path: _stat(path) for path in changed}
+            try:
+                working = self._rebuild(changed)
+            except (AamlError, OSError) as e:
+                # Keep serving the previous snapshot until the files change again. A
+                # failed refresh may have left the working instance half updated.
+                self._working = None
+                self._seen.update(signatures)
+                if self.on_error is not None:
+                    self.on_error(e)
+                return False
+            self._working = working
+            snapshot = working.freeze()
+            self._seen = dict(working.get_sources())
+            self._polled = dict(self._seen)
+            self._current = snapshot
+            self.reloads += 1
+            if self._inotify is not None:
+                self._inotify.watch(set(self._seen))
+        if self.on_reload is not None:
+            self.on_reload(snapshot)
+        return True
+
+    def start(self) -> 'AAMLWatcher':
+        """Starts reloading in a daemon thread."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        if self._use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self._inotify.watch(self.watched_files())
+            except (OSError, AttributeError):
+                self._inotify = None
+        self._thread = threading.Thread(target=self._run, name="aaml-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> 'AAMLWatcher':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        self.check()
+        while not self._stop.is_set():
+            if not self._wait_for_change():
+                continue
+            # Coalesce the rest of the burst.
+            deadline = time.monotonic() + self.max_delay
+            while not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._wait_for_change(min(self.debounce, remaining)):
+                    break
+            changed = self._take_changes()
+            if changed:
+                self._reload(changed)
+
+    def _take_changes(self) -> Set[str]:
+        """Returns the reported files whose mtime or size differs from when they were last seen."""
+        reported, self._changes = self._changes, set()
+        seen = self._seen
+        return {path for path in reported if path in seen and _stat(path) != seen[path]}
+
+    def _wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Waits up to `timeout` seconds (default: the poll interval) for a watched file to change."""
+        if timeout is None:
+            timeout = self.poll_interval
+        if self._inotify is not None:
+            watched = self._seen
+            changed = {real for real in map(os.path.realpath, self._inotify.wait(timeout)) if real in watched}
+        else:
+            if self._stop.wait(timeout):
+                return False
+            polled = {path: _stat(path) for path in list(self._seen)}
+            changed = {path for path, signature in polled.items() if signature != self._polled.get(path)}
+            self._polled = polled
+        self._changes |= changed
+        return bool(changed)
@@ -0,0 +1,55 @@
+"""
+Runs the benchmark suite from the repository root:
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json
+
+Exits with status 1 when `--compare` finds a case whose throughput dropped by more than
+`--threshold`.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.generators import Params
+from benchmarks.suite import compare, format_comparison, format_results, run_suite
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0].strip())
+    for name in Params.__slots__:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case; the best one is kept")
+    parser.add_argument("--only", action="append", help="run only this case (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="tolerated throughput drop (default 0.15)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    # Comparisons are only meaningful for the same sizes: default to the baseline's.
+    sizes = dict(baseline["params"]) if baseline is not None else {}
+    sizes.update((name, getattr(args, name)) for name in Params.__slots__ if getattr(args, name) is not None)
+    params = Params.from_dict(sizes)
+
+    document = run_suite(params, args.repeat, args.only)
+    print(format_results(document))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+    if baseline is None:
+        return 0
+    if baseline["params"] != document["params"]:
+        print("warning: baseline was recorded with different sizes", file=sys.stderr)
+    rows = compare(baseline, document, args.threshold)
+    print()
+    print(format_comparison(rows))
+    return 1 if any(regressed for _, _, regressed in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Synthetic AAML configurations for the benchmarks, built with `AAMBuilder`."""
+import os
+from typing import Dict, List, Tuple
+
+from aam_py import AAMBuilder, SchemaField
+
+# Field types cycled through by generated schemas, with a valid value for each.
+_FIELD_TYPES: Tuple[Tuple[str, str], ...] = (
+    ("i32", "42"),
+    ("f64", "3.25"),
+    ("bool", "true"),
+    ("string", "\"text\""),
+    ("color", "#FF8800"),
+    ("math::vector3", "1.0, 2.0, 3.0"),
+)
+
+
+class Params:
+    """Sizes of a generated configuration."""
+    __slots__ = ('keys', 'schemas', 'fields', 'list_length', 'alias_depth', 'fan_out')
+
+    def __init__(
+        self,
+        keys: int = 20000,
+        schemas: int = 50,
+        fields: int = 8,
+        list_length: int = 32,
+        alias_depth: int = 16,
+        fan_out: int = 32,
+    ):
+        self.keys = keys
+        self.schemas = schemas
+        self.fields = fields
+        self.list_length = list_length
+        self.alias_depth = alias_depth
+        self.fan_out = fan_out
+
+    def to_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, int]) -> 'Params':
+        return cls(**data)
+
+
+def schema_fields(schema: int, fields: int) -> List[Tuple[str, str, str]]:
+    """Returns (field, type name, valid value) for every field of generated schema `schema`."""
+    result = []
+    for f in range(fields):
+        type_name, value = _FIELD_TYPES[(schema + f) % len(_FIELD_TYPES)]
+        result.append((f"s{schema}_f{f}", type_name, value))
+    return result
+
+
+def plain_config(params: Params) -> str:
+    """`keys` plain assignments, none declared by a schema."""
+    b = AAMBuilder()
+    for i in range(params.keys):
+        b.add_line(f"key{i}", f"value{i}")
+    return b.build()
+
+
+def schema_config(params: Params) -> str:
+    """`schemas` schemas of `fields` typed fields each, plus one list field each, all assigned."""
+    b = AAMBuilder()
+    items = ", ".join(str(i) for i in range(params.list_length))
+    for s in range(params.schemas):
+        fields = schema_fields(s, params.fields)
+        declared = [SchemaField.required(name, type_name) for name, type_name, _ in fields]
+        declared.append(SchemaField.required(f"s{s}_list", "list<i32>"))
+        b.schema(f"Schema{s}", declared)
+        for name, _, value in fields:
+            b.add_line(name, value)
+        b.add_line(f"s{s}_list", f"[{items}]")
+    return b.build()
+
+
+def alias_config(params: Params) -> str:
+    """`keys` keys in chains of `alias_depth` aliases, each chain ending in a literal."""
+    b = AAMBuilder()
+    depth = max(params.alias_depth, 1)
+    for chain in range(max(params.keys // depth, 1)):
+        for link in range(depth - 1):
+            b.add_line(f"c{chain}_{link}", f"c{chain}_{link + 1}")
+        b.add_line(f"c{chain}_{depth - 1}", f"end{chain}")
+    return b.build()
+
+
+def write_tree(directory: str, params: Params) -> str:
+    """
+    Writes `fan_out` fragments, a schema-carrying base and a root importing every fragment
+    and deriving from the base into `directory`. Returns the path of the root.
+    """
+    per_fragment = max(params.keys // max(params.fan_out, 1), 1)
+    b = AAMBuilder()
+    for f in range(params.fan_out):
+        path = os.path.join(directory, f"fragment{f}.aam")
+        fragment = AAMBuilder()
+        for i in range(per_fragment):
+            fragment.add_line(f"f{f}_key{i}", f"value{i}")
+        fragment.to_file(path)
+        b.import_path(path)
+
+    base = os.path.join(directory, "base.aam")
+    with open(base, 'w', encoding='utf-8') as f:
+        f.write(schema_config(params))
+    b.derive(base)
+    b.add_line("root", "1")
+    root = os.path.join(directory, "root.aam")
+    b.to_file(root)
+    return root
@@ -0,0 +1,68 @@
+"""
+Cold-start benchmarks: each run starts a fresh interpreter with `-X importtime` and
+adds up the cumulative import time of the top-level `aam_py` modules it reports,
+which includes the standard library modules they pull in.
+"""
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+import aam_py
+
+# scenario -> statement run in the fresh interpreter
+SCENARIOS = {
+    "cold_import": "import aam_py",
+    "cold_parse": "from aam_py import AAML; AAML.parse('@schema S { a: i32 }\\na = 1')",
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Returns the cumulative microseconds of the top-level `aam_py` imports in `-X importtime`
+    output, and the self time of every `aam_py` module.
+    """
+    total = 0
+    modules: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2]
+        module = name.strip()
+        if not module.startswith("aam_py"):
+            continue
+        modules[module] = self_us
+        if name == " " + module:
+            total += cumulative_us
+    return total, modules
+
+
+def run_scenario(statement: str) -> Tuple[int, Dict[str, int]]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(aam_py.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (root, env.get("PYTHONPATH"))))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_import(statement: str, repeat: int) -> Dict[str, Any]:
+    # One untimed run so that every module's bytecode is cached.
+    run_scenario(statement)
+    runs: List[Tuple[int, Dict[str, int]]] = [run_scenario(statement) for _ in range(max(repeat, 1))]
+    best, modules = min(runs, key=lambda run: run[0])
+    seconds = best / 1e6
+    return {
+        "unit": "starts",
+        "ops": 1,
+        "seconds": seconds,
+        "rate": 1 / seconds if seconds > 0 else float("inf"),
+        "peak_kib": None,
+        "modules": modules,
+    }
@@ -0,0 +1,243 @@
+"""
+Benchmarks of the parse, validation, lookup, derive and import hot paths.
+
+Each case prepares its input outside the timed region, then runs it `repeat` times;
+the best time is reported as throughput in the case's unit per second. Peak memory
+is measured with `tracemalloc` on one extra, untimed run. The cold-start cases in
+`benchmarks.importtime` run in fresh interpreters instead.
+"""
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aam_py import AAML
+from aam_py.file_cache import file_cache
+from aam_py.validation import validate_against_schemas
+
+from benchmarks.generators import Params, alias_config, plain_config, schema_config, schema_fields, write_tree
+from benchmarks.importtime import SCENARIOS, measure_import
+
+BASELINE_VERSION = 1
+
+
+class Case:
+    """A benchmark: `setup` builds the input, `run` processes it and returns the work done."""
+    __slots__ = ('name', 'unit', 'setup', 'run')
+
+    def __init__(self, name: str, unit: str, setup: Callable[[], Any], run: Callable[[Any], int]):
+        self.name = name
+        self.unit = unit
+        self.setup = setup
+        self.run = run
+
+
+def _lines(content: str) -> int:
+    return content.count('\n') + 1
+
+
+def _parse(content: str) -> int:
+    AAML().merge_content(content)
+    return _lines(content)
+
+
+def _parse_deferred(content: str) -> int:
+    AAML().merge_content(content, validate="deferred")
+    return _lines(content)
+
+
+def _validate(state: Tuple[AAML, List[Tuple[str, str]]]) -> int:
+    aaml, values = state
+    for field, value in values:
+        validate_against_schemas(aaml, field, value)
+    return len(values)
+
+
+def _validate_setup(params: Params) -> Tuple[AAML, List[Tuple[str, str]]]:
+    aaml = AAML.parse(schema_config(params))
+    items = ", ".join(str(i) for i in range(params.list_length))
+    values = []
+    for s in range(params.schemas):
+        values.extend((name, value) for name, _, value in schema_fields(s, params.fields))
+        values.append((f"s{s}_list", f"[{items}]"))
+    # Enough rounds for a stable measurement on small schema counts.
+    rounds = max(params.keys // max(len(values), 1), 1)
+    return aaml, values * rounds
+
+
+def _find_key(state: Tuple[AAML, List[str]]) -> int:
+    aaml, values = state
+    for value in values:
+        aaml.find_key(value)
+    return len(values)
+
+
+def _find_key_setup(params: Params) -> Tuple[AAML, List[str]]:
+    aaml = AAML.parse(plain_config(params))
+    aaml.find_key("value0")  # build the index outside the timed region
+    values = [f"value{i}" for i in range(params.keys)]
+    values.append("missing")
+    return aaml, values
+
+
+def _find_deep(state: Tuple[AAML, List[str]]) -> int:
+    aaml, heads = state
+    for head in heads:
+        aaml.find_deep(head)
+    return len(heads)
+
+
+def _find_deep_setup(params: Params) -> Tuple[AAML, List[str]]:
+    depth = max(params.alias_depth, 1)
+    chains = max(params.keys // depth, 1)
+    return AAML.parse(alias_config(params)), [f"c{chain}_0" for chain in range(chains)]
+
+
+def _overlay(state: Tuple[AAML, str, int]) -> int:
+    base, content, count = state
+    for _ in range(count):
+        base.overlay().merge_content(content)
+    return count
+
+
+def _overlay_setup(params: Params) -> Tuple[AAML, str, int]:
+    base = AAML.parse(schema_config(params) + "\n" + plain_config(params))
+    name, _, value = schema_fields(0, params.fields)[0]
+    return base, f"{name} = {value}\nkey0 = override\nextra = 1", max(params.keys // 10, 1)
+
+
+def _tree_lines(root: str) -> int:
+    total = 0
+    for name in os.listdir(os.path.dirname(root)):
+        with open(os.path.join(os.path.dirname(root), name), encoding='utf-8') as f:
+            total += _lines(f.read())
+    return total
+
+
+def _load_cold(state: Tuple[str, int]) -> int:
+    root, lines = state
+    file_cache.clear()
+    AAML.load(root)
+    return lines
+
+
+def _load_warm(state: Tuple[str, int]) -> int:
+    root, lines = state
+    AAML.load(root)
+    return lines
+
+
+def _derive(state: Tuple[str, int]) -> int:
+    base, fields = state
+    AAML.parse(f"@derive {base}")
+    return fields
+
+
+def build_cases(params: Params, directory: str) -> List[Case]:
+    root = write_tree(directory, params)
+    tree = (root, _tree_lines(root))
+    base = (os.path.join(directory, "base.aam"), params.schemas * (params.fields + 1))
+
+    def warm_tree():
+        AAML.load(root)
+        return tree
+
+    def warm_base():
+        AAML.parse(f"@derive {base[0]}")
+        return base
+
+    plain = plain_config(params)
+    schemas = schema_config(params)
+    return [
+        Case("parse_plain", "lines", lambda: plain, _parse),
+        Case("parse_schemas", "lines", lambda: schemas, _parse),
+        Case("parse_deferred", "lines", lambda: schemas, _parse_deferred),
+        Case("validate_schemas", "values", lambda: _validate_setup(params), _validate),
+        Case("find_key", "lookups", lambda: _find_key_setup(params), _find_key),
+        Case("find_deep", "lookups", lambda: _find_deep_setup(params), _find_deep),
+        Case("overlay_small", "instances", lambda: _overlay_setup(params), _overlay),
+        Case("derive_cached", "fields", warm_base, _derive),
+        Case("import_tree_cold", "lines", lambda: tree, _load_cold),
+        Case("import_tree_cached", "lines", warm_tree, _load_warm),
+    ]
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    ops = 0
+    for _ in range(repeat):
+        state = case.setup()
+        start = time.perf_counter()
+        ops = case.run(state)
+        best = min(best, time.perf_counter() - start)
+
+    state = case.setup()
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "unit": case.unit,
+        "ops": ops,
+        "seconds": best,
+        "rate": ops / best if best > 0 else float("inf"),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_suite(params: Params, repeat: int = 5, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Runs every case (or those named in `only`) and returns a baseline document."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            for case in build_cases(params, directory):
+                if only and case.name not in only:
+                    continue
+                results[case.name] = measure(case, repeat)
+        finally:
+            file_cache.clear()
+    for name, statement in SCENARIOS.items():
+        if not only or name in only:
+            results[name] = measure_import(statement, repeat)
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "params": params.to_dict(),
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Tuple[str, float, bool]]:
+    """
+    Returns (case, current rate / baseline rate, regressed) for every case present in both.
+    A case regressed when its throughput dropped by more than `threshold` (a fraction).
+    """
+    rows = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or not old["rate"]:
+            continue
+        ratio = result["rate"] / old["rate"]
+        rows.append((name, ratio, ratio < 1 - threshold))
+    return rows
+
+
+def format_results(document: Dict[str, Any]) -> str:
+    lines = [f"{'case':<20} {'throughput':>20} {'best':>10} {'peak':>12}"]
+    for name, r in document["results"].items():
+        rate = f"{r['rate']:,.0f} {r['unit']}/s"
+        peak = f"{r['peak_kib']:>9,.0f}KiB" if r['peak_kib'] is not None else f"{'-':>12}"
+        lines.append(f"{name:<20} {rate:>20} {r['seconds'] * 1000:>8.2f}ms {peak}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Tuple[str, float, bool]]) -> str:
+    lines = [f"{'case':<20} {'change':>8}"]
+    for name, ratio, regressed in rows:
+        lines.append(f"{name:<20} {(ratio - 1) * 100:>+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+import asyncio
+import builtins
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from aam_py import AAML, IoError
+from aam_py.file_cache import file_cache
+
+@pytest.fixture
+def tree(tmp_path):
+    file_cache.clear()
+    leaves = []
+    for i in range(4):
+        leaf = tmp_path / f"leaf{i}.aam"
+        leaf.write_text(f"leaf{i} = {i}\nshared = {i}\n")
+        leaves.append(leaf)
+    mid = tmp_path / "mid.aam"
+    mid.write_text(f"@import {leaves[0]}\n@import {leaves[1]}\nmid = 1\n")
+    root = tmp_path / "root.aam"
+    root.write_text(f"@import {mid}\n@import {leaves[2]}\n@derive {leaves[3]}\nroot = 1\n")
+    yield root
+    file_cache.clear()
+
+def test_aload_matches_load(tree):
+    loaded = asyncio.run(AAML.aload(str(tree)))
+    expected = AAML.load(str(tree))
+    assert list(loaded.get_map().items()) == list(expected.get_map().items())
+    assert loaded.get_sources() == expected.get_sources()
+
+def test_amerge_file_into_existing_instance(tree):
+    aaml = AAML.parse("shared = mine\nextra = 1")
+    asyncio.run(aaml.amerge_file(str(tree)))
+    expected = AAML.parse("shared = mine\nextra = 1")
+    expected.merge_file(str(tree))
+    assert aaml.get_map() == expected.get_map()
+
+def test_event_loop_stays_responsive(tree):
+    gate = threading.Event()
+
+    class SlowExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            def slow(*a, **kw):
+                gate.wait(5)
+                return fn(*a, **kw)
+            return super().submit(slow, *args, **kwargs)
+
+    async def main():
+        with SlowExecutor(max_workers=4) as executor:
+            task = asyncio.create_task(AAML.aload(str(tree), executor))
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            assert not task.done()
+            gate.set()
+            return ticks, await task
+
+    ticks, loaded = asyncio.run(main())
+    assert ticks == 5 and loaded.find_obj("root") == "1"
+
+def test_timeout_and_cancellation_leave_instance_unchanged(tree):
+    gate = threading.Event()
+
+    class BlockedExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            return super().submit(lambda: (gate.wait(5), fn(*args, **kwargs))[1])
+
+    async def main():
+        aaml = AAML.parse("a = 1")
+        with BlockedExecutor(max_workers=2) as executor:
+            with pytest.raises(asyncio.TimeoutError):
+                await aaml.amerge_file(str(tree), executor, timeout=0.05)
+            task = asyncio.create_task(aaml.amerge_file(str(tree), executor))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            gate.set()
+        return aaml
+
+    aaml = asyncio.run(main())
+    assert aaml.get_map() == {"a": "1"}
+
+def test_missing_file_raises_io_error(tmp_path):
+    with pytest.raises(IoError):
+        asyncio.run(AAML.aload(str(tmp_path / "missing.aam")))
+
+def test_no_file_reads_on_the_event_loop(tmp_path, monkeypatch):
+    file_cache.clear()
+    leaf = tmp_path / "leaf.aam"
+    leaf.write_text("x = 1\n")
+    root = tmp_path / "root.aam"
+    # The schema makes the cached parse of leaf unusable, so the import re-reads it.
+    root.write_text(f"@schema P {{ x: i32 }}\n@import {leaf}\n")
+    loop_thread = threading.get_ident()
+    opened = []
+    real_open = builtins.open
+
+    def spy(file, *args, **kwargs):
+        opened.append((str(file), threading.get_ident()))
+        return real_open(file, *args, **kwargs)
+
+    async def merge() -> AAML:
+        aaml = AAML()
+        await aaml.amerge_file(str(root))
+        return aaml
+
+    monkeypatch.setattr(builtins, "open", spy)
+    results = [asyncio.run(AAML.aload(str(root))), asyncio.run(merge())]
+    monkeypatch.undo()
+    for loaded in results:
+        assert loaded.get_map() == {"x": "1"}
+        assert loaded.get_sources() == AAML.load(str(root)).get_sources()
+    assert str(leaf) in [path for path, _ in opened]
+    assert all(thread != loop_thread for _, thread in opened)
+    file_cache.clear()
+
+def test_heights_of_deep_and_cyclic_graphs():
+    from aam_py.aio import _heights
+    depth = 5000
+    chain = {f"f{i}": [f"f{i + 1}"] for i in range(depth)}
+    assert _heights(chain)["f0"] == depth
+    assert _heights({"a": ["b", "c"], "b": ["a"], "c": [], "d": ["c"]}) == {"c": 0, "d": 1}
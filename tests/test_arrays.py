@@ -0,0 +1,57 @@
+import pytest
+from aam_py import AAML, InvalidTypeError
+from aam_py.arrays import MathArray
+from aam_py.types.math import MathTypes
+
+CONFIG = """
+@schema Mesh { verts: list<math::vector3>, xf: math::matrix4x4, pos: math::vector3, name: string }
+verts = [[0, 0, 0], [1, 0.5, 0], [1, 1, 2]]
+xf = 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 5, 6, 7, 1
+pos = 1, 2, 3
+name = cube
+"""
+
+def test_list_of_vectors_decodes_to_contiguous_buffer():
+    aaml = AAML.parse(CONFIG)
+    verts = aaml.get_array("verts")
+    assert verts.shape == (3, 3)
+    assert verts.data.tolist() == [0, 0, 0, 1, 0.5, 0, 1, 1, 2]
+    assert verts.view()[1, 1] == 0.5
+    assert verts[-1].tolist() == [1, 1, 2]
+    assert aaml.get_array("verts") is verts
+    assert aaml.get_typed("verts") == [(0, 0, 0), (1, 0.5, 0), (1, 1, 2)]
+
+def test_views_share_the_buffer():
+    arr = MathArray.decode(MathTypes.VECTOR2, ["1, 2", "[3, 4]"])
+    row = arr[1]
+    arr.data[3] = 9.0
+    assert row.tolist() == [3.0, 9.0]
+    assert arr.tolist() == [[1.0, 2.0], [3.0, 9.0]]
+    assert len(MathArray.decode(MathTypes.VECTOR2, [])) == 0
+
+def test_matrix_view():
+    aaml = AAML.parse(CONFIG)
+    m = aaml.get_array("xf").matrix()
+    assert m.shape == (4, 4)
+    assert m[3, 0] == 5 and m[3, 2] == 7
+    with pytest.raises(InvalidTypeError):
+        aaml.get_array("pos").matrix()
+
+def test_get_array_rejects_non_math_fields_and_refreshes():
+    aaml = AAML.parse(CONFIG)
+    with pytest.raises(InvalidTypeError):
+        aaml.get_array("name")
+    assert aaml.get_array("missing") is None
+    aaml.merge_content("pos = 4, 5, 6")
+    assert aaml.get_array("pos").tolist() == [[4.0, 5.0, 6.0]]
+
+def test_get_array_resolves_type_aliases():
+    aaml = AAML.parse(
+        "@type vec = math::vector3\n@type label = string\n"
+        "@schema S { p: vec, ps: list<vec>, l: label }\np = 1, 2, 3\nps = [[1, 2, 3], [4, 5, 6]]\nl = x\n"
+    )
+    assert aaml.get_typed("p") == (1.0, 2.0, 3.0)
+    assert aaml.get_array("p").tolist() == [[1.0, 2.0, 3.0]]
+    assert aaml.get_array("ps").shape == (2, 3)
+    with pytest.raises(InvalidTypeError):
+        aaml.get_array("l")
@@ -166,3 +166,66 @@ def test_deep_find_circular():
     res = parser.find_deep("a")
     assert res is not None
     assert res == "c"
+
+def test_reverse_lookup_first_key_wins():
+    parser = AAML.parse("a = shared\nb = shared")
+    assert parser.find_key("shared") == "a"
+
+def test_reverse_lookup_tracks_reassignment():
+    aaml = AAML.parse("a = x\nb = y")
+    assert aaml.find_key("x") == "a"
+    aaml.merge_content("a = z")
+    assert aaml.find_key("x") is None
+    assert aaml.find_key("z") == "a"
+    aaml.merge_content("c = y\nb = x")
+    assert aaml.find_key("y") == "c"
+    assert aaml.find_key("x") == "b"
+
+def test_reverse_lookup_after_add_assign():
+    aaml1 = AAML.parse("a = 1")
+    assert aaml1.find_key("2") is None
+    aaml1 += AAML.parse("b = 2\na = 2")
+    assert aaml1.find_key("2") == "a"
+    assert aaml1.find_key("1") is None
+
+def test_find_deep_cached_result_follows_updates():
+    aaml = AAML.parse("a = b\nb = c")
+    assert aaml.find_deep("a") == "c"
+    aaml.merge_content("c = d")
+    assert aaml.find_deep("a") == "d"
+    aaml.merge_content("d = a")
+    assert aaml.find_deep("a") == "d"
+    assert aaml.find_deep("c") == "b"
+
+def test_resolve_all_matches_find_deep():
+    content = "start=mid\nmid=end\nend=mid\nx=y\ny=z\nself=self\ntail=x"
+    aaml = AAML.parse(content)
+    expected = {k: AAML.parse(content).find_deep(k) for k in aaml.get_map()}
+    assert aaml.resolve_all() == expected
+    assert expected["start"] == "end"
+    assert expected["tail"] == "z"
+    assert expected["self"] == "self"
+
+def test_default_commands_are_shared_until_registered():
+    class EchoCommand:
+        name = "echo"
+
+        def execute(self, aaml, args):
+            aaml._assign("echo", args)
+
+    first, second = AAML(), AAML()
+    assert first._commands is second._commands
+    first.register_command(EchoCommand())
+    first.merge_content("@echo hi")
+    assert first.find_obj("echo") == "hi"
+    with pytest.raises(ParseError):
+        second.merge_content("@echo hi")
+    assert AAML()._commands is second._commands
+    assert "echo" in (first + second)._commands
+
+def test_lazy_package_attributes():
+    import aam_py
+    assert set(aam_py.__all__) <= set(dir(aam_py))
+    assert aam_py.AAML is AAML
+    with pytest.raises(AttributeError):
+        aam_py.Missing
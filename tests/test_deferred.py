@@ -0,0 +1,107 @@
+import pytest
+from aam_py import AAML, ParseError, SchemaValidationError, ValidationErrorGroup
+from aam_py.file_cache import file_cache
+
+@pytest.fixture
+def base(tmp_path):
+    file_cache.clear()
+    path = tmp_path / "base.aam"
+    path.write_text("@schema Net { port: i32, host: string }\nport = 80\n")
+    yield str(path)
+    file_cache.clear()
+
+def test_deferred_reports_every_failure():
+    content = "@schema S { a: i32, b: bool, c: i32 }\na = x\na = 1\nb = maybe\nc = y\n"
+    with pytest.raises(SchemaValidationError):
+        AAML.parse(content)
+    with pytest.raises(ValidationErrorGroup) as raised:
+        AAML.parse(content, validate="deferred")
+    errors = raised.value.exceptions
+    assert [(e.field, e.type_name) for e in errors] == [("b", "bool"), ("c", "i32")]
+    assert errors[0].__notes__ == ["at line 4: b = maybe"]
+
+    try:
+        AAML.parse(content, validate="deferred")
+    except* SchemaValidationError as group:
+        assert len(group.exceptions) == 2
+
+def test_deferred_checks_final_values_and_schemas():
+    aaml = AAML()
+    aaml.merge_content("n = x\nn = 2\nlater = 1", validate="deferred")
+    aaml.merge_content("@schema S { n: i32 }\nn = oops\nn = 3", validate="deferred")
+    assert aaml.get_map() == {"n": "3", "later": "1"}
+    with pytest.raises(ValidationErrorGroup) as raised:
+        AAML.parse("flag = 2\n@schema F { flag: bool }", validate="deferred")
+    assert raised.value.exceptions[0].field == "flag"
+
+def test_deferred_checks_each_distinct_value_once():
+    lines = ["@schema S { " + ", ".join(f"k{i}: math::vector3" for i in range(50)) + " }"]
+    lines += [f"k{i} = 1, 2, 3" for i in range(50)]
+    aaml = AAML.parse("\n".join(lines), validate="deferred")
+    cache = aaml.get_validation_cache()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+def test_deferred_derive_completeness(base, tmp_path):
+    with pytest.raises(SchemaValidationError):
+        AAML.parse(f"@derive {base}\nhost = example")
+    aaml = AAML.parse(f"@derive {base}\nhost = example", validate="deferred")
+    assert aaml.get_map() == {"port": "80", "host": "example"}
+
+    root = tmp_path / "root.aam"
+    root.write_text(f"@derive {base}\nport = high\n")
+    with pytest.raises(ValidationErrorGroup) as raised:
+        AAML.load(str(root), validate="deferred")
+    assert sorted(e.field for e in raised.value.exceptions) == ["host", "port"]
+
+def test_deferred_wraps_unexpected_errors():
+    from aam_py.types import Type
+
+    class Strict(Type):
+        def validate(self, value: str) -> None:
+            int(value)
+
+    aaml = AAML()
+    aaml.register_type("strict", Strict())
+    with pytest.raises(ValidationErrorGroup) as raised:
+        aaml.merge_content("@schema S { v: strict, w: strict }\nv = 1\nw = nope", validate="deferred")
+    [error] = raised.value.exceptions
+    assert isinstance(error, ParseError) and error.line == 3
+
+def test_unknown_validate_mode():
+    with pytest.raises(ValueError):
+        AAML.parse("a = 1", validate="later")
+
+def test_deferred_checks_imported_keys_on_both_import_paths(tmp_path):
+    file_cache.clear()
+    other = tmp_path / "other.aam"
+    other.write_text("y = 1\n")
+    plain = tmp_path / "plain.aam"
+    plain.write_text("x = abc\n")
+    # `@derive` makes the import fall back to merging the file itself.
+    contextual = tmp_path / "contextual.aam"
+    contextual.write_text(f"@derive {other}\nx = abc\n")
+    for leaf in (plain, contextual, plain, contextual):
+        with pytest.raises(ValidationErrorGroup) as raised:
+            AAML.parse(f"a = 1\n@import {leaf}\n@schema P {{ x: i32 }}", validate="deferred")
+        [error] = raised.value.exceptions
+        assert error.field == "x"
+        assert error.__notes__ == ["at line 2: x = abc"]
+    file_cache.clear()
+
+def test_deferred_accepts_what_immediate_accepts_for_derive(base, tmp_path):
+    bad = tmp_path / "bad.aam"
+    bad.write_text("port = high\nhost = example\n")
+    contents = [
+        f"@schema P {{ port: i32 }}\n@derive {bad}",
+        f"a = 1\n@derive {bad}\n@schema P {{ port: i32 }}",
+        f"@derive {bad}\n@derive {base}",
+        f"host = example\n@derive {base}::Net",
+    ]
+    for content in contents:
+        results = []
+        for mode in ("immediate", "deferred"):
+            try:
+                results.append(AAML.parse(content, validate=mode).get_map())
+            except (SchemaValidationError, ValidationErrorGroup):
+                results.append("error")
+        assert results[0] == results[1], content
@@ -0,0 +1,88 @@
+import os
+import pytest
+from aam_py import AAML, AAMBuilder, SchemaField, SchemaValidationError
+from aam_py.file_cache import file_cache, FileCache
+
+
+def write_base(path, value="1"):
+    b = AAMBuilder()
+    b.schema("Base", [SchemaField.required("port", "i32")])
+    b.add_line("port", value)
+    b.add_line("host", "localhost")
+    b.to_file(path)
+
+
+def test_import_hits_cache(tmp_path):
+    base = tmp_path / "base.aam"
+    write_base(base)
+
+    first = AAML.parse(f"@import {base}")
+    hits = file_cache.hits
+    second = AAML.parse(f"@import {base}\nextra = 1")
+
+    assert file_cache.hits == hits + 1
+    assert second.find_obj("port") == "1"
+    assert second.find_obj("extra") == "1"
+    assert second.get_schema("Base") is not None
+    assert first.get_map() == {"port": "1", "host": "localhost"}
+
+
+def test_modified_file_is_reparsed(tmp_path):
+    base = tmp_path / "base.aam"
+    write_base(base, "1")
+    assert AAML.parse(f"@import {base}").find_obj("port") == "1"
+
+    write_base(base, "22")
+    st = os.stat(base)
+    os.utime(base, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert AAML.parse(f"@import {base}").find_obj("port") == "22"
+
+
+def test_modified_nested_import_is_reparsed(tmp_path):
+    inner = tmp_path / "inner.aam"
+    outer = tmp_path / "outer.aam"
+    AAMBuilder().add_line("inner_key", "a").to_file(inner)
+    AAMBuilder().import_path(str(inner)).to_file(outer)
+    assert AAML.parse(f"@import {outer}").find_obj("inner_key") == "a"
+
+    AAMBuilder().add_line("inner_key", "bb").to_file(inner)
+    st = os.stat(inner)
+    os.utime(inner, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert AAML.parse(f"@import {outer}").find_obj("inner_key") == "bb"
+
+
+def test_import_still_validated_against_importer_schemas(tmp_path):
+    sub = tmp_path / "sub.aam"
+    AAMBuilder().add_line("count", "many").to_file(sub)
+    AAML.parse(f"@import {sub}")
+
+    with pytest.raises(SchemaValidationError):
+        AAML.parse(f"@schema S {{ count: i32 }}\n@import {sub}")
+
+
+def test_derive_uses_cache(tmp_path):
+    base = tmp_path / "base.aam"
+    write_base(base)
+    AAML.parse(f"@derive {base}")
+    hits = file_cache.hits
+    child = AAML.parse(f"host = remote\n@derive {base}")
+    assert file_cache.hits == hits + 1
+    assert child.find_obj("host") == "remote"
+    assert child.find_obj("port") == "1"
+
+
+def test_lru_bound_and_hash_verification(tmp_path):
+    cache = FileCache(max_entries=1, verify_hash=True)
+    a = tmp_path / "a.aam"
+    b = tmp_path / "b.aam"
+    AAMBuilder().add_line("k", "a").to_file(a)
+    AAMBuilder().add_line("k", "b").to_file(b)
+
+    assert cache.load(str(a)).find_obj("k") == "a"
+    assert cache.load(str(b)).find_obj("k") == "b"
+    assert len(cache) == 1
+
+    # Same content, new mtime: the content hash keeps the entry valid.
+    os.utime(b, ns=(0, 1_000_000_000))
+    cache.load(str(b))
+    assert cache.hits == 1
@@ -0,0 +1,64 @@
+import random
+import threading
+from aam_py import AAML
+
+def test_snapshot_is_isolated_from_later_writes():
+    aaml = AAML.parse("@schema S { n: i32 }\na = b\nb = c\nn = 1")
+    first = aaml.freeze()
+    aaml.merge_content("a = x\nnew = 2\n@schema T { m: string }")
+    second = aaml.freeze()
+    assert first["a"] == "b" and "new" not in first and first.get_schema("T") is None
+    assert second["a"] == "x" and second["new"] == "2" and second.get_schema("T") is not None
+    assert first.find_deep("a") == "c"
+    assert first.find_key("c") == "b"
+    assert second.find_obj("n") == "1"
+    assert dict(second) == aaml.get_map()
+    assert aaml.freeze() is second  # nothing changed since
+
+def test_snapshots_share_unchanged_layers():
+    aaml = AAML.parse("\n".join(f"k{i} = {i}" for i in range(1000)))
+    base = aaml.freeze()
+    aaml.merge_content("k1 = changed")
+    nxt = aaml.freeze()
+    assert nxt._layers[-1] is base._layers[0]
+    assert len(nxt._layers[0]) == 1
+
+def test_random_updates_match_the_live_map():
+    rng = random.Random(3)
+    aaml = AAML()
+    snapshots = []
+    for step in range(300):
+        for _ in range(rng.randrange(1, 20)):
+            aaml.merge_content(f"k{rng.randrange(200)} = v{rng.randrange(50)}")
+        if step % 37 == 0:
+            text = "\n".join(f"{k} = {v}" for k, v in aaml.get_map().items())
+            aaml.update_content(text, text.replace("= v1\n", "= w\n", 1))
+        snapshots.append((aaml.freeze(), list(aaml.get_map().items())))
+    for frozen, expected in snapshots:
+        assert list(frozen.items()) == expected
+        assert len(frozen) == len(expected)
+        assert all(frozen[k] == v for k, v in expected)
+    assert len(snapshots[-1][0]._layers) <= 12
+
+def test_readers_never_see_partial_updates():
+    aaml = AAML.parse("x = 0\ny = 0")
+    current = [aaml.freeze()]
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            snap = current[0]
+            if snap["x"] != snap["y"]:
+                errors.append((snap["x"], snap["y"]))
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(1, 500):
+        aaml.merge_content(f"x = {i}\ny = {i}")
+        current[0] = aaml.freeze()
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not errors
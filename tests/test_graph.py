@@ -0,0 +1,52 @@
+from aam_py import AAML, AAMBuilder, SchemaField
+from aam_py.file_cache import file_cache
+from aam_py.graph import discover, scan_directives
+
+
+def build_tree(tmp_path, leaves=4):
+    leaf_paths = []
+    for i in range(leaves):
+        path = tmp_path / f"leaf{i}.aam"
+        b = AAMBuilder()
+        b.schema(f"Leaf{i}", [SchemaField.required(f"value{i}", "i32")])
+        b.add_line(f"value{i}", str(i))
+        b.add_line("shared", f"leaf{i}")
+        b.to_file(path)
+        leaf_paths.append(str(path))
+
+    mid = tmp_path / "mid.aam"
+    b = AAMBuilder()
+    b.import_path(leaf_paths[0])
+    b.add_line("mid_key", "mid")
+    b.to_file(mid)
+
+    root = tmp_path / "root.aam"
+    b = AAMBuilder()
+    b.import_path(str(mid))
+    for path in leaf_paths[1:-1]:
+        b.import_path(path)
+    b.add_line("shared", "root")
+    b.derive(leaf_paths[-1])
+    b.to_file(root)
+    return str(root), str(mid), leaf_paths
+
+
+def test_scan_directives(tmp_path):
+    root, mid, leaves = build_tree(tmp_path)
+    assert scan_directives(root) == [mid] + leaves[1:-1] + [leaves[-1]]
+    graph = discover(root)
+    assert graph[mid] == [leaves[0]]
+    assert all(graph[leaf] == [] for leaf in leaves)
+
+
+def test_load_graph_matches_serial_load(tmp_path):
+    root, _, _ = build_tree(tmp_path)
+    file_cache.clear()
+    expected = AAML.load(root)
+    file_cache.clear()
+    result = AAML.load_graph(root, max_workers=2)
+
+    assert list(result.get_map().items()) == list(expected.get_map().items())
+    assert list(result.get_schemas()) == list(expected.get_schemas())
+    assert result.find_obj("shared") == "root"
+    assert file_cache.hits >= 4
@@ -52,3 +52,23 @@ def test_import_with_quotes(tmp_path):
     parser = AAML.parse(content)
 
     assert parser.find_obj("q_key") == "q_val"
+
+def test_merge_stream_from_text_stream():
+    import io
+    stream = io.StringIO("a = 1\n@schema P {\n    x: i32\n}\nx = 5\n")
+    parser = AAML.load_stream(stream)
+    assert parser.find_obj("a") == "1"
+    assert parser.find_obj("x") == "5"
+    assert parser.get_schema("P") is not None
+
+def test_merge_stream_from_pipe():
+    import subprocess, sys
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "print('piped = yes')"],
+        stdout=subprocess.PIPE, text=True
+    )
+    parser = AAML()
+    parser.merge_stream(proc.stdout)
+    proc.wait()
+    proc.stdout.close()
+    assert parser.find_obj("piped") == "yes"
@@ -0,0 +1,137 @@
+import os
+import random
+import pytest
+from aam_py import AAML, SchemaValidationError
+from aam_py.aaml import SchemaDef
+from aam_py.error import ErrorInfo, InvalidValueError
+from aam_py.types import Type
+
+def _state(aaml):
+    return list(aaml.get_map().items()), sorted(aaml.get_schemas()), aaml.find_key("v1")
+
+def _assert_matches_full_parse(old, new, prefix=""):
+    aaml = AAML.parse(prefix + old)
+    aaml.find_key("v0")  # build the reverse index so updates have to maintain it
+    aaml.update_content(prefix + old, prefix + new)
+    assert _state(aaml) == _state(AAML.parse(prefix + new))
+
+def test_update_content_matches_full_parse_randomized():
+    rng = random.Random(7)
+    keys = [f"k{i}" for i in range(6)]
+    for _ in range(300):
+        lines = [f"{rng.choice(keys)} = v{rng.randrange(4)}" for _ in range(rng.randrange(1, 10))]
+        edited = list(lines)
+        for _ in range(rng.randrange(1, 3)):
+            op = rng.randrange(3)
+            pos = rng.randrange(len(edited) + 1)
+            if op == 0 or not edited:
+                edited.insert(pos, f"{rng.choice(keys)} = v{rng.randrange(4)}")
+            elif op == 1:
+                del edited[min(pos, len(edited) - 1)]
+            else:
+                edited[min(pos, len(edited) - 1)] = f"{rng.choice(keys)} = v{rng.randrange(4)}"
+        _assert_matches_full_parse("\n".join(lines), "\n".join(edited))
+        _assert_matches_full_parse("\n".join(lines), "\n".join(edited), "@schema S { k0: string }\n")
+
+def test_update_content_with_directives(tmp_path):
+    sub = tmp_path / "sub.aam"
+    sub.write_text("a = imported\nb = imported\n")
+    prefix = f"@import {sub}\n"
+    _assert_matches_full_parse("a = 1\nb = 2", "a = 1", prefix)
+    _assert_matches_full_parse("a = 1\nb = 2", "a = 3\nb = 2", prefix)
+    _assert_matches_full_parse("a = 1\nb = 2", "a = 1\nb = 2\nc = 3", prefix)
+    _assert_matches_full_parse("a = 1", f"a = 1\n@import {sub}")
+    _assert_matches_full_parse("@schema S { a: i32 }\na = 1", "a = 1")
+
+def test_update_content_revalidates_changed_keys():
+    old = "@schema S { n: i32 }\nn = 1\nm = x"
+    aaml = AAML.parse(old)
+    with pytest.raises(SchemaValidationError):
+        aaml.update_content(old, old.replace("n = 1", "n = one"))
+    assert aaml.find_obj("n") == "1"
+    aaml.update_content(old, old.replace("n = 1", "n = 2"))
+    assert aaml.get_typed("n") == 2
+
+def test_refresh_reads_only_changes(tmp_path, monkeypatch):
+    path = tmp_path / "main.aam"
+    lines = [f"key{i} = {i}" for i in range(100)]
+    path.write_text("\n".join(lines))
+    aaml = AAML.load(str(path))
+    aaml.refresh(str(path))
+    assert str(path.resolve()) in aaml._documents
+    # Unchanged files are not re-parsed, and neither are later partial changes.
+    monkeypatch.setattr(AAML, "_reset", lambda self: pytest.fail("full re-parse"))
+    from aam_py.types.primitive_type import PrimitiveType
+    aaml.register_type("marker", PrimitiveType.I32)
+
+    lines[50] = "key50 = changed"
+    del lines[10]
+    path.write_text("\n".join(lines))
+    aaml.refresh(str(path))
+    assert list(aaml.get_map().items()) == list(AAML.load(str(path)).get_map().items())
+    assert aaml.get_sources()[os.path.realpath(path)][1] == path.stat().st_size
+    assert aaml.get_type("marker") is not None
+
+def test_chained_line_edits_match_full_parse():
+    rng = random.Random(11)
+    pool = ["a = 1", "b = 2", "a = 3", "c = x # note", "", "# comment", "@schema S {", "  n: i32", "}",
+            "@schema T { m: string }", "n = 5", "m = y"]
+    for _ in range(100):
+        lines = [rng.choice(pool) for _ in range(rng.randrange(1, 12))]
+        aaml, text = None, None
+        for _ in range(4):
+            new_text = "\n".join(lines)
+            try:
+                expected = _state(AAML.parse(new_text))
+            except Exception as e:
+                expected = type(e)
+            try:
+                if aaml is None:
+                    aaml = AAML.parse(new_text)
+                else:
+                    aaml.update_content(text, new_text)
+                actual = _state(aaml)
+            except Exception as e:
+                actual = type(e)
+            assert actual == expected, (text, new_text)
+            if isinstance(actual, type):
+                break
+            text = new_text
+            pos = rng.randrange(len(lines) + 1)
+            if rng.randrange(2) and lines:
+                lines[min(pos, len(lines) - 1)] = rng.choice(pool)
+            else:
+                lines.insert(pos, rng.choice(pool))
+
+class Even(Type):
+    def check(self, value):
+        if int(value) % 2:
+            return ErrorInfo(InvalidValueError, "Not even: {}", value)
+        return None
+
+def test_full_reparse_keeps_registered_types(tmp_path):
+    old = "@schema S { n: even }\nn = 2\n"
+    new = "@schema S { n: even }\nn = 4\nm = 1\n@type q = i32\n"
+    aaml = AAML()
+    aaml.register_type("even", Even())
+    aaml.merge_content(old)
+    aaml.update_content(old, new)  # the new @type takes the full re-parse path
+    assert aaml.get_typed("n") == "4"
+    assert aaml.get_type("q") is not None
+    with pytest.raises(SchemaValidationError):
+        aaml.update_content(new, new.replace("n = 4", "n = 3"))
+
+    path = tmp_path / "main.aam"
+    path.write_text(old)
+    aaml = AAML()
+    aaml.register_type("even", Even())
+    aaml.register_schema("T", SchemaDef({"m": "even"}, set()))
+    aaml.merge_file(str(path))
+    path.write_text(new.replace("m = 1", "m = 6") + "# changed\n")
+    aaml.refresh(str(path))  # changed since loading: re-parsed from scratch
+    assert aaml.find_obj("m") == "6"
+    assert aaml.get_type("even") is not None and aaml.get_schema("T") is not None
+    path.write_text(old + "@type r = i32\n")
+    aaml.refresh(str(path))
+    assert aaml.get_type("q") is None and aaml.get_type("r") is not None
+    assert aaml.get_type("even") is not None
@@ -0,0 +1,115 @@
+import pytest
+from aam_py import AAML, SchemaValidationError
+from aam_py.error import ParseError
+from aam_py.file_cache import file_cache
+from aam_py.layered import LayeredAAML
+
+BASE = "@schema Server { port: i32 }\nhost = localhost\nport = 8080\nname = base\n"
+
+@pytest.fixture
+def base():
+    return AAML.parse(BASE)
+
+def copy_then_merge(parent, content):
+    aaml = AAML() + parent
+    aaml.merge_content(content)
+    return aaml
+
+def test_overlay_matches_copy(base):
+    content = "port = 9090\nextra = 1\nalias = extra"
+    overlay = base.overlay()
+    overlay.merge_content(content)
+    assert isinstance(overlay, LayeredAAML)
+    assert overlay.get_layer() == {"port": "9090", "extra": "1", "alias": "extra"}
+    assert dict(overlay.get_map()) == copy_then_merge(base, content).get_map()
+    assert overlay.find_obj("host") == "localhost"
+    assert overlay.find_deep("alias") == "1"
+    assert overlay.find_key("base") == "name"
+    assert base.get_map()["port"] == "8080"
+    assert "extra" not in base.get_map()
+
+def test_overlay_validates_against_parent_schemas(base):
+    overlay = base.overlay()
+    with pytest.raises(SchemaValidationError):
+        overlay.merge_content("port = nope")
+    overlay.merge_content("@schema Extra { ratio: f64 }")
+    assert overlay.get_schema("Extra") is not None
+    assert base.get_schema("Extra") is None
+    assert overlay.get_field_schemas("ratio")
+    assert not base.get_field_schemas("ratio")
+    with pytest.raises(SchemaValidationError):
+        base.overlay().merge_content("@schema Flag { port: bool }\nport = true")
+
+def test_overlay_derive_precedence(tmp_path, base):
+    file_cache.clear()
+    derived = tmp_path / "derived.aam"
+    derived.write_text("name = derived\nhost = remote\nfresh = yes\n")
+    content = f"host = overlay\n@derive {derived}"
+    overlay = base.overlay()
+    overlay.merge_content(content)
+    assert dict(overlay.get_map()) == copy_then_merge(base, content).get_map()
+    assert overlay.find_obj("host") == "overlay"
+    assert overlay.find_obj("name") == "base"
+    assert overlay.find_obj("fresh") == "yes"
+    file_cache.clear()
+
+def test_overlay_add_operators(base):
+    overlay = base.overlay()
+    overlay.merge_content("port = 1\nextra = 2")
+    other = AAML.parse("extra = 3\nmore = 4")
+    combined = overlay + other
+    assert type(combined) is AAML
+    assert combined.get_map() == {**base.get_map(), "port": "1", "extra": "3", "more": "4"}
+    merged = AAML.parse("seed = 0")
+    merged += overlay
+    assert merged.find_obj("host") == "localhost"
+    assert merged.find_obj("port") == "1"
+    overlay += other
+    assert overlay.get_layer()["more"] == "4"
+    assert "more" not in base.get_map()
+
+def test_overlay_delete_uncovers_parent(base):
+    overlay = base.overlay()
+    old = "port = 9090\nmine = base"
+    overlay.merge_content(old)
+    assert overlay.find_key("base") == "name"
+    overlay.update_content(old, "mine = x")
+    assert overlay.find_obj("port") == "8080"
+    assert overlay.find_obj("host") == "localhost"
+    assert overlay.find_key("8080") == "port"
+    assert overlay.get_layer() == {"mine": "x"}
+
+def test_flatten_and_nested_overlays(base):
+    first = base.overlay()
+    first.merge_content("port = 1\na = 1")
+    second = first.overlay()
+    second.merge_content("port = 2\nb = 2")
+    assert len(second.get_map().maps) == 3
+    assert second.find_obj("a") == "1"
+    assert first.find_obj("port") == "1"
+
+    flat = second.flatten()
+    assert type(flat) is AAML
+    assert flat.get_map() == {"host": "localhost", "port": "2", "name": "base", "a": "1", "b": "2"}
+    assert flat.get_schemas() == dict(second.get_schemas())
+    flat.merge_content("c = 3")
+    assert "c" not in second.get_map()
+    with pytest.raises(SchemaValidationError):
+        flat.merge_content("port = nope")
+
+def test_overlay_unregister_type_hides_parent_type(base):
+    base.merge_content("@type t = i32")
+    overlay = base.overlay()
+    overlay.unregister_type("t")
+    assert overlay.get_type("t") is None
+    assert "t" not in overlay.flatten()._types
+    assert base.get_type("t") is not None
+    nested = overlay.overlay()
+    assert nested.get_type("t") is None
+    with pytest.raises(ParseError):
+        overlay.merge_content("@type u = t")
+    overlay.merge_content("@type t = string")
+    assert overlay.get_type("t") is not base.get_type("t")
+    overlay.unregister_type("t")
+    overlay.commit()
+    assert base.get_type("t") is None
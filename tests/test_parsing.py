@@ -1,4 +1,9 @@
-from aam_py.parsing import strip_comment, is_inline_object, parse_inline_object
+import pytest
+from aam_py import ParseError
+from aam_py.parsing import (
+    strip_comment, is_inline_object, parse_inline_object, parse_assignment,
+    split_top_level_fields, tokenize, TokenKind
+)
 
 def test_color_not_stripped():
     assert strip_comment("tint = #ff6600") == "tint = #ff6600"
@@ -41,3 +46,37 @@ def test_inline_object_nested_list_value():
     result = dict(parse_inline_object("{ tags = [a, b, c], name = test }"))
     assert len(result) == 2
     assert result.get("tags") == "[a, b, c]"
+
+def test_parse_assignment_respects_depth():
+    assert parse_assignment("obj = { a = 1 }") == ("obj", "{ a = 1 }")
+    assert parse_assignment("key = 'x = y'") == ("key", "x = y")
+
+def test_split_top_level_fields_nested():
+    assert split_top_level_fields("a, { b, c }, [d, e]") == ["a", " { b, c }", " [d, e]"]
+
+def test_tokenize_assignment_and_directive():
+    tokens = list(tokenize("key = value # note\n@import other.aam"))
+    assert [(t.kind, t.text, t.line) for t in tokens] == [
+        (TokenKind.KEY, "key", 1),
+        (TokenKind.EQUALS, "=", 1),
+        (TokenKind.VALUE, "value", 1),
+        (TokenKind.DIRECTIVE, "import", 2),
+        (TokenKind.VALUE, "other.aam", 2),
+    ]
+
+def test_tokenize_multiline_block():
+    content = "@schema Point { # comment\n    x: f64,\n    y: f64\n}\nz = 1"
+    tokens = list(tokenize(content))
+    assert tokens[0].kind is TokenKind.DIRECTIVE
+    assert tokens[0].text == "schema"
+    assert tokens[1].kind is TokenKind.BLOCK
+    assert tokens[1].line == 1
+    assert tokens[1].text.startswith("Point {")
+    assert "#" not in tokens[1].text
+    assert tokens[2].text == "z"
+    assert tokens[2].line == 5
+
+def test_tokenize_missing_equals_reports_line():
+    with pytest.raises(ParseError) as exc:
+        list(tokenize("a = 1\nbroken"))
+    assert exc.value.line == 2
@@ -0,0 +1,73 @@
+import pytest
+from aam_py import AAML, AAMBuilder, SchemaField, ParseError
+from aam_py.file_cache import file_cache
+from aam_py.profiling import ParseStats
+
+@pytest.fixture
+def tree(tmp_path):
+    file_cache.clear()
+    base = tmp_path / "base.aam"
+    b = AAMBuilder()
+    b.schema("Base", [SchemaField.required("port", "i32"), SchemaField.required("tint", "color")])
+    b.add_line("port", "8080")
+    b.add_line("tint", "#FF0000")
+    b.to_file(base)
+    frag = tmp_path / "frag.aam"
+    frag.write_text("x = 1 # comment\ny = 2\n")
+    root = tmp_path / "root.aam"
+    root.write_text(f"@import {frag}\n@derive {base}\nport = 9090\n")
+    yield str(root), str(frag), str(base)
+    file_cache.clear()
+
+def test_stats_cover_imports_and_derives(tree):
+    root, frag, base = tree
+    aaml = AAML()
+    stats = aaml.enable_stats()
+    aaml.merge_file(root)
+    assert aaml.get_map() == AAML.load(root).get_map()
+
+    data = stats.to_dict()
+    assert data["lines"] == 3 + 2 + 3
+    assert data["files"][f"file:{root}"]["directives"] == 2
+    assert data["files"][f"file:{frag}"]["assignments"] == 2
+    assert data["files"][f"file:{base}"]["lines"] == 3
+    assert data["validations"] == {"i32": 2, "color": 1}
+    assert data["cache"]["file_cache"]["misses"] == 2
+    for phase in ("io", "tokenize", "strip_comment", "parse_assignment", "validate", "assign"):
+        assert phase in data["phases"]
+    assert f"file:{root};@derive {base};file:{base};validate" in data["stacks"]
+    assert data["total"] == pytest.approx(data["files"][f"file:{root}"]["time"])
+
+def test_collapsed_stacks(tree, tmp_path):
+    root, _, _ = tree
+    aaml = AAML()
+    stats = aaml.enable_stats()
+    aaml.merge_file(root)
+    out = tmp_path / "stacks.txt"
+    stats.write_collapsed(str(out))
+    lines = out.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith(f"file:{root}")
+        assert int(count) > 0
+
+def test_stats_are_opt_in(tree):
+    root, _, _ = tree
+    aaml = AAML.load(root)
+    assert aaml.get_stats() is None
+    stats = ParseStats()
+    aaml.enable_stats(stats)
+    aaml.merge_content("z = 1")
+    assert aaml.disable_stats() is stats
+    aaml.merge_content("w = 1")
+    assert stats.files["content"]["merges"] == 1
+    assert stats.lines == 1
+
+def test_stats_survive_errors():
+    aaml = AAML()
+    stats = aaml.enable_stats()
+    with pytest.raises(ParseError):
+        aaml.merge_content("a = 1\nnot an assignment")
+    assert stats.lines == 2
+    assert not stats._frames
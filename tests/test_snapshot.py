@@ -0,0 +1,62 @@
+import os
+import pytest
+from aam_py import AAML, AAMBuilder, SchemaField, IoError
+from aam_py.snapshot import is_stale, read_manifest
+
+
+def build_config(tmp_path):
+    path = tmp_path / "config.aam"
+    b = AAMBuilder()
+    b.type_alias("speed", "physics::meter_per_second")
+    b.type_alias("pos", "math::vector3")
+    b.type_alias("when", "time::datetime")
+    b.type_alias("ids", "list<i32>")
+    b.type_alias("flag", "bool")
+    b.schema("Device", [SchemaField.required("id", "i32"), SchemaField.optional("label", "string")])
+    b.add_line("id", "7")
+    b.add_line("name", '"Ünïcode ✓"')
+    b.add_line("origin", "0, 0, 0")
+    b.to_file(path)
+    return path
+
+
+def test_snapshot_round_trip(tmp_path):
+    source = build_config(tmp_path)
+    aaml = AAML.load(str(source))
+    snap = tmp_path / "config.snap"
+    aaml.dump_snapshot(str(snap))
+
+    loaded = AAML.load_snapshot(str(snap))
+    assert list(loaded.get_map().items()) == list(aaml.get_map().items())
+    assert loaded.find_obj("name") == "Ünïcode ✓"
+    assert loaded.find_key("7") == "id"
+
+    device = loaded.get_schema("Device")
+    assert device.fields == {"id": "i32", "label": "string"}
+    assert device.optional_fields == {"label"}
+    for alias in ("speed", "pos", "when", "ids", "flag"):
+        assert type(loaded.get_type(alias)) is type(aaml.get_type(alias))
+    loaded.validate_value("speed", "1.5")
+    loaded.validate_value("ids", "[1, 2]")
+
+    assert read_manifest(str(snap)) == aaml.get_sources()
+    assert os.path.realpath(source) in loaded.get_sources()
+
+
+def test_snapshot_staleness(tmp_path):
+    source = build_config(tmp_path)
+    snap = tmp_path / "config.snap"
+    AAML.load(str(source)).dump_snapshot(str(snap))
+    assert not is_stale(str(snap))
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("\nextra = 1")
+    assert is_stale(str(snap))
+    assert is_stale(str(tmp_path / "missing.snap"))
+
+
+def test_snapshot_rejects_foreign_file(tmp_path):
+    bogus = tmp_path / "bogus.snap"
+    bogus.write_bytes(b"not a snapshot")
+    with pytest.raises(IoError):
+        AAML.load_snapshot(str(bogus))
@@ -0,0 +1,177 @@
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from aam_py import AAML, IoError
+from aam_py.error import NotFoundError
+from aam_py.file_cache import file_cache
+from aam_py.sources import HttpLoader, KVLoader, get_loader, register_loader, resolve_source
+
+class Server:
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        self.connections = set()
+        files, requests, connections = self.files, self.requests, self.connections
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                requests.append((self.path, self.headers.get("If-None-Match")))
+                connections.add(self.client_address)
+                body = files.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = f'"{hash(body) & 0xffffffff:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class Store(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.batches = []
+
+    def mget(self, keys):
+        self.batches.append(list(keys))
+        return [self.get(k) for k in keys]
+
+@pytest.fixture
+def server():
+    server = Server()
+    loader = HttpLoader(timeout=5)
+    previous = get_loader("http")
+    register_loader("http", loader)
+    yield server, loader
+    register_loader("http", previous)
+    loader.close()
+    server.close()
+
+@pytest.fixture
+def store():
+    store = Store()
+    previous = get_loader("kv")
+    register_loader("kv", KVLoader(store))
+    yield store
+    register_loader("kv", previous)
+
+def test_http_connections_are_reused(server):
+    srv, loader = server
+    srv.files["/a.aam"] = "a = 1"
+    srv.files["/b.aam"] = "b = 2"
+    aaml = AAML()
+    for _ in range(3):
+        aaml.merge_file(f"{srv.url}/a.aam")
+        aaml.merge_file(f"{srv.url}/b.aam")
+    assert aaml.get_map() == {"a": "1", "b": "2"}
+    assert loader.requests == 6
+    assert len(srv.connections) == 1
+
+def test_http_revalidates_with_etag(server):
+    srv, loader = server
+    srv.files["/a.aam"] = "a = 1"
+    first = loader.fetch(f"{srv.url}/a.aam")
+    assert loader.fetch(f"{srv.url}/a.aam") is first
+    assert loader.not_modified == 1
+    assert srv.requests[1][1] == first.etag
+    srv.files["/a.aam"] = "a = 2"
+    assert loader.fetch(f"{srv.url}/a.aam").content == "a = 2"
+    with pytest.raises(IoError):
+        loader.fetch(f"{srv.url}/missing.aam")
+
+def test_import_prefetches_fragments(server, tmp_path):
+    srv, loader = server
+    for i in range(5):
+        srv.files[f"/f{i}.aam"] = f"f{i} = {i}\nlast = {i}"
+    root = tmp_path / "root.aam"
+    root.write_text("".join(f'@import "{srv.url}/f{i}.aam"\n' for i in range(5)) + "own = 1\n")
+    aaml = AAML.load(str(root))
+    assert aaml.get_map()["last"] == "4"
+    assert aaml.find_obj("own") is not None
+    assert loader.requests == 5
+    assert not loader._prefetched
+
+def test_kv_batches_imports(store):
+    store["base"] = "@import kv://x\n@import kv://y\nbase = 1"
+    store["x"] = "x = 1"
+    store["y"] = b"y = 2"
+    aaml = AAML.parse("@import kv://base")
+    assert aaml.get_map() == {"x": "1", "y": "2", "base": "1"}
+    assert store.batches == [["x", "y"]]
+    with pytest.raises(IoError):
+        AAML.parse("@import kv://missing")
+
+def test_derive_remote_base(store):
+    store["base"] = "@schema S { a: i32 }\na = 1\nb = 2"
+    aaml = AAML.parse("b = 3\n@derive kv://base")
+    assert aaml.get_map() == {"b": "3", "a": "1"}
+    assert aaml.get_schema("S") is not None
+    store["base"] = "a = 5"
+    assert AAML.parse("@derive kv://base").get_map() == {"a": "5"}
+
+def test_local_file_importing_remote_is_not_cached(store, tmp_path):
+    file_cache.clear()
+    store["frag"] = "v = 1"
+    local = tmp_path / "local.aam"
+    local.write_text("@import kv://frag\n")
+    assert AAML.parse(f"@import {local}").get_map() == {"v": "1"}
+    store["frag"] = "v = 2"
+    assert AAML.parse(f"@import {local}").get_map() == {"v": "2"}
+    file_cache.clear()
+
+def test_resolve_source(tmp_path):
+    path = tmp_path / "a.aam"
+    path.write_text("a = 1")
+    assert resolve_source(path.as_uri()) == (None, str(path))
+    assert AAML.parse(f'@import "{path.as_uri()}"').get_map() == {"a": "1"}
+    with pytest.raises(NotFoundError):
+        resolve_source("ftp://host/a.aam")
+
+def test_local_file_prefetches_each_directive_run(store, tmp_path):
+    file_cache.clear()
+    store.update(x="x = 1", y="y = 2", z="z = 3", w="w = 4")
+    root = tmp_path / "root.aam"
+    root.write_text("a = 0\n@import kv://x\n# remote\n\n@import kv://y\nb = 1\n@import kv://z\n@import kv://w\n")
+    aaml = AAML.load(str(root))
+    assert aaml.get_map() == {"a": "0", "x": "1", "y": "2", "b": "1", "z": "3", "w": "4"}
+    assert store.batches == [["x", "y"], ["z", "w"]]
+    file_cache.clear()
+
+def test_loader_caches_are_bounded(server, store):
+    srv, loader = server
+    loader.max_entries = 2
+    for i in range(4):
+        srv.files[f"/{i}.aam"] = f"v = {i}"
+        loader.fetch(f"{srv.url}/{i}.aam")
+    assert list(loader._cache) == [f"{srv.url}/2.aam", f"{srv.url}/3.aam"]
+
+    kv = get_loader("kv")
+    kv.max_prefetched = 2
+    store.update(a="a = 1", b="b = 2", c="c = 3")
+    kv.prefetch(["kv://a", "kv://b", "kv://c"])
+    assert list(kv._prefetched) == ["kv://b", "kv://c"]
+    assert kv.get("kv://a").content == "a = 1"
+    with pytest.raises(NotFoundError):
+        get_loader("file")
@@ -53,3 +53,218 @@ def test_apply_schema_manual():
     data["y"] = "invalid"
     with pytest.raises(SchemaValidationError):
         apply_schema(aaml, "Point", data)
+
+def test_field_schema_index():
+    aaml = AAML.parse("@schema A { x: i32, y: string }\n@schema B { x: f64 }")
+    assert aaml.get_field_schemas("x") == [("A", "i32"), ("B", "f64")]
+    assert aaml.get_field_schemas("y") == [("A", "string")]
+    assert aaml.get_field_schemas("z") == []
+
+    aaml.merge_content("@schema A { y: i32 }")
+    assert aaml.get_field_schemas("x") == [("B", "f64")]
+    assert aaml.get_field_schemas("y") == [("A", "i32")]
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("y = text")
+    aaml.merge_content("x = 1.5")
+
+def test_compiled_validator_follows_registry_changes():
+    from aam_py.types.primitive_type import PrimitiveType
+    aaml = AAML.parse("@schema S { v: custom }")
+    with pytest.raises(SchemaValidationError) as exc:
+        aaml.merge_content("v = 1")
+    assert "Unknown type 'custom'" in str(exc.value)
+
+    aaml.register_type("custom", PrimitiveType.I32)
+    aaml.merge_content("v = 1")
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("v = x")
+
+    aaml.unregister_type("custom")
+    aaml.merge_content("@schema custom { a: i32 }")
+    aaml.merge_content("v = { a = 2 }")
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("v = { a = nope }")
+
+def test_compiled_list_validator():
+    aaml = AAML.parse("@schema P { x: i32 }\n@schema S { pts: list<P>, ids: list<i32> }")
+    aaml.merge_content("pts = [{ x = 1 }, { x = 2 }]\nids = [1, 2, 3]")
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("ids = [1, two]")
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("pts = [{ x = one }]")
+
+def test_validate_many_reports_every_failure():
+    from aam_py.types import resolve_builtin
+    cases = {
+        "i32": ["1", "x", "-3", "2.5"],
+        "f64": ["1.5", "nan", "abc", ""],
+        "bool": ["true", "FALSE", "yes", "0"],
+        "color": ["#FFFFFF", "#ffffff80", "#GGGGGG", "FFFFFF", "#fff"],
+        "math::vector3": ["1, 2, 3", "1,2", "a, b, c", "0,0,0"],
+        "time::duration": ["P1D", "5", "soon"],
+        "time::datetime": ["2024-01-01", "yesterday"],
+        "physics::meter": ["1.0", "one"],
+        "list<i32>": ["[1, 2]", "[1, x]", "1"],
+    }
+    for path, values in cases.items():
+        type_def = resolve_builtin(path)
+        expected = []
+        for i, value in enumerate(values):
+            try:
+                type_def.validate(value)
+            except Exception as e:
+                expected.append((i, str(e)))
+        failures = type_def.validate_many(values)
+        assert [(i, str(e)) for i, e in failures] == expected, path
+        assert expected, path
+
+def test_validate_many_all_valid_batch():
+    from aam_py.types.math import MathTypes
+    values = [f"{i}, {i}.5, -{i}" for i in range(1000)]
+    assert MathTypes.VECTOR3.validate_many(values) == []
+    assert MathTypes.VECTOR3.validate_many([]) == []
+
+def test_validate_values_against_schemas():
+    from aam_py.validation import validate_values_against_schemas
+    aaml = AAML.parse("@schema A { n: i32 }\n@schema B { n: f64 }")
+    failures = validate_values_against_schemas(aaml, "n", ["1", "1.5", "x"])
+    assert [(i, e.schema) for i, e in failures] == [(1, "A"), (2, "A"), (2, "B")]
+    assert all(isinstance(e, SchemaValidationError) for _, e in failures)
+
+def test_check_returns_lazy_error_info():
+    from aam_py import ErrorInfo
+    from aam_py.types import resolve_builtin
+    cases = [("i32", "1", "x"), ("color", "#FFFFFF", "#GGGGGG"), ("math::vector2", "1, 2", "1"),
+             ("time::year", "2024", "soon"), ("physics::meter", "1.5", "one"), ("list<i32>", "[1]", "[1, x]")]
+    for path, valid, value in cases:
+        type_def = resolve_builtin(path)
+        assert type_def.check(valid) is None
+        info = type_def.check(value)
+        assert isinstance(info, ErrorInfo)
+        with pytest.raises(type(info.error())) as raised:
+            type_def.validate(value)
+        assert str(info) == str(raised.value)
+
+def test_check_custom_type_and_schema_fields():
+    from aam_py.types import Type
+    from aam_py.error import InvalidValueError
+    from aam_py.validation import check_typed_field, check_list_value
+
+    class Even(Type):
+        def validate(self, value: str) -> None:
+            if int(value) % 2:
+                raise InvalidValueError(f"odd: {value}")
+
+    aaml = AAML.parse("@schema P { x: i32 }")
+    aaml.register_type("even", Even())
+    assert Even().check("2") is None
+    assert "odd: 3" in str(Even().check("3"))
+    assert check_typed_field(aaml, "P", "{ x = 1 }", "S", "p") is None
+    info = check_typed_field(aaml, "P", "{ x = a }", "S", "p")
+    assert isinstance(info.error(), SchemaValidationError)
+    assert check_list_value(aaml, "[2, 4]", "even") is None
+    assert "odd: 5" in str(check_list_value(aaml, "[2, 5]", "even"))
+
+def test_get_typed_decodes_native_values():
+    from datetime import datetime
+    aaml = AAML.parse("""
+        @schema P { x: i32, y: f64 }
+        @schema S { n: i32, r: f64, on: bool, pos: math::vector3, at: time::datetime, d: physics::meter, ids: list<i32>, p: P, pts: list<P>, name: string }
+        n = 3
+        r = 1.5
+        on = TRUE
+        pos = 1, 2.5, -3
+        at = 2024-05-01T12:30:00
+        d = 2.5
+        ids = [1, 2, 3]
+        p = { x = 1, y = 2 }
+        pts = [{ x = 1, y = 0.5 }]
+        name = hello
+        raw = 42
+    """)
+    assert aaml.get_typed("n") == 3
+    assert aaml.get_typed("r") == 1.5
+    assert aaml.get_typed("on") is True
+    assert aaml.get_typed("pos") == (1.0, 2.5, -3.0)
+    assert aaml.get_typed("at") == datetime(2024, 5, 1, 12, 30)
+    assert aaml.get_typed("d") == 2.5
+    assert aaml.get_typed("ids") == [1, 2, 3]
+    assert aaml.get_typed("p") == {"x": 1, "y": 2.0}
+    assert aaml.get_typed("pts") == [{"x": 1, "y": 0.5}]
+    assert aaml.get_typed("name") == "hello"
+    assert aaml.get_typed("raw") == "42"
+    assert aaml.get_typed("missing") is None
+
+def test_get_typed_memo_invalidation():
+    aaml = AAML.parse("@schema S { pos: math::vector2 }\npos = 1, 2")
+    first = aaml.get_typed("pos")
+    assert aaml.get_typed("pos") is first
+    aaml.merge_content("pos = 3, 4")
+    assert aaml.get_typed("pos") == (3.0, 4.0)
+
+    aaml.merge_content("count = 7")
+    assert aaml.get_typed("count") == "7"
+    aaml.merge_content("@schema C { count: i32 }")
+    assert aaml.get_typed("count") == 7
+
+def test_validation_cache_hits_and_invalidation():
+    from aam_py.validation import check_list_value
+    aaml = AAML.parse("""
+        @schema P { x: i32 }
+        @schema S { a: bool, b: bool, pts: list<P>, more: list<P> }
+        a = true
+        b = true
+        pts = [{ x = 1 }, { x = 1 }]
+    """)
+    cache = aaml.get_validation_cache()
+    assert cache.hits == 2  # b, then the second list item
+    misses = cache.misses
+    aaml.merge_content("more = [{ x = 1 }, { x = 1 }]")
+    assert cache.hits == 3 and cache.misses == misses  # the whole literal was seen before
+
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("a = maybe")
+    assert ("bool", "maybe") not in cache._entries
+    assert check_list_value(aaml, "[1]", "i32") is None
+    assert check_list_value(aaml, "[1]", "i32") is None
+    assert cache.hits == 4
+
+    # A redefined schema must re-check values that passed the old definition.
+    aaml.merge_content("@schema P { x: i32, y: i32 }")
+    assert len(cache) == 0
+    with pytest.raises(SchemaValidationError):
+        aaml.merge_content("pts = [{ x = 1 }]")
+    assert cache.info()["hits"] == 4
+
+def test_validation_cache_is_bounded():
+    from aam_py.validation import ValidationCache
+    cache = ValidationCache(maxsize=2)
+    cache.add("a")
+    cache.add("b")
+    assert cache.seen("a")
+    cache.add("c")
+    assert not cache.seen("b")
+    assert cache.seen("a") and cache.seen("c")
+    cache.resize(1)
+    assert len(cache) == 1 and cache.seen("c")
+    assert cache.info() == {"hits": 4, "misses": 1, "hit_rate": 0.8, "size": 1, "maxsize": 1}
+
+def test_type_without_validate_or_check():
+    from aam_py.types import Type
+
+    class Incomplete(Type):
+        pass
+
+    with pytest.raises(NotImplementedError):
+        Incomplete().validate("1")
+    with pytest.raises(NotImplementedError):
+        Incomplete().check("1")
+
+def test_datetime_check_matches_decode():
+    from aam_py.types.time import TimeTypes
+    for value in ("2024-05-01T25:61:00", "2024-05-01Tnoon", "2024-13-01", "2024-05-01 garbage"):
+        assert TimeTypes.DATETIME.check(value) is not None, value
+        with pytest.raises(SchemaValidationError):
+            AAML.parse(f"@schema S {{ at: time::datetime }}\nat = {value}")
+    aaml = AAML.parse("@schema S { at: time::datetime }\nat = 2024-05-01T12:30:00+02:00")
+    assert aaml.get_typed("at").utcoffset().total_seconds() == 7200
@@ -0,0 +1,47 @@
+import pytest
+from aam_py import AAML, IoError
+from aam_py.view import AAMLView
+
+CONFIG = """
+    a = b
+    c = d
+    d = g
+    loop1 = loop2
+    loop2 = loop1
+    name = "Ünïcode"
+    dup = g
+"""
+
+
+def test_view_matches_aaml(tmp_path):
+    aaml = AAML.parse(CONFIG)
+    path = tmp_path / "config.view"
+    aaml.dump_view(str(path))
+
+    with AAMLView(str(path)) as view:
+        assert len(view) == len(aaml.get_map())
+        assert list(view) == list(aaml.get_map())
+        assert list(view.items()) == list(aaml.get_map().items())
+        assert "name" in view and "missing" not in view
+        assert view.get("name") == "Ünïcode"
+
+        for key in ["a", "c", "g", "b", "loop1", "missing", "Ünïcode"]:
+            assert view.find_obj(key) == aaml.find_obj(key)
+            assert view.find_deep(key) == aaml.find_deep(key)
+        assert view.find_key("g") == "d"
+        assert view.find_key("nothing") is None
+
+
+def test_view_empty_map(tmp_path):
+    path = tmp_path / "empty.view"
+    AAML().dump_view(str(path))
+    with AAMLView(str(path)) as view:
+        assert len(view) == 0
+        assert view.find_obj("x") is None
+
+
+def test_view_rejects_foreign_file(tmp_path):
+    path = tmp_path / "bogus.view"
+    path.write_bytes(b"nope")
+    with pytest.raises(IoError):
+        AAMLView(str(path))
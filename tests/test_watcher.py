@@ -0,0 +1,102 @@
+import os
+import time
+import pytest
+from aam_py.watcher import AAMLWatcher
+
+def _touch(path, text):
+    path.write_text(text)
+    # Make the change visible even on filesystems with coarse mtimes.
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+@pytest.fixture
+def tree(tmp_path):
+    sub = tmp_path / "sub.aam"
+    base = tmp_path / "base.aam"
+    root = tmp_path / "root.aam"
+    sub.write_text("sub_key = 1\n")
+    base.write_text("base_key = 1\nshared = base\n")
+    root.write_text(f"@import {sub}\n@derive {base}\nroot_key = 1\n")
+    return root, sub, base
+
+def test_records_every_source(tree):
+    root, sub, base = tree
+    watcher = AAMLWatcher(str(root))
+    assert watcher.watched_files() == {os.path.realpath(p) for p in (root, sub, base)}
+    assert watcher.check() is False
+
+def test_check_reloads_changed_import(tree):
+    root, sub, _ = tree
+    watcher = AAMLWatcher(str(root))
+    before = watcher.current
+    _touch(sub, "sub_key = 2\n")
+    assert watcher.check() is True
+    assert watcher.current.find_obj("sub_key") == "2"
+    # Readers holding the previous instance keep a consistent view.
+    assert before.find_obj("sub_key") == "1"
+
+def test_failed_reload_keeps_previous_instance(tree):
+    root, sub, _ = tree
+    errors = []
+    watcher = AAMLWatcher(str(root), on_error=errors.append)
+    _touch(sub, "not an assignment\n")
+    assert watcher.check() is False
+    assert len(errors) == 1
+    assert watcher.current.find_obj("sub_key") == "1"
+    assert watcher.check() is False  # not retried until the file changes again
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_background_reload_coalesces_bursts(tree, use_inotify):
+    root, _, base = tree
+    reloaded = []
+    with AAMLWatcher(str(root), debounce=0.05, poll_interval=0.02,
+                     use_inotify=use_inotify, on_reload=reloaded.append) as watcher:
+        for i in range(5):
+            _touch(base, f"base_key = {i}\nshared = base\n")
+        assert _wait_for(lambda: watcher.current.find_obj("base_key") == "4")
+    assert 1 <= len(reloaded) <= 2
+
+def test_root_edit_is_applied_incrementally(tree, monkeypatch):
+    root, sub, _ = tree
+    watcher = AAMLWatcher(str(root))
+    before = watcher.current
+    working = watcher._working
+    monkeypatch.setattr("aam_py.aaml.AAML.load", lambda *a, **k: pytest.fail("full reload"))
+    _touch(root, f"@import {sub}\n@derive {tree[2]}\nroot_key = 2\n")
+    assert watcher.check() is True
+    assert watcher._working is working
+    assert watcher.current.find_obj("root_key") == "2"
+    assert watcher.current.find_obj("shared") == "base"
+    assert before.find_obj("root_key") == "1"
+
+def test_import_edit_replays_stored_root(tree):
+    root, sub, base = tree
+    watcher = AAMLWatcher(str(root))
+    _touch(base, "base_key = 7\nshared = base\n")
+    assert watcher._take_changes() == set()  # nothing reported yet
+    watcher._changes = {os.path.realpath(base)}
+    assert watcher._reload(watcher._take_changes()) is True
+    assert watcher.current.find_obj("base_key") == "7"
+    assert watcher.current.find_obj("root_key") == "1"
+    assert watcher.watched_files() == {os.path.realpath(p) for p in (root, sub, base)}
+
+def test_reload_after_failed_root_edit(tree):
+    root, sub, base = tree
+    errors = []
+    watcher = AAMLWatcher(str(root), on_error=errors.append)
+    _touch(root, "root_key = \n@import /missing.aam\n")
+    assert watcher.check() is False
+    assert watcher.current.find_obj("root_key") == "1"
+    _touch(root, f"@import {sub}\nroot_key = 3\n")
+    assert watcher.check() is True
+    assert watcher.current.find_obj("root_key") == "3"
+    assert watcher.current.find_obj("base_key") is None
+    assert len(errors) == 1